@@ -189,12 +189,14 @@ def main():
 
     graph = nx.DiGraph()
     graph.graph["id"] = "avoid_subpaths_example"
-    graph.add_edge("0", "a")
-    graph.add_edge("a", "b")
-    graph.add_edge("a", "c")
-    graph.add_edge("b", "d")
-    graph.add_edge("c", "d")
-    graph.add_edge("d", "1")
+    graph.add_edges_from([
+        ("0", "a"),
+        ("a", "b"),
+        ("a", "c"),
+        ("b", "d"),
+        ("c", "d"),
+        ("d", "1"),
+    ])
 
     feasible_model = OnePathAvoidingSubpaths(
         graph,
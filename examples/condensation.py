@@ -1,6 +1,7 @@
 import flowpaths as fp
 import networkx as nx
 from flowpaths.utils import safetypathcoverscycles as safety
+import os
 
 def test1():
     # Create a simple graph
@@ -111,7 +112,7 @@ def main():
 if __name__ == "__main__":
     # Configure logging
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
     main()
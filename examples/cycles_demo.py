@@ -1,8 +1,10 @@
 import flowpaths as fp
 import networkx as nx
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-def test_min_flow_decomp(filename: str):
-    graph = fp.graphutils.read_graphs(filename)[0]
+def test_min_flow_decomp(filename: str, threads: int = 1):
+    graph = fp.graphutils.read_graphs_cached(filename)[0]
     print("graph id", graph.graph["id"])
     print("subset_constraints", graph.graph["constraints"])
     # fp.utils.draw(
@@ -35,14 +37,14 @@ def test_min_flow_decomp(filename: str):
         solver_options={
             "external_solver": "highs", # we can try also "highs" at some point
             "time_limit": 300, # 300s = 5min, is it ok?
-            "threads": 1
+            "threads": threads,
         },
     )
     mfd_model.solve()
     process_solution(mfd_model)
 
-def test_least_abs_errors(filename):
-    graph = fp.graphutils.read_graphs(filename)[0]
+def test_least_abs_errors(filename, threads: int = 4):
+    graph = fp.graphutils.read_graphs_cached(filename)[0]
     print("graph id", graph.graph["id"])
     # print("subset_constraints", graph.graph["constraints"])
 
@@ -59,6 +61,7 @@ def test_least_abs_errors(filename):
         solver_options={
             "external_solver": "highs", # we can try also "highs" at some point
             "time_limit": 300, # 300s = 5min, is it ok?
+            "threads": threads,
         },
         trusted_edges_for_safety_percentile=0, # we trust for safety edges whose weight in >= 0 percentile, that is, all edges
     )
@@ -78,14 +81,15 @@ def test_least_abs_errors(filename):
         solver_options={
             "external_solver": "highs", # we can try also "highs" at some point
             "time_limit": 300, # 300s = 5min, is it ok?
+            "threads": threads,
         },
         trusted_edges_for_safety_percentile=25, # we trust for safety edges whose weight in >= 25 percentile, remove this if not using the safety optimization
     )
     klae_percentile_model.solve()
     process_solution(klae_percentile_model)
 
-def test_min_path_error(filename):
-    graph = fp.graphutils.read_graphs(filename)[0]
+def test_min_path_error(filename, threads: int = 4):
+    graph = fp.graphutils.read_graphs_cached(filename)[0]
     print("graph id", graph.graph["id"])
     # print("subset_constraints", graph.graph["constraints"])
 
@@ -102,6 +106,7 @@ def test_min_path_error(filename):
         solver_options={
             "external_solver": "highs", # we can try also "highs" at some point
             "time_limit": 300, # 300s = 5min, is it ok?
+            "threads": threads,
         },
     )
     kmpe_model.solve()
@@ -120,6 +125,7 @@ def test_min_path_error(filename):
         solver_options={
             "external_solver": "highs", # we can try also "highs" at some point
             "time_limit": 300, # 300s = 5min, is it ok?
+            "threads": threads,
         },
         trusted_edges_for_safety_percentile=25, # we trust for safety edges whose weight in >= 25 percentile, remove this if not using the safety optimization
     )
@@ -140,11 +146,24 @@ def test_min_path_error(filename):
         solver_options={
             "external_solver": "highs", # we can try also "highs" at some point
             "time_limit": 300, # 300s = 5min, is it ok?
+            "threads": threads,
         },
     )
     kmpe_percentile_ignore_model.solve()
     process_solution(kmpe_percentile_ignore_model)
 
+def test_all_concurrently(filename: str):
+    # The three models below are independent, so we solve them concurrently, each in its own process.
+    # We split the available CPUs between them, to avoid oversubscription.
+    threads = max(1, (os.cpu_count() or 1) // 3)
+    tests = [test_min_flow_decomp, test_least_abs_errors, test_min_path_error]
+    with ProcessPoolExecutor(max_workers=len(tests)) as executor:
+        futures = {executor.submit(test, filename, threads): test.__name__ for test in tests}
+        # Each test prints its solution in its own process; here we just report them as they finish
+        for future in as_completed(futures):
+            future.result()
+            print(f"{futures[future]} finished")
+
 def process_solution(model):
     if model.is_solved():
         solution = model.get_solution()
@@ -193,6 +212,7 @@ def main():
     # test_min_flow_decomp(filename = "tests/cyclic_graphs/gt4.kmer15.(0.10000).V1096.E1622.mincyc100.e1.0.graph")
     # test_least_abs_errors(filename = "tests/cyclic_graphs/gt5.kmer27.(655000.660000).V18.E27.mincyc4.e0.75.graph")
     # test_min_path_error(filename = "tests/cyclic_graphs/gt5.kmer27.(655000.660000).V18.E27.mincyc4.e0.75.graph")
+    # test_all_concurrently(filename = "tests/cyclic_graphs/gt5.kmer27.(655000.660000).V18.E27.mincyc4.e0.75.graph")
 
 if __name__ == "__main__":
     # Configure logging
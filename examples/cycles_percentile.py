@@ -1,5 +1,6 @@
 import flowpaths as fp
 import networkx as nx
+import os
 
 def test():
     # Create a simple graph
@@ -79,7 +80,7 @@ def main():
 if __name__ == "__main__":
     # Configure logging
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
     main()
\ No newline at end of file
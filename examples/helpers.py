@@ -0,0 +1,42 @@
+# Helpers shared by the examples on the larger cyclic graphs (mfd_cycles.py, least_abs_errors_cycles.py and mfd_cycles_mingenset.py).
+# This file is not an example itself.
+
+import flowpaths as fp
+import os
+import threading
+import multiprocessing
+
+def draw_input_graph_in_background(graph, filename: str):
+    # Draws the input graph read from `filename` to `filename + ".pdf"`, unless this drawing is already newer than the graph file.
+    # The drawing does not depend on the model, so it runs in a background thread while the model is solved.
+    # Returns the thread, to be joined once the model is solved, or None if the drawing is up to date.
+    if os.path.exists(filename + ".pdf") and os.path.getmtime(filename) <= os.path.getmtime(filename + ".pdf"):
+        return None
+    draw_thread = threading.Thread(
+        target=fp.utils.draw,
+        kwargs=dict(
+            G=graph,
+            filename=filename + ".pdf",
+            flow_attr="flow",
+            draw_options={
+            "show_graph_edges": True,
+            "show_edge_weights": True,
+            "show_path_weights": False,
+            "show_path_weight_on_first_edge": True,
+            "pathwidth": 2,
+        }))
+    draw_thread.start()
+    return draw_thread
+
+def run_in_parallel(func, filenames: list, processes: int = None):
+    # Calls func(filename, threads) for every filename, in separate processes, since the runs on different files
+    # build and solve independent models. The cores are split between the processes, and each process uses its share
+    # as solver threads.
+    processes = min(len(filenames), processes or os.cpu_count())
+    threads = max(1, os.cpu_count() // processes)
+    with multiprocessing.Pool(processes=processes, initializer=_init_worker, initargs=(fp.utils.logger.level,)) as pool:
+        pool.starmap(func, [(filename, threads) for filename in filenames])
+
+def _init_worker(level):
+    # Every worker process configures its own logging
+    fp.utils.configure_logging(level=level, log_to_console=True)
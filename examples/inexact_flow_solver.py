@@ -14,31 +14,65 @@
 
 import flowpaths as fp
 import networkx as nx
+import numpy as np
 
 class kInexactFlowDecomposition(fp.AbstractPathModelDAG):
-    def __init__(self, G: nx.DiGraph, lb:str, ub:str, num_paths:int, threads:int=4):
+    def __init__(self, G: nx.DiGraph, lb:str, ub:str, num_paths:int, threads:int=4, weight_encoding:str="continuous", weight_type:type=None):
 
         self.G = fp.stDAG(G)
         self.lb = lb # We assume all lowerbounds are >= 0
         self.ub = ub # We assume all upperbounds are >= 0
+
+        # How the products edge_vars[(u,v,i)] * path_weights_vars[(i)] are linearized (see _specialize_product_emitter):
+        # - "continuous": the path weights are continuous, and each product gets the McCormick constraints
+        #   with bound maximum_allowed_path_weight.
+        # - "binary_expansion": the path weights are integers written in binary, w_i = sum_j 2^j * w_bits[(i,j)],
+        #   and each product edge_vars[(u,v,i)] * w_bits[(i,j)] of two binaries gets the McCormick constraints with bound 1,
+        #   whose LP relaxation is tight. This is only correct if the path weights are required to be integers.
+        if weight_encoding not in ["continuous", "binary_expansion"]:
+            raise ValueError(f"weight_encoding must be 'continuous' or 'binary_expansion', not {weight_encoding}")
+        self.weight_encoding = weight_encoding
+
+        # The type of the path weights (int or float). If it is int, the path weights (and the pi_vars below) are
+        # integer variables, and the weights in the solution are integers. If it is float, they are continuous variables.
+        # If weight_type is not given, we use int when all flow lowerbounds and upperbounds are integers, and float otherwise
+        # (integer weights could make the model infeasible for fractional flow intervals).
+        if weight_type is None:
+            bounds = np.concatenate((self.G.get_edge_attr_array(self.lb), self.G.get_edge_attr_array(self.ub)))
+            weight_type = int if np.all(np.mod(bounds, 1) == 0) else float
+        if weight_type not in [int, float]:
+            raise ValueError(f"weight_type must be either int or float, not {weight_type}")
+        if weight_encoding == "binary_expansion" and weight_type is not int:
+            raise ValueError(f"weight_encoding 'binary_expansion' requires integer path weights (weight_type int), not {weight_type}")
+        self.weight_type = weight_type
         # self.k = num_paths will be available from the superclass AbstractPathModelDAG, 
         # after calling super().__init__(...), which happens below.
 
         # We declare the _solution attribute, to be able to cache it.
         # Note that we make it private to this class (with underscore prefix), so that we can access it only with get_solution()
         self._solution = None      
+        # We also cache the objective value, so that repeated calls to get_objective_value() do not query the solver
+        self._objective_value = None
+        # The lowerbound on the number of paths depends only on the graph and the lowerbounds, so we cache it
+        self._lb_k_cache = None
         
         # To be able to apply the safety optimizations, we get the edges that 
         # must appear in some solution path. For this problem, these are the edges 
         # that have a non-zero flow lowerbound, since they appear in at least one source-to-sink path.
         trusted_edges_for_safety = self.G.get_non_zero_flow_edges(flow_attr=self.lb)
+        self._optimization_options = {"trusted_edges_for_safety": trusted_edges_for_safety}
+        self._solver_options = {"threads": threads}
+
+        self._encode_model(num_paths)
+
+    def _encode_model(self, num_paths):
 
         # We initialize the super class with the graph, the number of paths, and the trusted edges.
         super().__init__(
             self.G, 
             num_paths, 
-            optimization_options={"trusted_edges_for_safety": trusted_edges_for_safety},
-            solver_options={"threads": threads}
+            optimization_options=self._optimization_options,
+            solver_options=self._solver_options,
             )
 
         # This method is called from the super class AbstractPathModelDAG
@@ -49,13 +83,55 @@ class kInexactFlowDecomposition(fp.AbstractPathModelDAG):
 
         # We encode the objective, from the current class
         self._encode_objective()
+
+    def extend_k(self, new_k):
+        # Extends the model to new_k paths, so that a sweep over k (e.g. to find the smallest feasible k)
+        # can continue from the current model.
+        # The super class encodes the paths, the safety optimizations and the symmetry breaking for all k paths
+        # at once, so the solver model is encoded again for new_k paths. However, the st-DAG (with its cached
+        # edge attribute arrays, reachability and width) and the trusted edges are reused, and if the current
+        # model is solved, its paths and weights are given to the solver as a MIP start for the first self.k paths
+        # (the new paths start with weight 0).
+        if new_k < self.k:
+            raise ValueError(f"new_k must be at least the current number of paths {self.k}, not {new_k}")
+
+        start_edge_values = {}
+        start_weights = {}
+        if self.is_solved():
+            start_edge_values = self.solver.get_values(self.edge_vars)
+            start_weights = self.solver.get_values(self.path_weights_vars)
+
+        self._reset_cache()
+        self._encode_model(new_k)
+
+        if start_weights:
+            start_values = {self.edge_vars[index]: value for index, value in start_edge_values.items()}
+            for (u, v, i), value in start_edge_values.items():
+                start_values[self.pi_vars[(u, v, i)]] = value * start_weights[i]
+            for i in range(new_k):
+                start_values[self.path_weights_vars[(i)]] = start_weights.get(i, 0)
+            self.solver.set_start_values(start_values)
+
+    def _reset_cache(self):
+        # The cached solution and objective value are no longer valid after a new solve.
+        # reset_solution_cache() from AbstractPathModelDAG clears the cached paths and self._solution
+        self.reset_solution_cache()
+        self._objective_value = None
+
+    def solve(self):
+        self._reset_cache()
+        return super().solve()
             
     def _encode_inexact_flow_decomposition(self):
 
-        # Get the maximum data in an edge indexed under self.lb.
+        # Get the maximum data in an edge indexed under self.ub.
         # This will be used to set the upper bound of the path weights, since a path weight larger than this
         # would not "fit" inside the flow interval of an edge.
-        maximum_allowed_path_weight = max(data.get(self.ub,0) for u, v, data in self.G.edges(data=True))
+        # The edge attributes are cached by the graph as numpy arrays, in the order of self.G.edges().
+        ub_array = self.G.get_edge_attr_array(self.ub)
+        lb_array = self.G.get_edge_attr_array(self.lb)
+        maximum_allowed_path_weight = self.weight_type(self.G.get_edge_attr_max(self.ub))
+        var_type = "integer" if self.weight_type == int else "continuous"
 
         # From the super class, we already have the edge_vars, such that
         # edge_vars[(u,v,i)] = 1 if path i goes through edge (u,v), 0 otherwise
@@ -68,54 +144,128 @@ class kInexactFlowDecomposition(fp.AbstractPathModelDAG):
             name_prefix="w",
             lb=0,
             ub=maximum_allowed_path_weight,
+            var_type=var_type,
         )
 
+        # We ignore edges incident to the artificial global source and sink,
+        # so we keep only the positions (in self.G.edges()) of the other edges, and their lb/ub values
+        edges = list(self.G.edges())
+        kept_indices = self.G.non_st_edge_indices
+        kept_edges = [edges[edge_index] for edge_index in kept_indices.tolist()]
+        kept_lbs = lb_array[kept_indices].tolist()
+        kept_ubs = ub_array[kept_indices].tolist()
+        edge_ub = dict(zip(kept_edges, kept_ubs))
+
         # The pi_vars will be used to encode the product of edge_vars and path_weights_vars
         # Specifically, pi_vars[(u,v,i)] = edge_vars[(u,v,i)] * path_weights_vars[(i)]
         # This means pi_vars[(u,v,i)] equals path_weights_vars[(i)] if path i goes through edge (u,v), otherwise it is 0
+        # Since the sum of the pi_vars of an edge is at most the upper bound of the edge, we use it as upper bound
+        # of each pi_var of the edge (the edges incident to the global source and sink keep the global bound).
         self.pi_vars = self.solver.add_variables(
             self.edge_indexes,
             name_prefix="pi",
             lb=0,
-            ub=maximum_allowed_path_weight,
+            ub={(u, v, i): edge_ub.get((u, v), maximum_allowed_path_weight) for (u, v, i) in self.edge_indexes},
+            var_type=var_type,
         )
 
+        # We encode that edge_vars[(u,v,i)] * path_weights_vars[(i)] = pi_vars[(u,v,i)], for all kept edges (u,v) and all i.
+        # Since this is a non-linear term, we use the add_binary_continuous_product_constraints method that
+        # introduces additional constraints to linearize it for us (for all the edges and paths in one batch).
+        emit_products = self._specialize_product_emitter(self.k, maximum_allowed_path_weight)
+        emit_products(kept_edges)
+
+        # The linearization above contains pi_vars[(u,v,i)] <= maximum_allowed_path_weight * edge_vars[(u,v,i)].
+        # For an edge whose upper bound is smaller, we tighten this to pi_vars[(u,v,i)] <= ub(u,v) * edge_vars[(u,v,i)],
+        # which strengthens the LP relaxation. Note that the per-edge bound cannot replace maximum_allowed_path_weight
+        # in the other linearization constraints: pi_vars[(u,v,i)] >= path_weights_vars[(i)] - bound * (1 - edge_vars[(u,v,i)])
+        # would then wrongly forbid path i to be heavier than ub(u,v) even when it does not use the edge (u,v).
+        for (u, v), ub_u_v in zip(kept_edges, kept_ubs):
+            if ub_u_v < maximum_allowed_path_weight:
+                for i in range(self.k):
+                    self.solver.add_constraint(
+                        self.pi_vars[(u, v, i)] <= ub_u_v * self.edge_vars[(u, v, i)],
+                        name=f"pitight_u={u}_v={v}_i={i}",
+                    )
+
         # We encode that for each edge (u,v), the sum of the weights of the paths 
-        # going through the edge is in the flow interval of the edge.
-        for u, v, data in self.G.edges(data=True):
-            # We ignore edges incident to the artificial global source and sink
-            if (u, v) in self.G.source_sink_edges:
-                continue
-
-            # We encode that edge_vars[(u,v,i)] * path_weights_vars[(i)] = pi_vars[(u,v,i)]
-            # Since this is a non-linear term, we will use the add_product_constraint method that 
-            # will introduce additional constraints to linearize it for us, assuming that
-            # 0 <= path_weights_vars[(i)] <= maximum_allowed_path_weight, which is the case
-            for i in range(self.k):
-                self.solver.add_binary_continuous_product_constraint(
-                    binary_var=self.edge_vars[(u, v, i)],
-                    continuous_var=self.path_weights_vars[(i)],
-                    product_var=self.pi_vars[(u, v, i)],
-                    lb=0,
-                    ub=maximum_allowed_path_weight,
-                    name=f"product_u={u}_v={v}_i={i}",
-                )
-
-            # We next encode that the sum of the weights of the paths going through the edge 
-            # is at least the lowerbound, and at most the upper bound of the edge.
-            
-            # That is, the sum of the pi_vars for edge (u,v) is at least the lowerbound of the edge,
-            self.solver.add_constraint(
-                self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k)) >= data[self.lb],
-                name=f"lowerbound_u={u}_v={v}",
+        # going through the edge is in the flow interval of the edge, that is, at least the lowerbound,
+        # and at most the upper bound of the edge.
+        # Each edge gives a single range constraint on the sum of its pi_vars, and all of them are added in one batch.
+        pi_vars = self.pi_vars
+        paths = range(self.k)
+        self.solver.add_sum_range_constraints(
+            var_groups=[[pi_vars[(u, v, i)] for i in paths] for (u, v) in kept_edges],
+            lb=kept_lbs,
+            ub=kept_ubs,
+            name="flowinterval",
+        )
+
+    def _specialize_product_emitter(self, k, bound):
+        # Returns a function adding the constraints pi_vars[(u,v,i)] = edge_vars[(u,v,i)] * path_weights_vars[(i)],
+        # for all given edges (u,v) and all i < k, assuming 0 <= path_weights_vars[(i)] <= bound, which is the case.
+        # Everything that does not depend on the edges (the solver method, the path weight variables, the bounds)
+        # is looked up once here.
+        if self.weight_encoding == "binary_expansion":
+            return self._specialize_binary_expansion_product_emitter(k, bound)
+
+        add_products = self.solver.add_binary_continuous_product_constraints
+        edge_vars = self.edge_vars
+        pi_vars = self.pi_vars
+        weight_vars = [self.path_weights_vars[(i)] for i in range(k)]
+        paths = range(k)
+
+        def emit_products(edges):
+            add_products(
+                binary_vars=[edge_vars[(u, v, i)] for (u, v) in edges for i in paths],
+                continuous_vars=weight_vars * len(edges),
+                product_vars=[pi_vars[(u, v, i)] for (u, v) in edges for i in paths],
+                lb=0,
+                ub=bound,
             )
 
-            # and at most the upperbound of the edge.
-            self.solver.add_constraint(
-                self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k)) <= data[self.ub],
-                name=f"upperbound_u={u}_v={v}",
+        return emit_products
+
+    def _specialize_binary_expansion_product_emitter(self, k, bound):
+        # As _specialize_product_emitter, but with the path weights written in binary (weight_encoding="binary_expansion").
+        # The path weights are integers at most bound, so they fit in num_bits bits.
+        num_bits = max(1, int(bound).bit_length())
+        bits = range(num_bits)
+        paths = range(k)
+        solver = self.solver
+        edge_vars = self.edge_vars
+        pi_vars = self.pi_vars
+
+        # We encode path_weights_vars[(i)] = sum_j 2^j * w_bits[(i,j)]
+        w_bits = solver.add_variables(
+            [(i, j) for i in paths for j in bits], name_prefix="wbit", lb=0, ub=1, var_type="integer"
+        )
+        for i in paths:
+            solver.add_constraint(
+                self.path_weights_vars[(i)] == solver.quicksum(2**j * w_bits[(i, j)] for j in bits),
+                name=f"wbits_i={i}",
             )
 
+        def emit_products(edges):
+            # z_vars[(u,v,i,j)] = edge_vars[(u,v,i)] * w_bits[(i,j)], and pi_vars[(u,v,i)] = sum_j 2^j * z_vars[(u,v,i,j)]
+            z_indexes = [(u, v, i, j) for (u, v) in edges for i in paths for j in bits]
+            z_vars = solver.add_variables(z_indexes, name_prefix="zbit", lb=0, ub=1, var_type="continuous")
+            solver.add_binary_continuous_product_constraints(
+                binary_vars=[edge_vars[(u, v, i)] for (u, v, i, j) in z_indexes],
+                continuous_vars=[w_bits[(i, j)] for (u, v, i, j) in z_indexes],
+                product_vars=[z_vars[index] for index in z_indexes],
+                lb=0,
+                ub=1,
+            )
+            for (u, v) in edges:
+                for i in paths:
+                    solver.add_constraint(
+                        pi_vars[(u, v, i)] == solver.quicksum(2**j * z_vars[(u, v, i, j)] for j in bits),
+                        name=f"pibits_u={u}_v={v}_i={i}",
+                    )
+
+        return emit_products
+
     def _encode_objective(self):
 
         # We set the objective to minimize the sum of the path weights
@@ -132,7 +282,7 @@ class kInexactFlowDecomposition(fp.AbstractPathModelDAG):
         solution_weights_dict = self.solver.get_values(self.path_weights_vars)
         self._solution = {
             "paths": self.get_solution_paths(),
-            "weights": [solution_weights_dict[i] for i in range(self.k)],
+            "weights": [round(solution_weights_dict[i]) if self.weight_type == int else solution_weights_dict[i] for i in range(self.k)],
         }
 
         return self._solution
@@ -152,7 +302,9 @@ class kInexactFlowDecomposition(fp.AbstractPathModelDAG):
         # This is useful if we want to compute the safe paths of any solution to our kInexactFlowDecomposition, 
         # namely those paths that are guaranteed to appear as subpath in some path of any optimal solution.
         
-        return self.solver.get_objective_value()
+        if self._objective_value is None:
+            self._objective_value = self.solver.get_objective_value()
+        return self._objective_value
     
     def get_lowerbound_k(self):
         # AbstractPathModelDAG requires implementing a method to get the lowerbound for the number of paths.
@@ -160,21 +312,39 @@ class kInexactFlowDecomposition(fp.AbstractPathModelDAG):
         # We know that each edge with lb > 0 must be covered by at least one path.
         # Therefore, a lowerbound is the minimum number of paths needed to cover all the edges with lb > 0.
 
-        weight_function = {(u,v): 1 for u, v, data in self.G.edges(data=True) if data.get(self.lb, 0 ) > 0}
-        return self.G.compute_max_edge_antichain(weight_function=weight_function)
+        # Since the graph does not change, we compute this only once.
+        if self._lb_k_cache is not None:
+            return self._lb_k_cache
+
+        # The edges with lb > 0 are selected at once from the cached array of lower bounds
+        lb_array = self.G.get_edge_attr_array(self.lb)
+        lb_edge_indices = np.flatnonzero(lb_array > 0)
+        if len(lb_edge_indices) == 0:
+            # No edge needs to be covered, so a single path (e.g. of weight 0) can be a solution, and the lowerbound is 1.
+            # (Passing the empty weight_function to compute_max_edge_antichain would give the width of the graph instead,
+            # since it then uses weight 1 for all edges, which is not a lowerbound in this case.)
+            self._lb_k_cache = 1
+            return self._lb_k_cache
+
+        edges = list(self.G.edges())
+        weight_function = {edges[edge_index]: 1 for edge_index in lb_edge_indices.tolist()}
+        self._lb_k_cache = self.G.compute_max_edge_antichain(weight_function=weight_function)
+        return self._lb_k_cache
 
 def main():    
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("0", "a", lb=2, ub=6)
-    graph.add_edge("0", "b", lb=7, ub=7)
-    graph.add_edge("a", "b", lb=1, ub=2)
-    graph.add_edge("a", "c", lb=3, ub=5)
-    graph.add_edge("b", "c", lb=5, ub=9)
-    graph.add_edge("c", "d", lb=3, ub=6)
-    graph.add_edge("c", "1", lb=4, ub=7)
-    graph.add_edge("d", "1", lb=2, ub=6)
+    graph.add_edges_from([
+        ("0", "a", {"lb": 2, "ub": 6}),
+        ("0", "b", {"lb": 7, "ub": 7}),
+        ("a", "b", {"lb": 1, "ub": 2}),
+        ("a", "c", {"lb": 3, "ub": 5}),
+        ("b", "c", {"lb": 5, "ub": 9}),
+        ("c", "d", {"lb": 3, "ub": 6}),
+        ("c", "1", {"lb": 4, "ub": 7}),
+        ("d", "1", {"lb": 2, "ub": 6}),
+    ])
 
     # We create a kInexactFlowDecomposition model
     # with the flow lower bounds in the attribute `lb` of the edges,
@@ -193,6 +363,22 @@ def main():
     else:
         print("Model could not be solved.")
 
+    # We extend the model to 4 paths, and solve it again, starting from the solution with 3 paths
+    kifd_model.extend_k(4)
+    kifd_model.solve()
+    if kifd_model.is_solved():
+        print(kifd_model.get_solution())
+    else:
+        print("Model could not be solved.")
+
+    # The same model, with integer path weights encoded in binary
+    kifd_model_bits = kInexactFlowDecomposition(graph, lb="lb", ub="ub", num_paths=3, weight_encoding="binary_expansion")
+    kifd_model_bits.solve()
+    if kifd_model_bits.is_solved():
+        print(kifd_model_bits.get_solution())
+    else:
+        print("Model could not be solved.")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,11 +1,14 @@
 import flowpaths as fp
 import networkx as nx
+import os
 
-def test_decomposition_models():
+def test_decomposition_models(validate: bool = False):
+    # If validate is True, each model is solved both with the built-in handling of node weights,
+    # and on the node expanded graph, and we check that the two give the same objective value.
 
     # Configure logging
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
 
@@ -36,32 +39,36 @@ def test_decomposition_models():
     # We transform the constraints into constraints in the node expanded graph
     ne_subpath_constraints_edges = neGraph.get_expanded_subpath_constraints(subpath_constraints_edges)
 
-    for model_type in [fp.kFlowDecomp, fp.kLeastAbsErrors, fp.kMinPathError]:
-            
+    # The arguments common to all models
+    common_kwargs = {"k": 3, "flow_attr": "flow"}
 
-        # We solve the problem on the node expanded graph  
-        ne_model = model_type(
-            neGraph, 
-            k=3,
-            flow_attr="flow",
-            elements_to_ignore=neGraph.edges_to_ignore,
-            subpath_constraints=ne_subpath_constraints_edges,
-            )
-        ne_model.solve()
+    for model_type in [fp.kFlowDecomp, fp.kLeastAbsErrors, fp.kMinPathError]:
 
-        # We also use the built-in handling of node-weighted graphs, via the `flow_attr_origin` parameter
+        # We use the built-in handling of node-weighted graphs, via the `flow_attr_origin` parameter
         model = model_type(
             graph, 
-            k=3,
-            flow_attr="flow",
             flow_attr_origin="node",
             subpath_constraints=subpath_constraints_edges,
+            **common_kwargs,
             )
         model.solve()
 
         fp.utils.logger.debug(f"Model type: {model_type.__name__}")
-        fp.utils.logger.debug(f"Objective value: {ne_model.get_objective_value()}")
-        fp.utils.logger.debug(f"Objective value ne: {model.get_objective_value()}")
+        fp.utils.logger.debug(f"Objective value: {model.get_objective_value()}")
+
+        if not validate:
+            continue
+
+        # We also solve the problem on the node expanded graph  
+        ne_model = model_type(
+            neGraph, 
+            elements_to_ignore=neGraph.edges_to_ignore,
+            subpath_constraints=ne_subpath_constraints_edges,
+            **common_kwargs,
+            )
+        ne_model.solve()
+
+        fp.utils.logger.debug(f"Objective value ne: {ne_model.get_objective_value()}")
         assert(ne_model.get_objective_value() == model.get_objective_value())
         assert(sum(ne_model.get_solution()["weights"]) == sum(model.get_solution()["weights"]))
         assert(len(ne_model.get_solution()["paths"]) == len(model.get_solution()["paths"]))
@@ -70,7 +77,7 @@ def test_min_error_flow():
 
     # Configure logging
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
 
@@ -115,7 +122,7 @@ def test_min_path_cover():
 
     # Configure logging
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
 
@@ -155,7 +162,7 @@ def test_min_path_cover():
     
 
 def main():
-    test_decomposition_models()
+    test_decomposition_models(validate=True)
     test_min_error_flow()
     test_min_path_cover()
 
@@ -1,5 +1,6 @@
 import flowpaths as fp
 import networkx as nx
+import os
 
 def test1():
     # Create a simple graph
@@ -55,20 +56,22 @@ def test2():
     kfd_model.solve()
     process_solution(graph, None, kfd_model)
 
-def test3(k: int, filename: str):
+def test3(k: int, filename: str, draw_input: bool = False, threads: int = os.cpu_count(), presolve: str = "on"):
     # read the graph from file
     graph = fp.graphutils.read_graphs(filename)[0]
-    fp.utils.draw(
-            G=graph,
-            filename=filename + ".pdf",
-            flow_attr="flow",
-            draw_options={
-            "show_graph_edges": True,
-            "show_edge_weights": True,
-            "show_path_weights": False,
-            "show_path_weight_on_first_edge": True,
-            "pathwidth": 2,
-        })
+    # drawing the input graph is not needed for solving, and rendering it can take longer than the solve itself
+    if draw_input:
+        fp.utils.draw(
+                G=graph,
+                filename=filename + ".pdf",
+                flow_attr="flow",
+                draw_options={
+                "show_graph_edges": True,
+                "show_edge_weights": True,
+                "show_path_weights": False,
+                "show_path_weight_on_first_edge": True,
+                "pathwidth": 2,
+            })
 
     kfd_model = fp.kFlowDecompCycles(
         G=graph,
@@ -79,7 +82,12 @@ def test3(k: int, filename: str):
             "optimize_with_safe_sequences": False,
             "optimize_with_safety_as_subset_constraints": False,
         },
-        solver_options={"external_solver": "highs"},
+        solver_options={
+            "external_solver": "highs",
+            "threads": threads,
+            "presolve": presolve,
+            "time_limit": 600,
+        },
     )
     kfd_model.solve()
     process_solution(graph, filename, kfd_model)
@@ -1,6 +1,7 @@
 from pathlib import Path
 
 import flowpaths as fp
+import os
 
 
 DATASET_FOLDER = Path(__file__).resolve().parents[1] / "tests" / "acyclic_graphs" / "SIRV.ONT_R10.real_exp_downsample"
@@ -14,7 +15,7 @@ def run_kmin_path_error_on_intron_graphs(
 ):
     # Configure logging
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
 
@@ -1,6 +1,7 @@
 from pathlib import Path
 
 import flowpaths as fp
+import os
 
 
 # GRAPH_FILE = "tests/cyclic_graphs/gt1.kmer27.(0.10000).V28.E36.mincyc100.perf.graph"
@@ -12,7 +13,7 @@ GRAPH_FILE = "tests/cyclic_graphs/gt5.kmer63.(0.10000).V375.E560.mincyc100.perf.
 
 # Configure logging
 fp.utils.configure_logging(
-    level=fp.utils.logging.DEBUG,
+    level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
     log_to_console=True,
 )
 
@@ -1,19 +1,22 @@
 import flowpaths as fp
 import networkx as nx
+import os
 
 def main():
 
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("s", "a", flow=3)
-    graph.add_edge("s", "b", flow=7)
-    graph.add_edge("a", "b", flow=2)
-    graph.add_edge("a", "c", flow=7)
-    graph.add_edge("b", "c", flow=9)
-    graph.add_edge("c", "d", flow=6)
-    graph.add_edge("c", "t", flow=7)
-    graph.add_edge("d", "t", flow=3)
+    graph.add_edges_from([
+        ("s", "a", {"flow": 3}),
+        ("s", "b", {"flow": 7}),
+        ("a", "b", {"flow": 2}),
+        ("a", "c", {"flow": 7}),
+        ("b", "c", {"flow": 9}),
+        ("c", "d", {"flow": 6}),
+        ("c", "t", {"flow": 7}),
+        ("d", "t", {"flow": 3}),
+    ])
 
     # We create a Least Absolute Errors solver with default settings, 
     # by specifying that the flow value of each edge is in the attribute `flow` of the edges,
@@ -76,7 +79,8 @@ def main():
 def process_solution(model: fp.kLeastAbsErrors):
     if model.is_solved():
         print(model.get_solution())
-        print("model.is_valid_solution()", model.is_valid_solution())
+        if os.environ.get("FP_VERIFY"):
+            assert model.is_valid_solution()
     else:
         print("Model could not be solved.")
 
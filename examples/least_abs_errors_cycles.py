@@ -1,14 +1,18 @@
 import flowpaths as fp
 import networkx as nx
+import os
+import helpers
 
 def test1():
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("s", "a", flow=1)
-    graph.add_edge("a", "b", flow=2)
-    graph.add_edge("b", "a", flow=2)
-    graph.add_edge("a", "t", flow=1)
+    graph.add_edges_from([
+        ("s", "a", {"flow": 1}),
+        ("a", "b", {"flow": 2}),
+        ("b", "a", {"flow": 2}),
+        ("a", "t", {"flow": 1}),
+    ])
 
     # We create a Least Absolute Errors solver with default settings, 
     # by specifying that the flow value of each edge is in the attribute `flow` of the edges,
@@ -30,21 +34,23 @@ def test2():
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("s", "a", flow=3)
-    graph.add_edge("a", "t", flow=3)
-    graph.add_edge("s", "b", flow=6)
-    graph.add_edge("b", "a", flow=2)
-    graph.add_edge("a", "h", flow=2)
-    graph.add_edge("h", "t", flow=6)
-    graph.add_edge("b", "c", flow=4)
-    graph.add_edge("c", "d", flow=4)
-    graph.add_edge("c", "h", flow=4)
-    graph.add_edge("d", "h", flow=0)
-    graph.add_edge("d", "e", flow=4)
-    graph.add_edge("e", "c", flow=5)
-    graph.add_edge("e", "f", flow=4)
-    graph.add_edge("f", "g", flow=4)
-    graph.add_edge("g", "e", flow=4)
+    graph.add_edges_from([
+        ("s", "a", {"flow": 3}),
+        ("a", "t", {"flow": 3}),
+        ("s", "b", {"flow": 6}),
+        ("b", "a", {"flow": 2}),
+        ("a", "h", {"flow": 2}),
+        ("h", "t", {"flow": 6}),
+        ("b", "c", {"flow": 4}),
+        ("c", "d", {"flow": 4}),
+        ("c", "h", {"flow": 4}),
+        ("d", "h", {"flow": 0}),
+        ("d", "e", {"flow": 4}),
+        ("e", "c", {"flow": 5}),
+        ("e", "f", {"flow": 4}),
+        ("f", "g", {"flow": 4}),
+        ("g", "e", {"flow": 4}),
+    ])
 
     lae_model = fp.kLeastAbsErrorsCycles(
         G=graph, 
@@ -55,20 +61,11 @@ def test2():
     lae_model.solve()
     process_solution(graph, lae_model)
 
-def test3(filename: str):
-    # read the graph from file
-    graph = fp.graphutils.read_graphs(filename)[0]
-    fp.utils.draw(
-            G=graph,
-            filename=filename + ".pdf",
-            flow_attr="flow",
-            draw_options={
-            "show_graph_edges": True,
-            "show_edge_weights": True,
-            "show_path_weights": False,
-            "show_path_weight_on_first_edge": True,
-            "pathwidth": 2,
-        })
+def test3(filename: str, threads: int = 4):
+    # read the graph from file (the parsed graphs are cached, so the file is parsed again only if it changed)
+    graph = fp.graphutils.read_graphs_cached(filename)[0]
+    # draw the input graph in a background thread, while the model is solved
+    draw_thread = helpers.draw_input_graph_in_background(graph, filename)
 
     lae_model = fp.kLeastAbsErrorsCycles(
         G=graph,
@@ -78,22 +75,26 @@ def test3(filename: str):
             "optimize_with_safe_sequences": True,
             "optimize_with_safety_as_subset_constraints": False,
         },
-        solver_options={"external_solver": "highs"},
+        solver_options={"external_solver": "highs", "threads": threads},
         trusted_edges_for_safety=graph.edges()
     )
     lae_model.solve()
+    if draw_thread is not None:
+        draw_thread.join()
     process_solution(graph, filename, lae_model)
 
 def process_solution(graph, filename, model: fp.kLeastAbsErrors):
     if model.is_solved():
-        # print(model.get_solution())
-        print("model.is_valid_solution()", model.is_valid_solution())
+        solution = model.get_solution()
+        # print(solution)
+        if os.environ.get("FP_VERIFY"):
+            assert model.is_valid_solution()
         fp.utils.draw(
             G=graph,
             filename=filename + ".solved.pdf",
             flow_attr="flow",
-            paths=model.get_solution()["walks"],
-            weights=model.get_solution()["weights"],
+            paths=solution["walks"],
+            weights=solution["weights"],
             draw_options={
             "show_graph_edges": True,
             "show_edge_weights": False,
@@ -105,19 +106,25 @@ def process_solution(graph, filename, model: fp.kLeastAbsErrors):
     else:
         print("Model could not be solved.")
 
-def main():
+def main(parallel: bool = False):
     # test1()
     # test2()
-    test3(filename = "tests/cyclic_graphs/gt3.kmer15.(130000.132000).V23.E32.cyc100.graph")
-    test3(filename = "tests/cyclic_graphs/gt4.kmer15.(2898000.2900000).V29.E40.cyc448.graph")
-    test3(filename = "tests/cyclic_graphs/gt5.kmer15.(92000.94000).V76.E104.cyc64.graph")
-    test3(filename = "tests/cyclic_graphs/gt6.kmer15.(4208000.4210000).V33.E50.cyc157.graph")
-    
+    filenames = [
+        "tests/cyclic_graphs/gt3.kmer15.(130000.132000).V23.E32.cyc100.graph",
+        "tests/cyclic_graphs/gt4.kmer15.(2898000.2900000).V29.E40.cyc448.graph",
+        "tests/cyclic_graphs/gt5.kmer15.(92000.94000).V76.E104.cyc64.graph",
+        "tests/cyclic_graphs/gt6.kmer15.(4208000.4210000).V33.E50.cyc157.graph",
+    ]
+    if parallel and len(filenames) > 1:
+        helpers.run_in_parallel(test3, filenames)
+    else:
+        for filename in filenames:
+            test3(filename = filename)
 
 if __name__ == "__main__":
     # Configure logging
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
-    main()
\ No newline at end of file
+    main(parallel=True)
\ No newline at end of file
@@ -1,20 +1,13 @@
 import flowpaths as fp
 import networkx as nx
+import os
+import helpers
 
 def test(filename: str):
-    # read the graph from file
-    graph = fp.graphutils.read_graphs(filename)[0]
-    fp.utils.draw(
-            G=graph,
-            filename=filename + ".pdf",
-            flow_attr="flow",
-            draw_options={
-            "show_graph_edges": True,
-            "show_edge_weights": True,
-            "show_path_weights": False,
-            "show_path_weight_on_first_edge": True,
-            "pathwidth": 2,
-        })
+    # read the graph from file (the parsed graphs are cached, so the file is parsed again only if it changed)
+    graph = fp.graphutils.read_graphs_cached(filename)[0]
+    # draw the input graph in a background thread, while the model is solved
+    draw_thread = helpers.draw_input_graph_in_background(graph, filename)
 
     mfd_model = fp.MinFlowDecompCycles(
         G=graph,
@@ -29,12 +22,15 @@ def test(filename: str):
         solver_options={"external_solver": "highs"},
     )
     mfd_model.solve()
+    if draw_thread is not None:
+        draw_thread.join()
     process_solution(graph, filename, mfd_model)
 
 def process_solution(graph, filename = None, model: fp.kFlowDecompCycles = None):
     if model.is_solved():
         print(model.get_solution())
-        print("model.is_valid_solution()", model.is_valid_solution())
+        if os.environ.get("FP_VERIFY"):
+            assert model.is_valid_solution()
         if filename is not None:
             fp.utils.draw(
                 G=graph,
@@ -62,7 +58,7 @@ def main():
 if __name__ == "__main__":
     # Configure logging
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
     main()
\ No newline at end of file
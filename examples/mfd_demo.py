@@ -2,7 +2,8 @@ import flowpaths as fp
 import networkx as nx
 
 def test_min_flow_decomp(filename: str):
-    graph = fp.graphutils.read_graphs(filename)[0]
+    # read the graph from file (the parsed graphs are cached, so the file is parsed again only if it changed)
+    graph = fp.graphutils.read_graphs_cached(filename)[0]
     print("graph id", graph.graph["id"])
     print("subset_constraints", graph.graph["constraints"])
     # fp.utils.draw(
@@ -36,7 +37,7 @@ def test_min_flow_decomp(filename: str):
         solver_options={
             "external_solver": "highs", # we can try also "highs" at some point
             "time_limit": 300, # 300s = 5min, is it ok?
-            "threads": 1
+            "threads": 0, # all the CPUs
         },
     )
     mfd_model.solve()
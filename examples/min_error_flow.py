@@ -13,22 +13,24 @@ def process_solution(graph: nx.DiGraph, model: fp.MinErrorFlow):
         print("Model could not be solved.")
 
 graph = nx.DiGraph()
-graph.add_edge("s", "a", flow=7)
-graph.add_edge("s", "b", flow=7)
-graph.add_edge("a", "b", flow=2)
-graph.add_edge("a", "c", flow=4)
-graph.add_edge("b", "c", flow=9)
-graph.add_edge("c", "d", flow=7)
-graph.add_edge("c", "t", flow=7)
-graph.add_edge("d", "t", flow=6)
+graph.add_edges_from([
+    ("s", "a", {"flow": 7}),
+    ("s", "b", {"flow": 7}),
+    ("a", "b", {"flow": 2}),
+    ("a", "c", {"flow": 4}),
+    ("b", "c", {"flow": 9}),
+    ("c", "d", {"flow": 7}),
+    ("c", "t", {"flow": 7}),
+    ("d", "t", {"flow": 6}),
+])
 
 # We create a the Minimum Error Flow solver with default settings
 correction_model = fp.MinErrorFlow(graph, flow_attr="flow")
 correction_model.solve()
 
 if correction_model.is_solved():
-    corrected_graph = correction_model.get_corrected_graph()
-    mfd_model = fp.MinFlowDecomp(corrected_graph, flow_attr="flow")
+    # We decompose the corrected graph with a MinFlowDecomp model built from the correction model
+    mfd_model = correction_model.decompose()
     mfd_model.solve()
     if mfd_model.is_solved():
         print(mfd_model.get_solution())
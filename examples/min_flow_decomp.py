@@ -1,24 +1,27 @@
 import flowpaths as fp
 import networkx as nx
+import os
 
 def main():
     # Configure logging
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
     
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("s", "a", flow=6)
-    graph.add_edge("s", "b", flow=7)
-    graph.add_edge("a", "b", flow=2)
-    graph.add_edge("a", "c", flow=4)
-    graph.add_edge("b", "c", flow=9)
-    graph.add_edge("c", "d", flow=6)
-    graph.add_edge("c", "t", flow=7)
-    graph.add_edge("d", "t", flow=6)
+    graph.add_edges_from([
+        ("s", "a", {"flow": 6}),
+        ("s", "b", {"flow": 7}),
+        ("a", "b", {"flow": 2}),
+        ("a", "c", {"flow": 4}),
+        ("b", "c", {"flow": 9}),
+        ("c", "d", {"flow": 6}),
+        ("c", "t", {"flow": 7}),
+        ("d", "t", {"flow": 6}),
+    ])
 
     # We create a Minimum Flow Decomposition solver with default settings,
     # by specifying that the flow value of each edge is in the attribute `flow` of the edges.
@@ -52,7 +55,8 @@ def main():
     kfd_model_3.solve()
     process_solution(kfd_model_3)
 
-    kfd_model_4 = fp.kFlowDecomp(graph, flow_attr="flow", k=4)
+    # The model with k=4 reuses the parts of the model with k=3 that do not depend on k
+    kfd_model_4 = fp.kFlowDecomp(graph, flow_attr="flow", k=4, base_model=kfd_model_3)
     kfd_model_4.solve()
     process_solution(kfd_model_4)
 
@@ -5,14 +5,16 @@ def main():
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("s", "a", flow=6)
-    graph.add_edge("s", "b", flow=7)
-    graph.add_edge("a", "b", flow=2)
-    graph.add_edge("a", "c", flow=4)
-    graph.add_edge("b", "c", flow=9)
-    graph.add_edge("c", "d", flow=6)
-    graph.add_edge("c", "t", flow=7)
-    graph.add_edge("d", "t", flow=6)
+    graph.add_edges_from([
+        ("s", "a", {"flow": 6}),
+        ("s", "b", {"flow": 7}),
+        ("a", "b", {"flow": 2}),
+        ("a", "c", {"flow": 4}),
+        ("b", "c", {"flow": 9}),
+        ("c", "d", {"flow": 6}),
+        ("c", "t", {"flow": 7}),
+        ("d", "t", {"flow": 6}),
+    ])
 
     # We create a Minimum Flow Decomposition solver using the NumPathsOptimization class   
     mfd_model = fp.NumPathsOptimization(
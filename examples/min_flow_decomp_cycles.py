@@ -4,21 +4,23 @@ import networkx as nx
 
 def test():
     graph = nx.DiGraph()
-    graph.add_edge("s", "a", flow=3)
-    graph.add_edge("a", "t", flow=3)
-    graph.add_edge("s", "b", flow=6)
-    graph.add_edge("b", "a", flow=2)
-    graph.add_edge("a", "h", flow=2)
-    graph.add_edge("h", "t", flow=6)
-    graph.add_edge("b", "c", flow=4)
-    graph.add_edge("c", "d", flow=4)
-    graph.add_edge("c", "h", flow=4)
-    graph.add_edge("d", "h", flow=0)
-    graph.add_edge("d", "e", flow=4)
-    graph.add_edge("e", "c", flow=4)
-    graph.add_edge("e", "f", flow=8)
-    graph.add_edge("f", "g", flow=8)
-    graph.add_edge("g", "e", flow=8)
+    graph.add_edges_from([
+        ("s", "a", {"flow": 3}),
+        ("a", "t", {"flow": 3}),
+        ("s", "b", {"flow": 6}),
+        ("b", "a", {"flow": 2}),
+        ("a", "h", {"flow": 2}),
+        ("h", "t", {"flow": 6}),
+        ("b", "c", {"flow": 4}),
+        ("c", "d", {"flow": 4}),
+        ("c", "h", {"flow": 4}),
+        ("d", "h", {"flow": 0}),
+        ("d", "e", {"flow": 4}),
+        ("e", "c", {"flow": 4}),
+        ("e", "f", {"flow": 8}),
+        ("f", "g", {"flow": 8}),
+        ("g", "e", {"flow": 8}),
+    ])
 
     mfd_model = fp.MinFlowDecompCycles(G=graph, flow_attr="flow")
     mfd_model.solve()
@@ -30,7 +32,7 @@ def test():
 
 def test3(k: int, filename: str):
     # read the graph from file
-    graph = fp.graphutils.read_graphs(filename)[0]
+    graph = fp.graphutils.read_graphs_cached(filename)[0]
     fp.utils.draw(
             G=graph,
             filename=filename + ".pdf",
@@ -59,15 +61,16 @@ def test3(k: int, filename: str):
 
 def process_solution(graph, filename = None, model: fp.kFlowDecompCycles = None):
     if model.is_solved():
-        print(model.get_solution())
+        solution = model.get_solution()
+        print(solution)
         print("model.is_valid_solution()", model.is_valid_solution())
         if filename is not None:
             fp.utils.draw(
                 G=graph,
                 filename=filename + ".solved.pdf",
                 flow_attr="flow",
-                paths=model.get_solution()["walks"],
-                weights=model.get_solution()["weights"],
+                paths=solution["walks"],
+                weights=solution["weights"],
                 draw_options={
                 "show_graph_edges": True,
                 "show_edge_weights": False,
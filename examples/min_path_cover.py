@@ -4,14 +4,16 @@ import networkx as nx
 def main():
     # Create a simple graph
     graph = nx.DiGraph()
-    graph.add_edge("s", "a")
-    graph.add_edge("s", "b")
-    graph.add_edge("a", "b")
-    graph.add_edge("a", "c")
-    graph.add_edge("b", "c")
-    graph.add_edge("c", "d")
-    graph.add_edge("c", "t")
-    graph.add_edge("d", "t")
+    graph.add_edges_from([
+        ("s", "a"),
+        ("s", "b"),
+        ("a", "b"),
+        ("a", "c"),
+        ("b", "c"),
+        ("c", "d"),
+        ("c", "t"),
+        ("d", "t"),
+    ])
 
     mpc_model = fp.MinPathCover(graph)
     mpc_model.solve()
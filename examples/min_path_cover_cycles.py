@@ -4,21 +4,23 @@ import networkx as nx
 
 def test():
     graph = nx.DiGraph()
-    graph.add_edge("s", "a")
-    graph.add_edge("a", "t")
-    graph.add_edge("s", "b")
-    graph.add_edge("b", "a")
-    graph.add_edge("a", "h")
-    graph.add_edge("h", "t")
-    graph.add_edge("b", "c")
-    graph.add_edge("c", "d")
-    graph.add_edge("c", "h")
-    graph.add_edge("d", "h")
-    graph.add_edge("d", "e")
-    graph.add_edge("e", "c")
-    graph.add_edge("e", "f")
-    graph.add_edge("f", "g")
-    graph.add_edge("g", "e")
+    graph.add_edges_from([
+        ("s", "a"),
+        ("a", "t"),
+        ("s", "b"),
+        ("b", "a"),
+        ("a", "h"),
+        ("h", "t"),
+        ("b", "c"),
+        ("c", "d"),
+        ("c", "h"),
+        ("d", "h"),
+        ("d", "e"),
+        ("e", "c"),
+        ("e", "f"),
+        ("f", "g"),
+        ("g", "e"),
+    ])
 
     mpc_model = fp.MinPathCoverCycles(G=graph)
     mpc_model.solve()
@@ -39,7 +41,7 @@ def test():
 
 def test3(k: int, filename: str):
     # read the graph from file
-    graph = fp.graphutils.read_graphs(filename)[0]
+    graph = fp.graphutils.read_graphs_cached(filename)[0]
     fp.utils.draw(
             G=graph,
             filename=filename + ".pdf",
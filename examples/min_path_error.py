@@ -5,14 +5,16 @@ def main():
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("0", "a", flow=6, length=2)
-    graph.add_edge("0", "b", flow=7, length=4)
-    graph.add_edge("a", "b", flow=2, length=6)
-    graph.add_edge("a", "c", flow=5, length=3)
-    graph.add_edge("b", "c", flow=9, length=1)
-    graph.add_edge("c", "d", flow=6, length=8)
-    graph.add_edge("c", "1", flow=7, length=9)
-    graph.add_edge("d", "1", flow=6, length=4)
+    graph.add_edges_from([
+        ("0", "a", {"flow": 6, "length": 2}),
+        ("0", "b", {"flow": 7, "length": 4}),
+        ("a", "b", {"flow": 2, "length": 6}),
+        ("a", "c", {"flow": 5, "length": 3}),
+        ("b", "c", {"flow": 9, "length": 1}),
+        ("c", "d", {"flow": 6, "length": 8}),
+        ("c", "1", {"flow": 7, "length": 9}),
+        ("d", "1", {"flow": 6, "length": 4}),
+    ])
 
     # We create a Minimum Path Error solver with default settings, 
     # by specifying that the flow value of each edge is in the attribute `flow` of the edges,
@@ -2,14 +2,16 @@ import flowpaths as fp
 import networkx as nx
 
 graph = nx.DiGraph()
-graph.add_edge("s", "a", flow=6)
-graph.add_edge("a", "b", flow=22)
-graph.add_edge("s", "b", flow=7)
-graph.add_edge("a", "c", flow=4)
-graph.add_edge("b", "c", flow=29)
-graph.add_edge("c", "d", flow=26)
-graph.add_edge("d", "t", flow=6)
-graph.add_edge("c", "t", flow=7)
+graph.add_edges_from([
+    ("s", "a", {"flow": 6}),
+    ("a", "b", {"flow": 22}),
+    ("s", "b", {"flow": 7}),
+    ("a", "c", {"flow": 4}),
+    ("b", "c", {"flow": 29}),
+    ("c", "d", {"flow": 26}),
+    ("d", "t", {"flow": 6}),
+    ("c", "t", {"flow": 7}),
+])
 
 mpe_model = fp.kMinPathError(graph, flow_attr="flow", k=4, weight_type=int)
 mpe_model.solve()
@@ -28,14 +30,16 @@ if mpe_model_2.is_solved():
     print(mpe_model_2.get_solution())
 
 graph10 = nx.DiGraph()
-graph10.add_edge("s", "a", flow=6)
-graph10.add_edge("a", "b", flow=12)
-graph10.add_edge("s", "b", flow=7)
-graph10.add_edge("a", "c", flow=4)
-graph10.add_edge("b", "c", flow=19)
-graph10.add_edge("c", "d", flow=16)
-graph10.add_edge("d", "t", flow=6)
-graph10.add_edge("c", "t", flow=7)
+graph10.add_edges_from([
+    ("s", "a", {"flow": 6}),
+    ("a", "b", {"flow": 12}),
+    ("s", "b", {"flow": 7}),
+    ("a", "c", {"flow": 4}),
+    ("b", "c", {"flow": 19}),
+    ("c", "d", {"flow": 16}),
+    ("d", "t", {"flow": 6}),
+    ("c", "t", {"flow": 7}),
+])
 
 mpe_model_10 = fp.kMinPathError(
     graph10, 
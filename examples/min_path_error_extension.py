@@ -5,14 +5,19 @@ def main():
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("0", "a", flow=6, length=2)
-    graph.add_edge("0", "b", flow=7, length=4)
-    graph.add_edge("a", "b", flow=2, length=6)
-    graph.add_edge("a", "c", flow=5, length=3)
-    graph.add_edge("b", "c", flow=9, length=1)
-    graph.add_edge("c", "d", flow=6, length=8)
-    graph.add_edge("c", "1", flow=7, length=9)
-    graph.add_edge("d", "1", flow=6, length=4)
+    graph.add_edges_from([
+        ("0", "a", {"flow": 6, "length": 2}),
+        ("0", "b", {"flow": 7, "length": 4}),
+        ("a", "b", {"flow": 2, "length": 6}),
+        ("a", "c", {"flow": 5, "length": 3}),
+        ("b", "c", {"flow": 9, "length": 1}),
+        ("c", "d", {"flow": 6, "length": 8}),
+        ("c", "1", {"flow": 7, "length": 9}),
+        ("d", "1", {"flow": 6, "length": 4}),
+    ])
+    # The graph is used by all the models below, and is not modified anymore. We freeze it, 
+    # so that the models can use it directly, instead of making their own copy of it.
+    nx.freeze(graph)
 
     # We create a Minimum Path Error solver with default settings, 
     # by specifying that the flow value of each edge is in the attribute `flow` of the edges,
@@ -28,7 +33,9 @@ def main():
     edges_to_ignore = [("a", "c")]
     # We solve again, by telling the model to ignore the edges in `edges_to_ignore`
     # when computing the path slacks (i.e. edge errors)
-    mpe_model_2 = fp.kMinPathError(graph, flow_attr="flow", k=3, weight_type=int, elements_to_ignore=edges_to_ignore, length_attr="length")
+    # The graph, flow_attr and length_attr are the same as for `mpe_model`, so we pass it as `base_model`
+    # to reuse its internal graph, instead of building it again
+    mpe_model_2 = fp.kMinPathError(graph, flow_attr="flow", k=3, weight_type=int, elements_to_ignore=edges_to_ignore, length_attr="length", base_model=mpe_model)
     mpe_model_2.solve()
     process_solution(mpe_model_2)
 
@@ -55,7 +62,8 @@ def main():
         length_attr="length", 
         path_length_ranges=path_length_ranges, 
         path_length_factors=path_length_factors,
-        solver_options=solver_options
+        solver_options=solver_options,
+        base_model=mpe_model,
         )  
     mpe_model_5.solve()
     print(mpe_model_5.solver.get_model_status())
@@ -68,6 +76,7 @@ def main():
         weight_type=float, 
         length_attr="length", 
         error_scaling={("a", "c"): 0.5},
+        base_model=mpe_model,
         )  
     mpe_model_5.solve()
     print(mpe_model_5.solver.get_model_status())
@@ -80,6 +89,7 @@ def main():
         weight_type=float, 
         length_attr="length", 
         error_scaling={("a", "c"): 0},
+        base_model=mpe_model,
         )  
     mpe_model_6.solve()
     print(mpe_model_6.solver.get_model_status())
@@ -2,14 +2,16 @@ import flowpaths as fp
 import networkx as nx
 
 graph = nx.DiGraph()
-graph.add_edge("s", "a", flow=60)
-graph.add_edge("a", "b", flow=20)
-graph.add_edge("s", "b", flow=70)
-graph.add_edge("a", "c", flow=40)
-graph.add_edge("b", "c", flow=90)
-graph.add_edge("c", "d", flow=60)
-graph.add_edge("d", "t", flow=60)
-graph.add_edge("c", "t", flow=70)
+graph.add_edges_from([
+    ("s", "a", {"flow": 60}),
+    ("a", "b", {"flow": 20}),
+    ("s", "b", {"flow": 70}),
+    ("a", "c", {"flow": 40}),
+    ("b", "c", {"flow": 90}),
+    ("c", "d", {"flow": 60}),
+    ("d", "t", {"flow": 60}),
+    ("c", "t", {"flow": 70}),
+])
 
 graph.add_edge("a", "d", flow=1)
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import flowpaths as fp
 from multiprocessing import cpu_count
+import os
 
 # --- hardcoded settings ---
 NGRAPH = "tests/acyclic_graphs/multitrans.82.ngraph"
@@ -74,7 +75,7 @@ GUROBI_STRATEGY_PRESETS = {
 
 def main():
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
 
@@ -24,12 +24,14 @@ def process_expanded_solution(graph: nx.DiGraph, neGraph: fp.NodeExpandedDiGraph
 # We create a graph where weights (or flow values are on the nodes)
 # notice that the flow values have some small errors
 graph = nx.DiGraph()
-graph.add_node("s", flow=15)
-graph.add_node("a", flow=6)
-graph.add_node("b", ) # flow=9 # Note that we are not adding flow values to this node. This is supported, and the edge for this node will be added to edges_to_ignore
-graph.add_node("c", flow=13)
-graph.add_node("d", flow=2)
-graph.add_node("t", flow=20)
+graph.add_nodes_from([
+    ("s", {"flow": 15}),
+    ("a", {"flow": 6}),
+    ("b", {}), # flow=9 # Note that we are not adding flow values to this node. This is supported, and the edge for this node will be added to edges_to_ignore
+    ("c", {"flow": 13}),
+    ("d", {"flow": 2}),
+    ("t", {"flow": 20}),
+])
 
 # We add graph edges (notice that we do not add flow values to them)
 graph.add_edges_from([("s", "a"), ("s", "b"), ("a", "b"), ("a", "c"), ("b", "c"), ("c", "d"), ("c", "t"), ("d", "t")])
@@ -9,12 +9,14 @@ def example1():
 
     # We create a graph where weights (or flow values are on the nodes)
     graph = nx.DiGraph()
-    graph.add_node("s", flow=13)
-    graph.add_node("a", flow=6)
-    graph.add_node("b", ) # flow=9 # Note that we are not adding flow values to this node
-    graph.add_node("c", flow=13)
-    graph.add_node("d", flow=6)
-    graph.add_node("t", flow=13)
+    graph.add_nodes_from([
+        ("s", {"flow": 13}),
+        ("a", {"flow": 6}),
+        ("b", {}), # flow=9 # Note that we are not adding flow values to this node
+        ("c", {"flow": 13}),
+        ("d", {"flow": 6}),
+        ("t", {"flow": 13}),
+    ])
 
     # We edges (notice that we do not add flow values to them)
     graph.add_edges_from([("s", "a"), ("s", "b"), ("a", "b"), ("a", "c"), ("b", "c"), ("c", "d"), ("c", "t"), ("d", "t")])
@@ -49,12 +51,16 @@ def example1():
     # We transform the constraints into constraints in the node expanded graph
     ne_subpath_constraints_edges = neGraph.get_expanded_subpath_constraints(subpath_constraints_edges)
 
-    # We solve the problem on the node expanded graph  
+    # We solve the problem on the node expanded graph.
+    # Only the subpath constraints differ from `ne_mfd_model_nodes`, so we pass it as `base_model`
+    # to reuse its st-DAG and lower bound on the number of paths, instead of computing them again.
+    # (Its safe paths are not reused, since they contain its subpath constraints, with another coverage.)
     ne_mfd_model_edges = fp.MinFlowDecomp(
         neGraph, 
         flow_attr="flow",
         elements_to_ignore=neGraph.edges_to_ignore,
         subpath_constraints=ne_subpath_constraints_edges,
+        base_model=ne_mfd_model_nodes,
         )
     ne_mfd_model_edges.solve()
     process_expanded_solution(neGraph, ne_mfd_model_edges)
@@ -78,12 +84,14 @@ def example2():
 
     # We now also add lengths to the nodes (in addition to flow values)
     graph = nx.DiGraph()
-    graph.add_node("s", flow=13, length=3)
-    graph.add_node("a", flow=6,  length=4)
-    graph.add_node("b", flow=9,  length=10)
-    graph.add_node("c", flow=13, length=16)
-    graph.add_node("d", flow=6,  length=9)
-    graph.add_node("t", flow=13, length=12)
+    graph.add_nodes_from([
+        ("s", {"flow": 13, "length": 3}),
+        ("a", {"flow": 6,  "length": 4}),
+        ("b", {"flow": 9,  "length": 10}),
+        ("c", {"flow": 13, "length": 16}),
+        ("d", {"flow": 6,  "length": 9}),
+        ("t", {"flow": 13, "length": 12}),
+    ])
 
     # We edges (notice that we do not add flow values to them)
     graph.add_edges_from([("s", "a"), ("s", "b"), ("a", "b"), ("a", "c"), ("b", "c"), ("c", "d"), ("c", "t"), ("d", "t")])
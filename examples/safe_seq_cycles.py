@@ -1,52 +1,56 @@
 import flowpaths as fp
 import networkx as nx
+import numpy as np
 from flowpaths.utils import safetypathcoverscycles as safety
+import os
 
 def test1():
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("s", "a", flow=1)
-    graph.add_edge("a", "b", flow=2)
-    graph.add_edge("b", "a", flow=2)
-    graph.add_edge("a", "t", flow=1)
+    graph.add_edges_from([
+        ("s", "a", {"flow": 1}),
+        ("a", "b", {"flow": 2}),
+        ("b", "a", {"flow": 2}),
+        ("a", "t", {"flow": 1}),
+    ])
     # graph.add_edge("s", "t", flow=1)
     stDiGraph = fp.stDiGraph(graph)
 
-    print(safety.maximal_safe_sequences_via_dominators(stDiGraph, set(graph.edges())))
+    print(safety.maximal_safe_sequences_via_dominators(stDiGraph, frozenset(graph.edges())))
 
 def test3():
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("s", "a", flow=3)
-    graph.add_edge("a", "t", flow=3)
-    graph.add_edge("s", "b", flow=6)
-    graph.add_edge("b", "a", flow=2)
-    graph.add_edge("a", "h", flow=2)
-    graph.add_edge("h", "t", flow=6)
-    graph.add_edge("b", "c", flow=4)
-    graph.add_edge("c", "d", flow=4)
-    graph.add_edge("c", "h", flow=4)
-    graph.add_edge("d", "h", flow=0)
-    graph.add_edge("d", "e", flow=4)
-    graph.add_edge("e", "c", flow=5)
-    graph.add_edge("e", "f", flow=4)
-    graph.add_edge("f", "g", flow=4)
-    graph.add_edge("g", "e", flow=4)
-    graph.add_edge("s", "t", flow=4)
+    graph.add_edges_from([
+        ("s", "a", {"flow": 3}),
+        ("a", "t", {"flow": 3}),
+        ("s", "b", {"flow": 6}),
+        ("b", "a", {"flow": 2}),
+        ("a", "h", {"flow": 2}),
+        ("h", "t", {"flow": 6}),
+        ("b", "c", {"flow": 4}),
+        ("c", "d", {"flow": 4}),
+        ("c", "h", {"flow": 4}),
+        ("d", "h", {"flow": 0}),
+        ("d", "e", {"flow": 4}),
+        ("e", "c", {"flow": 5}),
+        ("e", "f", {"flow": 4}),
+        ("f", "g", {"flow": 4}),
+        ("g", "e", {"flow": 4}),
+        ("s", "t", {"flow": 4}),
+    ])
     stDiGraph = fp.stDiGraph(graph)
 
-    X = set(graph.edges())
+    X = frozenset(graph.edges())
     safe_seqs = safety.maximal_safe_sequences_via_dominators(stDiGraph, X)
     for seq in safe_seqs:
         print("Safe sequence:", seq)
     
     # Now remove some edges from X
     print("New sequences")
-    X.remove(('e', 'f'))
-    X.remove(('f', 'g'))
-    X.remove(('g', 'e'))
+    X = X - {('e', 'f'), ('f', 'g'), ('g', 'e')}
     safe_seqs = safety.maximal_safe_sequences_via_dominators(stDiGraph, X)
     for seq in safe_seqs:
         print("Safe sequence:", seq)
@@ -55,20 +59,22 @@ def test4():
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("s", "u", flow=3)
-    graph.add_edge("u", "t", flow=3)
-    graph.add_edge("u", "v", flow=6)
-    graph.add_edge("v", "u", flow=2)
-    graph.add_edge("v", "w", flow=2)
-    graph.add_edge("w", "v", flow=6)
-    graph.add_edge("w", "z", flow=6)
-    graph.add_edge("z", "w", flow=6)
+    graph.add_edges_from([
+        ("s", "u", {"flow": 3}),
+        ("u", "t", {"flow": 3}),
+        ("u", "v", {"flow": 6}),
+        ("v", "u", {"flow": 2}),
+        ("v", "w", {"flow": 2}),
+        ("w", "v", {"flow": 6}),
+        ("w", "z", {"flow": 6}),
+        ("z", "w", {"flow": 6}),
+    ])
 
     graph.add_edge("z", "v", flow=6)
     stDiGraph = fp.stDiGraph(graph)
 
-    X = set(stDiGraph.edges())
-    safe_seqs = safety.maximal_safe_sequences_via_dominators(stDiGraph, X)
+    # By default, the safe sequences are with respect to all edges of stDiGraph
+    safe_seqs = safety.maximal_safe_sequences_via_dominators(stDiGraph)
     for seq in safe_seqs:
         print("Safe sequence:", seq)
     
@@ -78,8 +84,7 @@ def test5():
     graph = fp.graphutils.read_graphs(filename)[0]
 
     stDiGraph = fp.stDiGraph(graph)
-    X = set(stDiGraph.edges())
-    X = set(graph.edges())
+    X = frozenset(graph.edges())
     safe_seqs = safety.maximal_safe_sequences_via_dominators(stDiGraph, X)
     for seq in safe_seqs:
         print("Safe sequence:", seq)
@@ -89,21 +94,23 @@ def test2():
     # Create a simple graph
     graph = nx.DiGraph()
     graph.graph["id"] = "simple_graph"
-    graph.add_edge("s", "a", flow=3)
-    graph.add_edge("a", "t", flow=3)
-    graph.add_edge("s", "b", flow=6)
-    graph.add_edge("b", "a", flow=2)
-    graph.add_edge("a", "h", flow=2)
-    graph.add_edge("h", "t", flow=6)
-    graph.add_edge("b", "c", flow=4)
-    graph.add_edge("c", "d", flow=4)
-    graph.add_edge("c", "h", flow=4)
-    graph.add_edge("d", "h", flow=0)
-    graph.add_edge("d", "e", flow=4)
-    graph.add_edge("e", "c", flow=5)
-    graph.add_edge("e", "f", flow=4)
-    graph.add_edge("f", "g", flow=4)
-    graph.add_edge("g", "e", flow=4)
+    graph.add_edges_from([
+        ("s", "a", {"flow": 3}),
+        ("a", "t", {"flow": 3}),
+        ("s", "b", {"flow": 6}),
+        ("b", "a", {"flow": 2}),
+        ("a", "h", {"flow": 2}),
+        ("h", "t", {"flow": 6}),
+        ("b", "c", {"flow": 4}),
+        ("c", "d", {"flow": 4}),
+        ("c", "h", {"flow": 4}),
+        ("d", "h", {"flow": 0}),
+        ("d", "e", {"flow": 4}),
+        ("e", "c", {"flow": 5}),
+        ("e", "f", {"flow": 4}),
+        ("f", "g", {"flow": 4}),
+        ("g", "e", {"flow": 4}),
+    ])
 
     lae_model = fp.kLeastAbsErrorsCycles(
         G=graph, 
@@ -116,33 +123,42 @@ def test2():
 
 def test6():
     graph = nx.DiGraph()
-    graph.add_edge("s", "a", flow=10)   
-    graph.add_edge("a", "a", flow=10)
-    graph.add_edge("a", "b", flow=10)
-    graph.add_edge("a", "f", flow=10)
-    graph.add_edge("a", "h", flow=10)
-    graph.add_edge("b", "c", flow=10)
-    graph.add_edge("c", "d", flow=10)
-    graph.add_edge("d", "b", flow=10)
-    # graph.add_edge("d", "h", flow=10)
-    graph.add_edge("c", "t", flow=10)
-    graph.add_edge("s", "e", flow=10)
-    graph.add_edge("e", "f", flow=10)
-    graph.add_edge("f", "g", flow=10)
-    graph.add_edge("g", "h", flow=10)
-    graph.add_edge("h", "f", flow=10)
-    graph.add_edge("g", "t", flow=10)
+    graph.add_edges_from([
+        ("s", "a", {"flow": 10}),
+        ("a", "a", {"flow": 10}),
+        ("a", "b", {"flow": 10}),
+        ("a", "f", {"flow": 10}),
+        ("a", "h", {"flow": 10}),
+        ("b", "c", {"flow": 10}),
+        ("c", "d", {"flow": 10}),
+        ("d", "b", {"flow": 10}),
+        # ("d", "h", {"flow": 10}),
+        ("c", "t", {"flow": 10}),
+        ("s", "e", {"flow": 10}),
+        ("e", "f", {"flow": 10}),
+        ("f", "g", {"flow": 10}),
+        ("g", "h", {"flow": 10}),
+        ("h", "f", {"flow": 10}),
+        ("g", "t", {"flow": 10}),
+    ])
 
     stDiGraph = fp.stDiGraph(graph)
-    X = set(stDiGraph.edges())
-    safe_seqs = safety.maximal_safe_sequences_via_dominators(stDiGraph, X)
+    # By default, the safe sequences are with respect to all edges of stDiGraph
+    safe_seqs = safety.maximal_safe_sequences_via_dominators(stDiGraph)
     for seq in safe_seqs:
         print("Safe sequence:", seq)
 
-    # For every edge of stDiGraph, compute the length of the longest safe seq using it
-    longest_safe_seq_length = dict()
-    for edge in stDiGraph.edges():
-        longest_safe_seq_length[edge] = max(len(seq) for seq in safe_seqs if edge in seq)
+    # For every edge of stDiGraph, compute the length of the longest safe seq using it: the edges of all
+    # sequences (as positions in stDiGraph.edges()) are flattened into one array, and each edge takes the maximum
+    # length of the sequences it appears in (instead of searching every edge in every sequence)
+    edge_index = stDiGraph.get_edge_index()
+    flat = np.fromiter((edge_index[edge] for seq in safe_seqs for edge in seq), dtype=np.int64)
+    seq_lengths = np.fromiter((len(seq) for seq in safe_seqs), dtype=np.int64, count=len(safe_seqs))
+    lengths = np.repeat(seq_lengths, seq_lengths)
+    longest = np.zeros(len(edge_index), dtype=np.int64)
+    np.maximum.at(longest, flat, lengths)
+    longest = longest.tolist()
+    longest_safe_seq_length = {edge: longest[i] for edge, i in edge_index.items() if longest[i] > 0}
     print("Longest safe seq lengths:", longest_safe_seq_length)
 
     incompatible_sequences = stDiGraph.get_longest_incompatible_sequences(safe_seqs)
@@ -164,8 +180,9 @@ def test6():
         }
     )
 
+    # The stDiGraph built above is passed instead of graph, so that the model reuses it (and its safe sequences)
     kmpe_model = fp.kMinPathErrorCycles(
-        G=graph,
+        G=stDiGraph,
         flow_attr="flow",
         weight_type=float,
         optimization_options={
@@ -209,9 +226,10 @@ def main():
     test6()
 
 if __name__ == "__main__":
-    # Configure logging
+    # Configure logging (e.g. FP_LOG_LEVEL=DEBUG for details; log_in_background=True then keeps the console
+    # writes of the many debug messages off the solving thread)
     fp.utils.configure_logging(
-        level=fp.utils.logging.DEBUG,
+        level=os.environ.get("FP_LOG_LEVEL", "WARNING"),
         log_to_console=True,
     )
     main()
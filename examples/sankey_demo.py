@@ -29,14 +29,16 @@ def create_example_graph():
     G.graph["id"] = "simple_flow_network"  # Set graph ID for diagram title
     
     # Add edges with flow values
-    G.add_edge('s', 'a', flow=10)
-    G.add_edge('s', 'b', flow=5)
-    G.add_edge('a', 'c', flow=6)
-    G.add_edge('a', 'd', flow=4)
-    G.add_edge('b', 'c', flow=3)
-    G.add_edge('b', 'd', flow=2)
-    G.add_edge('c', 't', flow=9)
-    G.add_edge('d', 't', flow=6)
+    G.add_edges_from([
+        ('s', 'a', {"flow": 10}),
+        ('s', 'b', {"flow": 5}),
+        ('a', 'c', {"flow": 6}),
+        ('a', 'd', {"flow": 4}),
+        ('b', 'c', {"flow": 3}),
+        ('b', 'd', {"flow": 2}),
+        ('c', 't', {"flow": 9}),
+        ('d', 't', {"flow": 6}),
+    ])
     
     return G
 
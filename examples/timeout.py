@@ -1,4 +1,6 @@
+import threading
 import multiprocessing
+import inspect
 import time
 import os
 import signal
@@ -10,8 +12,8 @@ def timeout_handler(signum, frame):
     raise TimeoutException("Function timed out!")
 
 def run_with_timeout(timeout, func):
-    # Use signal-based timeout on Unix-like systems
-    if os.name == 'posix':
+    # Use signal-based timeout on Unix-like systems (signals can only be handled in the main thread)
+    if os.name == 'posix' and threading.current_thread() is threading.main_thread():
         signal.signal(signal.SIGALRM, timeout_handler)
         signal.alarm(timeout)  # Schedule the timeout alarm
         try:
@@ -22,8 +24,30 @@ def run_with_timeout(timeout, func):
         except Exception as e:
             signal.alarm(0)
             raise e
+    elif "cancel_event" in inspect.signature(func).parameters:
+        # Fallback for functions polling a cancel_event: run the function in a thread, in this same 
+        # process (so without starting and pickling into a new process), and set the event at the timeout.
+        cancel_event = threading.Event()
+        errors = []
+
+        def target():
+            try:
+                func(cancel_event=cancel_event)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout)
+
+        if thread.is_alive():
+            cancel_event.set()  # Ask the function to stop, and wait for it to return
+            thread.join()
+            print("Function timed out!")
+        elif errors:
+            raise errors[0]
     else:
-        # Fallback: use multiprocessing with a Queue to capture the result
+        # Fallback: run the function in another process, which can be killed at the timeout
         process = multiprocessing.Process(target=func)
         process.start()
         process.join(timeout)
@@ -31,12 +55,16 @@ def run_with_timeout(timeout, func):
         if process.is_alive():
             process.terminate()  # Kill the function if timeout exceeded
             process.join()
-            # self.did_timeout = True
+            print("Function timed out!")
         
         process.close()  # Clean up the process
 
-def my_function():
-    time.sleep(2)
+def my_function(cancel_event=None):
+    # Sleeping in small steps, to stop early if cancel_event is set
+    for _ in range(20):
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        time.sleep(0.1)
     print("Sleep completed")
 
 def main():
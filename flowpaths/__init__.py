@@ -1,29 +1,86 @@
-from .abstractpathmodeldag import AbstractPathModelDAG
-from .abstractwalkmodeldigraph import AbstractWalkModelDiGraph
-from .minflowdecomp import MinFlowDecomp
-from .minflowdecompcycles import MinFlowDecompCycles
-from .kflowdecomp import kFlowDecomp
-from .kflowdecompcycles import kFlowDecompCycles
-from .kminpatherror import kMinPathError
-from .kmindiscordantnodes import kMinDiscordantNodes
-from .kmindiscordantnodescycles import kMinDiscordantNodesCycles
-from .minpathsmindiscordantnodes import MinPathsMinDiscordantNodes
-from .minpathsmindiscordantnodescycles import MinPathsMinDiscordantNodesCycles
-from .kminpatherrorcycles import kMinPathErrorCycles
-from .kleastabserrors import kLeastAbsErrors
-from .kleastabserrorscycles import kLeastAbsErrorsCycles
-from .numpathsoptimization import NumPathsOptimization
-from .stdag import stDAG
-from .stdigraph import stDiGraph
-from .nodeexpandeddigraph import NodeExpandedDiGraph
-from .utils import graphutils as graphutils
-from .mingenset import MinGenSet
-from .minsetcover import MinSetCover
-from .minerrorflow import MinErrorFlow
-from .kpathcover import kPathCover
-from .kpathcovercycles import kPathCoverCycles
-from .minpathcover import MinPathCover
-from .minpathcovercycles import MinPathCoverCycles
+import importlib
+from typing import TYPE_CHECKING
+
+# The models (and the solver bindings they import) are loaded on first access
+# (PEP 562), so that e.g. `fp.stDiGraph` does not import every model of the package.
+_LAZY = {
+    "AbstractPathModelDAG": "abstractpathmodeldag",
+    "AbstractWalkModelDiGraph": "abstractwalkmodeldigraph",
+    "MinFlowDecomp": "minflowdecomp",
+    "MinFlowDecompCycles": "minflowdecompcycles",
+    "kFlowDecomp": "kflowdecomp",
+    "kFlowDecompCycles": "kflowdecompcycles",
+    "kMinPathError": "kminpatherror",
+    "kMinDiscordantNodes": "kmindiscordantnodes",
+    "kMinDiscordantNodesCycles": "kmindiscordantnodescycles",
+    "MinPathsMinDiscordantNodes": "minpathsmindiscordantnodes",
+    "MinPathsMinDiscordantNodesCycles": "minpathsmindiscordantnodescycles",
+    "kMinPathErrorCycles": "kminpatherrorcycles",
+    "kLeastAbsErrors": "kleastabserrors",
+    "kLeastAbsErrorsCycles": "kleastabserrorscycles",
+    "NumPathsOptimization": "numpathsoptimization",
+    "stDAG": "stdag",
+    "stDiGraph": "stdigraph",
+    "NodeExpandedDiGraph": "nodeexpandeddigraph",
+    "MinGenSet": "mingenset",
+    "MinSetCover": "minsetcover",
+    "MinErrorFlow": "minerrorflow",
+    "kPathCover": "kpathcover",
+    "kPathCoverCycles": "kpathcovercycles",
+    "MinPathCover": "minpathcover",
+    "MinPathCoverCycles": "minpathcovercycles",
+}
+
+# Submodules accessed as attributes of the package (e.g. `fp.utils.logger`, `fp.graphutils`)
+_LAZY_SUBMODULES = {
+    "utils": "utils",
+    "graphutils": "utils.graphutils",
+}
+
+if TYPE_CHECKING:  # pragma: no cover - for static analysis and IDEs only
+    from .abstractpathmodeldag import AbstractPathModelDAG
+    from .abstractwalkmodeldigraph import AbstractWalkModelDiGraph
+    from .minflowdecomp import MinFlowDecomp
+    from .minflowdecompcycles import MinFlowDecompCycles
+    from .kflowdecomp import kFlowDecomp
+    from .kflowdecompcycles import kFlowDecompCycles
+    from .kminpatherror import kMinPathError
+    from .kmindiscordantnodes import kMinDiscordantNodes
+    from .kmindiscordantnodescycles import kMinDiscordantNodesCycles
+    from .minpathsmindiscordantnodes import MinPathsMinDiscordantNodes
+    from .minpathsmindiscordantnodescycles import MinPathsMinDiscordantNodesCycles
+    from .kminpatherrorcycles import kMinPathErrorCycles
+    from .kleastabserrors import kLeastAbsErrors
+    from .kleastabserrorscycles import kLeastAbsErrorsCycles
+    from .numpathsoptimization import NumPathsOptimization
+    from .stdag import stDAG
+    from .stdigraph import stDiGraph
+    from .nodeexpandeddigraph import NodeExpandedDiGraph
+    from .utils import graphutils as graphutils
+    from .mingenset import MinGenSet
+    from .minsetcover import MinSetCover
+    from .minerrorflow import MinErrorFlow
+    from .kpathcover import kPathCover
+    from .kpathcovercycles import kPathCoverCycles
+    from .minpathcover import MinPathCover
+    from .minpathcovercycles import MinPathCoverCycles
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f".{_LAZY_SUBMODULES[name]}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Later accesses find the value in the module namespace, without calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_LAZY_SUBMODULES))
+
 
 __all__ = [
     "AbstractPathModelDAG",
@@ -3,6 +3,7 @@ from flowpaths.utils import safetypathcovers
 from flowpaths.utils import safetypathcoverscycles
 from flowpaths.utils import solverwrapper as sw
 import flowpaths.utils as utils
+import flowpaths.utils.graphutils as gu
 import time
 import copy
 from abc import ABC, abstractmethod
@@ -168,7 +169,8 @@ class AbstractPathModelDAG(ABC):
         self.k = k
         self.length_attr = length_attr
         
-        self.subpath_constraints = copy.deepcopy(subpath_constraints)
+        # The edges are tuples of nodes, so copying the lists is enough (and cheaper than a deep copy)
+        self.subpath_constraints = [copy.copy(subpath) for subpath in subpath_constraints] if subpath_constraints is not None else None
         if self.subpath_constraints is not None:
             self._check_valid_subpath_constraints()
 
@@ -194,6 +196,8 @@ class AbstractPathModelDAG(ABC):
         self.solve_statistics["optimizations_applied"] = set()
         self.edge_vars = {}
         self.edge_vars_sol = {}
+        # Solution paths decoded from edge_vars_sol, cached by get_solution_paths()
+        self._solution_paths = None
         self.subpaths_vars = {}
         self.encode_edge_position = encode_edge_position
         self.encode_path_length = encode_path_length
@@ -512,7 +516,7 @@ class AbstractPathModelDAG(ABC):
         if self.optimize_with_safe_sequences:
             safe_lists += safetypathcoverscycles.maximal_safe_sequences_via_dominators(
                 G=self.G,
-                X=self.trusted_edges_for_safety,
+                X=self.trusted_edges_for_safety or set(),
             )
             self.solve_statistics["optimizations_applied"].add("optimize_with_safe_sequences")
 
@@ -689,7 +693,8 @@ class AbstractPathModelDAG(ABC):
             paths_to_fix.append(self.safe_lists[longest_safe_list[edge]])
 
         utils.logger.debug(f"{__name__}: paths_to_fix from safe lists SIZE: {len(paths_to_fix)}")
-        utils.logger.debug(f"{__name__}: paths_to_fix from safe lists: {paths_to_fix}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: paths_to_fix from safe lists: {paths_to_fix}")
 
         return paths_to_fix
     
@@ -853,6 +858,10 @@ class AbstractPathModelDAG(ABC):
             self._is_solved = True
             return True
 
+        # Values read from the solver in a previous solve are no longer valid
+        self.edge_vars_sol = {}
+        self._solution_paths = None
+
         # self.write_model(f"model-{self.id}.lp")
         start_time = time.perf_counter()
         self.solver.optimize()
@@ -947,10 +956,23 @@ class AbstractPathModelDAG(ABC):
         if self.external_solution_paths is not None:
             return self.external_solution_paths
 
-        if self.edge_vars_sol == {}:
-            self.edge_vars_sol = self.solver.get_values(self.edge_vars, binary_values=True)
+        # The values are read from the solver and decoded only on the first call after solving
+        if self._solution_paths is None:
+            if self.edge_vars_sol == {}:
+                self.edge_vars_sol = self.solver.get_values(self.edge_vars, binary_values=True)
+            self._solution_paths = self._decode_solution_paths_from_values(self.edge_vars_sol)
+
+        return [list(path) for path in self._solution_paths]
 
-        return self._decode_solution_paths_from_values(self.edge_vars_sol)
+    def reset_solution_cache(self):
+        """
+        Clears the solution values cached from the solver (edge variable values, decoded paths, and the 
+        solution dict of the child class), so that they are read again from the solver on the next call.
+        Call this if you modify the solver model after solving it.
+        """
+        self.edge_vars_sol = {}
+        self._solution_paths = None
+        self._solution = None
 
     def get_incumbent_solution_paths(self) -> list:
         if not self.has_incumbent_solution():
@@ -1014,7 +1036,7 @@ class AbstractPathModelDAG(ABC):
         for path_index, path in enumerate(paths):
             current_edge_position = 0
             path_temp = [self.G.source] + path
-            for (u,v) in zip(path_temp[:-1], path_temp[1:]):
+            for (u,v) in gu.pairwise(path_temp):
                 if round(edge_position_sol[(str(u), str(v), path_index)]) != current_edge_position:
                     return False
                 current_edge_position += self.G[u][v].get(self.length_attr, 1)
@@ -1035,7 +1057,7 @@ class AbstractPathModelDAG(ABC):
             if len(path) > 0:
                 path_temp = [self.G.source] + path + [self.G.sink]            
                 path_length = 0
-                for (u,v) in zip(path_temp[:-1], path_temp[1:]):
+                for (u,v) in gu.pairwise(path_temp):
                     path_length += self.G[u][v].get(self.length_attr, 1)   
 
                 if round(path_length_sol[(path_index)]) != path_length:
@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 import flowpaths.utils as utils
 from typing import Optional
 
@@ -15,9 +16,11 @@ class AbstractSourceSinkGraph(nx.DiGraph):
     * Create unique global source / sink node identifiers (``self.source`` / ``self.sink``).
     * Attach the global source to every (in-degree 0) source or additional start; attach every (out-degree 0) sink
       or additional end to the global sink.
-    * Expose convenience collections: ``source_edges``, ``sink_edges``, ``source_sink_edges``.
-    * Provide shared flow helper utilities: :meth:`get_non_zero_flow_edges` and
-      :meth:`get_max_flow_value_and_check_non_negative_flow`.
+    * Expose convenience collections: ``source_edges``, ``sink_edges``, ``source_sink_edges`` (a frozenset),
+      and ``non_st_edge_indices`` (positions in ``self.edges()`` of the edges of ``base_graph``).
+    * Provide shared flow helper utilities: :meth:`get_non_zero_flow_edges`,
+      :meth:`get_max_flow_value_and_check_non_negative_flow`, :meth:`get_edge_attr_array` and
+      :meth:`get_edge_attr_max` and :meth:`get_edge_index`. Since the graph is frozen, all but the second cache their results.
 
     Extension hooks
     ---------------
@@ -44,6 +47,13 @@ class AbstractSourceSinkGraph(nx.DiGraph):
 
         super().__init__()
         self.base_graph = base_graph
+        self._edge_attr_cache = {}
+        self._edge_index = None
+        self._edge_set = None
+        # Results of the safety functions (e.g. the first bridges of `safetypathcoverscycles`) on this graph
+        self._safety_cache = {}
+        self._non_zero_flow_edges_cache = {}
+        self._number_of_edges = None
         if "id" in base_graph.graph:
             self.id = str(base_graph.graph["id"])
         else:
@@ -69,6 +79,8 @@ class AbstractSourceSinkGraph(nx.DiGraph):
         self._post_build()
 
         nx.freeze(self)
+        # networkx computes number_of_edges() by summing all degrees; the graph is frozen, so we count only once
+        self._number_of_edges = super().number_of_edges()
 
     # ----------------------------- Hooks ---------------------------------
     def _pre_build_validate(self):  # pragma: no cover - default is no-op
@@ -92,18 +104,79 @@ class AbstractSourceSinkGraph(nx.DiGraph):
 
         self.source_edges = list(self.out_edges(self.source))
         self.sink_edges = list(self.in_edges(self.sink))
-        self.source_sink_edges = set(self.source_edges + self.sink_edges)
+        self.source_sink_edges = frozenset(self.source_edges + self.sink_edges)
+        # Positions (in the order of self.edges()) of the edges not incident to the global source or sink
+        self.non_st_edge_indices = np.fromiter(
+            (i for i, (u, v) in enumerate(self.edges()) if u != self.source and v != self.sink),
+            dtype=np.int32,
+        )
 
     # ----------------------- Shared helper methods -----------------------
+    def number_of_edges(self, u=None, v=None) -> int:
+        """Return the number of edges (or of edges from `u` to `v`), as in `networkx.DiGraph.number_of_edges`.
+
+        The total number of edges is cached once the graph is frozen, so that calls inside loops are O(1).
+        """
+        if u is None and self._number_of_edges is not None:
+            return self._number_of_edges
+        return super().number_of_edges(u, v)
+
     def get_non_zero_flow_edges(
         self, flow_attr: str, edges_to_ignore: set = set()
     ) -> set:
-        """Return set of edges whose attribute `flow_attr` is non-zero and not ignored."""
-        non_zero_flow_edges = set()
-        for u, v, data in self.edges(data=True):
-            if (u, v) not in edges_to_ignore and data.get(flow_attr, 0) != 0:
-                non_zero_flow_edges.add((u, v))
-        return non_zero_flow_edges
+        """Return set of edges whose attribute `flow_attr` is non-zero and not ignored.
+
+        Since the graph is frozen, the result is computed once per `(flow_attr, edges_to_ignore)` and cached;
+        every call returns a new set, which the caller can modify.
+        """
+        key = (flow_attr, frozenset(edges_to_ignore))
+        if key not in self._non_zero_flow_edges_cache:
+            self._non_zero_flow_edges_cache[key] = frozenset(
+                (u, v)
+                for u, v, data in self.edges(data=True)
+                if (u, v) not in edges_to_ignore and data.get(flow_attr, 0) != 0
+            )
+        return set(self._non_zero_flow_edges_cache[key])
+
+    def get_edge_attr_array(self, attr: str, default=0) -> np.ndarray:
+        """Return a numpy array with the value of attribute `attr` of every edge, in the order of `self.edges()`.
+
+        Edges without `attr` get value `default`. Since the graph is frozen, the array is computed once per
+        `(attr, default)` and cached; it must not be modified by the caller.
+        """
+        key = (attr, default)
+        if key not in self._edge_attr_cache:
+            self._edge_attr_cache[key] = np.array(
+                [data.get(attr, default) for _, _, data in self.edges(data=True)]
+            )
+        return self._edge_attr_cache[key]
+
+    def get_edge_index(self) -> dict:
+        """Return a dict mapping every edge `(u, v)` to its position in `self.edges()`, i.e. its index in the
+        arrays of `get_edge_attr_array`.
+
+        Since the graph is frozen, the dict is computed once and cached; it must not be modified by the caller.
+        """
+        if self._edge_index is None:
+            self._edge_index = {edge: i for i, edge in enumerate(self.edges())}
+        return self._edge_index
+
+    def get_edge_set(self) -> frozenset:
+        """Return the edges of the graph as a frozenset of `(u, v)` tuples (e.g. the default trusted edges of
+        `safetypathcoverscycles.maximal_safe_sequences_via_dominators`).
+
+        Since the graph is frozen, the set is computed once and cached.
+        """
+        if self._edge_set is None:
+            self._edge_set = frozenset(self.edges())
+        return self._edge_set
+
+    def get_edge_attr_max(self, attr: str, default=0):
+        """Return the maximum value of attribute `attr` over all edges (edges without `attr` count as `default`).
+
+        Returns `default` if the graph has no edges. This uses the cached array of `get_edge_attr_array`.
+        """
+        return self.get_edge_attr_array(attr, default).max(initial=default).item()
 
     def get_max_flow_value_and_check_non_negative_flow(
         self, flow_attr: str, edges_to_ignore: set
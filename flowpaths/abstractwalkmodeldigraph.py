@@ -143,6 +143,8 @@ class AbstractWalkModelDiGraph(ABC):
         self.solve_statistics["optimizations_applied"] = set()
         self.edge_vars = {}
         self.edge_vars_sol = {}
+        # Solution walks decoded from edge_vars_sol, cached by get_solution_walks()
+        self._solution_walks = None
         self.subset_vars = {}
 
         self.solver_options = solver_options
@@ -401,7 +403,7 @@ class AbstractWalkModelDiGraph(ABC):
         if self.optimize_with_safe_sequences or self.optimize_with_safety_as_subset_constraints or self.optimize_with_max_safe_antichain_as_subset_constraints:
             self.safe_lists += safetypathcoverscycles.maximal_safe_sequences_via_dominators(
                 G=self.G,
-                X=self.trusted_edges_for_safety,
+                X=self.trusted_edges_for_safety or set(),
             )
 
         if self.safe_lists is None:
@@ -642,6 +644,10 @@ class AbstractWalkModelDiGraph(ABC):
         """
         utils.logger.info(f"{__name__}: solving...")
 
+        # Values read from the solver in a previous solve are no longer valid
+        self.edge_vars_sol = {}
+        self._solution_walks = None
+
         # self.write_model(f"model-{self.id}.lp")
         start_time = time.perf_counter()
         self.solver.optimize()
@@ -738,9 +744,23 @@ class AbstractWalkModelDiGraph(ABC):
         with positive flow, ensuring complete flow decomposition.
         """
         
-        if self.edge_vars_sol == {}:
-            self.edge_vars_sol = self.solver.get_values(self.edge_vars)
-        return self._decode_solution_walks_from_values(self.edge_vars_sol)
+        # The values are read from the solver and decoded only on the first call after solving
+        if self._solution_walks is None:
+            if self.edge_vars_sol == {}:
+                self.edge_vars_sol = self.solver.get_values(self.edge_vars)
+            self._solution_walks = self._decode_solution_walks_from_values(self.edge_vars_sol)
+
+        return [list(walk) for walk in self._solution_walks]
+
+    def reset_solution_cache(self):
+        """
+        Clears the solution values cached from the solver (edge variable values, decoded walks, and the 
+        solution dict of the child class), so that they are read again from the solver on the next call.
+        Call this if you modify the solver model after solving it.
+        """
+        self.edge_vars_sol = {}
+        self._solution_walks = None
+        self._solution = None
 
     def get_incumbent_solution_walks(self) -> list:
         if not self.has_incumbent_solution():
@@ -1,5 +1,6 @@
 import time
 import networkx as nx
+import numpy as np
 import flowpaths.stdag as stdag
 import flowpaths.utils.graphutils as gu
 import flowpaths.abstractpathmodeldag as pathmodel
@@ -11,6 +12,12 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
     # storing some defaults
     optimize_with_greedy = True
     optimize_with_flow_safe_paths = True
+    # The optimizations recorded by AbstractPathModelDAG._get_safe_lists
+    _safe_lists_optimizations = frozenset({
+        "optimize_with_safe_paths",
+        "optimize_with_safe_sequences",
+        "optimize_with_subpath_constraints_as_safe_sequences",
+    })
 
     def __init__(
         self,
@@ -27,6 +34,7 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
         solution_weights_superset: list = None,
         optimization_options: dict = {},
         solver_options: dict = {},
+        base_model: "kFlowDecomp" = None,
     ):
         """
         Initialize the Flow Decomposition model for a given number of paths `k`.
@@ -107,6 +115,13 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
             
             Dictionary with the solver options. Default is `None`. See [solver options documentation](solver-options-optimizations.md).
 
+        - `base_model : kFlowDecomp`, optional
+
+            Another `kFlowDecomp` model built on the same graph `G` (the same object), with the same `flow_attr`, `flow_attr_origin` 
+            and `elements_to_ignore`, e.g. the model for a different `k`. Default is `None`. If set, the parts of the model that do not depend on `k` 
+            are taken from `base_model` instead of being computed again: the node-expanded graph (if `flow_attr_origin` is `"node"`), the internal st-DAG (with its cached data), the flow conservation check, 
+            the flow safe paths and, if also `subpath_constraints` and `optimization_options` are the same, the safe paths/sequences.
+
 
         Raises
         ----------
@@ -115,20 +130,42 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
         - ValueError: If the graph does not satisfy flow conservation on nodes different from source or sink.
         - ValueError: If the graph contains edges with negative (<0) flow values.
         - ValueError: If `flow_attr_origin` is not "node" or "edge".
+        - ValueError: If `base_model` is not built on the same graph, `flow_attr`, `flow_attr_origin` and `elements_to_ignore`.
         """
 
         utils.logger.info(f"{__name__}: START initializing with graph id = {utils.fpid(G)}, k = {k}")
 
+        if base_model is not None and not (
+            isinstance(base_model, kFlowDecomp)
+            and base_model._input_graph is G
+            and base_model.flow_attr == flow_attr
+            and base_model.flow_attr_origin == flow_attr_origin
+            and set(base_model._elements_to_ignore) == set(elements_to_ignore)
+        ):
+            utils.logger.error(f"{__name__}: base_model must be a kFlowDecomp model on the same graph, with the same flow_attr, flow_attr_origin and elements_to_ignore.")
+            raise ValueError("base_model must be a kFlowDecomp model on the same graph, with the same flow_attr, flow_attr_origin and elements_to_ignore.")
+        # Kept to check if this model can be the base_model of another one
+        self._input_graph = G
+        self._elements_to_ignore = list(elements_to_ignore)
+        self._given_subpath_constraints = subpath_constraints
+        # The safe lists also contain the subpath constraints as safe sequences when their coverage is 1 (see _get_safe_lists)
+        self._given_subpath_constraints_options = (subpath_constraints_coverage, subpath_constraints_coverage_length, length_attr)
+        self._given_optimization_options = optimization_options
+
         # Handling node-weighted graphs
         self.flow_attr_origin = flow_attr_origin
         if self.flow_attr_origin == "node":
             if G.number_of_nodes() == 0:
                 utils.logger.error(f"{__name__}: The input graph G has no nodes. Please provide a graph with at least one node.")
                 raise ValueError(f"The input graph G has no nodes. Please provide a graph with at least one node.")
-            self.G_internal = nedg.NodeExpandedDiGraph(G, node_flow_attr=flow_attr, node_length_attr=length_attr)
+            if base_model is not None:
+                self.G_internal = base_model.G_internal
+            else:
+                self.G_internal = nedg.NodeExpandedDiGraph(G, node_flow_attr=flow_attr, node_length_attr=length_attr)
             subpath_constraints_internal = self.G_internal.get_expanded_subpath_constraints(subpath_constraints)
             
-            edges_to_ignore_internal = self.G_internal.edges_to_ignore
+            # A copy, since the list of the node-expanded graph (possibly shared with base_model) must not change
+            edges_to_ignore_internal = list(self.G_internal.edges_to_ignore)
             if not all(isinstance(element_to_ignore, str) for element_to_ignore in elements_to_ignore):
                 utils.logger.error(f"elements_to_ignore must be a list of nodes (i.e strings), not {elements_to_ignore}")
                 raise ValueError(f"elements_to_ignore must be a list of nodes (i.e strings), not {elements_to_ignore}")
@@ -149,7 +186,7 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
             utils.logger.error(f"flow_attr_origin must be either 'node' or 'edge', not {self.flow_attr_origin}")
             raise ValueError(f"flow_attr_origin must be either 'node' or 'edge', not {self.flow_attr_origin}")
 
-        self.G = stdag.stDAG(self.G_internal)
+        self.G = base_model.G if base_model is not None else stdag.stDAG(self.G_internal)
         self.subpath_constraints = subpath_constraints_internal
         self.edges_to_ignore = self.G.source_sink_edges.union(edges_to_ignore_internal)
 
@@ -160,7 +197,11 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
 
         # Check requirements on input graph:
         # Check flow conservation only if there are no edges to ignore
-        satisfies_flow_conservation = gu.check_flow_conservation(G, flow_attr)
+        if base_model is not None:
+            satisfies_flow_conservation = base_model._satisfies_flow_conservation
+        else:
+            satisfies_flow_conservation = gu.check_flow_conservation(G, flow_attr)
+        self._satisfies_flow_conservation = satisfies_flow_conservation
         if len(edges_to_ignore_internal) == 0 and not satisfies_flow_conservation:
             utils.logger.error(f"{__name__}: The graph G does not satisfy flow conservation or some edges have missing `flow_attr`. This is an error, unless you passed `edges_to_ignore` to include at least those edges with missing `flow_attr`.")
             raise ValueError("The graph G does not satisfy flow conservation or some edges have missing `flow_attr`. This is an error, unless you passed `edges_to_ignore` to include at least those edges with missing `flow_attr`.")
@@ -205,9 +246,14 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
                 greedy_solution_paths = self._solution["paths"]
                 self.optimization_options["external_solution_paths"] = greedy_solution_paths
         
+        self._flow_safe_paths = None
         if self.optimize_with_flow_safe_paths and satisfies_flow_conservation:
             start_time = time.perf_counter()
-            self.optimization_options["external_safe_paths"] = sfd.compute_flow_decomp_safe_paths(G=G, flow_attr=self.flow_attr)
+            if base_model is not None and base_model._flow_safe_paths is not None:
+                self._flow_safe_paths = base_model._flow_safe_paths
+            else:
+                self._flow_safe_paths = sfd.compute_flow_decomp_safe_paths(G=G, flow_attr=self.flow_attr)
+            self.optimization_options["external_safe_paths"] = self._flow_safe_paths
             self.solve_statistics["flow_safe_paths_time"] = time.perf_counter() - start_time
         
         self.optimization_options["trusted_edges_for_safety"] = self.G.get_non_zero_flow_edges(flow_attr=self.flow_attr, edges_to_ignore=self.edges_to_ignore)
@@ -222,6 +268,21 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
             self.optimization_options["optimize_with_safe_sequences"] = False
             self.optimization_options["optimize_with_safe_zero_edges"] = False
 
+        # The safe paths/sequences do not depend on k, so they are taken from base_model (see _get_safe_lists), 
+        # if it computed them with the same subpath constraints (with the same coverage and length_attr) and optimization options
+        self._base_safe_lists = None
+        self._base_safe_lists_optimizations = set()
+        if (
+            base_model is not None
+            and base_model._given_subpath_constraints == subpath_constraints
+            and base_model._given_subpath_constraints_options == self._given_subpath_constraints_options
+            and base_model._given_optimization_options == optimization_options
+            and base_model.solution_weights_superset is None
+            and self.solution_weights_superset is None
+        ):
+            self._base_safe_lists = getattr(base_model, "safe_lists", None)
+            self._base_safe_lists_optimizations = base_model.solve_statistics.get("optimizations_applied", set()) & kFlowDecomp._safe_lists_optimizations
+
         # Call the constructor of the parent class AbstractPathModelDAG
         super().__init__(
             G=self.G, 
@@ -250,6 +311,14 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
 
         utils.logger.info(f"{__name__}: END initialized with graph id = {utils.fpid(G)}, k = {self.k}")
 
+    def _get_safe_lists(self):
+        
+        # Overrides the method of AbstractPathModelDAG, to reuse the safe lists of the base_model, if any.
+        if self._base_safe_lists is not None:
+            self.solve_statistics["optimizations_applied"] |= self._base_safe_lists_optimizations
+            return list(self._base_safe_lists)
+        return super()._get_safe_lists()
+
     def _encode_flow_decomposition(self):
         
         # Encodes the flow decomposition constraints for the given graph.
@@ -277,39 +346,55 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
         )
 
         # We encode that for each edge (u,v), the sum of the weights of the paths going through the edge is equal to the flow value of the edge.
-        for u, v, data in self.G.edges(data=True):
-            if (u, v) in self.edges_to_ignore:
+        # The (u,v,i) whose product needs to be linearized, added to the solver in a single batch after the loop
+        product_indexes = []
+
+        # Attributes and solver methods used for every edge are bound to locals once
+        flow_attr = self.flow_attr
+        edges_to_ignore = self.edges_to_ignore
+        edges_set_to_zero = self.edges_set_to_zero
+        edges_set_to_one = self.edges_set_to_one
+        pi_vars = self.pi_vars
+        path_weights_vars = self.path_weights_vars
+        add_constraint = self.solver.add_constraint
+        quicksum = self.solver.quicksum
+        paths = range(self.k)
+
+        # The flow values are read from the cached array of the st-DAG, in the order of self.G.edges()
+        for (u, v), f_u_v in zip(self.G.edges(), self.G.get_edge_attr_array(flow_attr).tolist()):
+            if (u, v) in edges_to_ignore:
                 continue
-            f_u_v = data[self.flow_attr]
 
             # We encode that edge_vars[(u,v,i)] * self.path_weights_vars[(i)] = self.pi_vars[(u,v,i)],
             # assuming self.w_max is a bound for self.path_weights_vars[(i)]
-            for i in range(self.k):
-                if (u, v, i) in self.edges_set_to_zero:
-                    self.solver.add_constraint(
-                            self.pi_vars[(u, v, i)] == 0,
+            for i in paths:
+                if (u, v, i) in edges_set_to_zero:
+                    add_constraint(
+                            pi_vars[(u, v, i)] == 0,
                             name=f"i={i}_u={u}_v={v}_10b",
                         )
-                elif (u, v, i) in self.edges_set_to_one:
-                    self.solver.add_constraint(
-                            self.pi_vars[(u, v, i)] == self.path_weights_vars[(i)],
+                elif (u, v, i) in edges_set_to_one:
+                    add_constraint(
+                            pi_vars[(u, v, i)] == path_weights_vars[(i)],
                             name=f"i={i}_u={u}_v={v}_10b",
                         )
                 else:
-                    self.solver.add_binary_continuous_product_constraint(
-                        binary_var=self.edge_vars[(u, v, i)],
-                        continuous_var=self.path_weights_vars[(i)],
-                        product_var=self.pi_vars[(u, v, i)],
-                        lb=0,
-                        ub=self.w_max,
-                        name=f"10_u={u}_v={v}_i={i}",
-                    )
+                    product_indexes.append((u, v, i))
 
-            self.solver.add_constraint(
-                self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k)) == f_u_v,
+            add_constraint(
+                quicksum(pi_vars[(u, v, i)] for i in paths) == f_u_v,
                 name=f"10d_u={u}_v={v}",
             )
 
+        self.solver.add_binary_continuous_product_constraints(
+            binary_vars=[self.edge_vars[index] for index in product_indexes],
+            continuous_vars=[self.path_weights_vars[(i)] for (_, _, i) in product_indexes],
+            product_vars=[self.pi_vars[index] for index in product_indexes],
+            lb=0,
+            ub=self.w_max,
+            name="10",
+        )
+
     def _encode_flow_decomposition_with_given_weights(self):
         
         # If already solved, no need to encode further
@@ -335,10 +420,9 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
             raise ValueError(f"Length of given weights ({len(self.solution_weights_superset)}) is different from k ({self.k})")
 
         # We encode that for each edge (u,v), the sum of the weights of the paths going through the edge is equal to the flow value of the edge.
-        for u, v, data in self.G.edges(data=True):
+        for (u, v), f_u_v in zip(self.G.edges(), self.G.get_edge_attr_array(self.flow_attr).tolist()):
             if (u, v) in self.edges_to_ignore:
                 continue
-            f_u_v = data[self.flow_attr]
 
             self.solver.add_constraint(
                 self.solver.quicksum(self.solution_weights_superset[i] * self.edge_vars[(u, v, i)] for i in range(self.k)) == f_u_v,
@@ -486,14 +570,7 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
         else:
             weights_sol_dict = {i: self.solution_weights_superset[i] for i in range(self.k)}
 
-        self.path_weights_sol = [
-            (
-                round(weights_sol_dict[i])
-                if self.weight_type == int
-                else float(weights_sol_dict[i])
-            )
-            for i in range(self.k)
-        ]
+        self.path_weights_sol = gu.solution_values_to_list(weights_sol_dict, self.k, self.weight_type)
 
         if self.flow_attr_origin == "edge":
             self._solution = {
@@ -537,21 +614,29 @@ class kFlowDecomp(pathmodel.AbstractPathModelDAG):
             for path in solution_paths
         ]
 
-        flow_from_paths = {(u, v): 0 for (u, v) in self.G.edges()}
-        num_paths_on_edges = {e: 0 for e in self.G.edges()}
+        # Per-edge sums as arrays indexed by the position of the edge in self.G.edges(),
+        # aligned with the cached array of flow values of the st-DAG
+        edge_index = self.G.get_edge_index()
+        flows = self.G.get_edge_attr_array(self.flow_attr)
+        flow_from_paths = np.zeros(len(edge_index))
+        num_paths_on_edges = np.zeros(len(edge_index), dtype=np.int64)
         for weight, path in zip(solution_weights, solution_paths_of_edges):
-            for e in path:
-                flow_from_paths[e] += weight
-                num_paths_on_edges[e] += 1
-
-        for u, v, data in self.G.edges(data=True):
-            if self.flow_attr in data and (u,v) not in self.edges_to_ignore:
-                if (
-                    abs(flow_from_paths[(u, v)] - data[self.flow_attr])
-                    > tolerance * num_paths_on_edges[(u, v)]
-                ):
-                    utils.logger.error(f"Flow validation failed for edge ({u}, v): expected {data[self.flow_attr]}, got {flow_from_paths[(u, v)]}")
-                    return False
+            path_edge_indices = [edge_index[e] for e in path]
+            np.add.at(flow_from_paths, path_edge_indices, weight)
+            np.add.at(num_paths_on_edges, path_edge_indices, 1)
+
+        # The edges without flow_attr are the source and sink edges, which are in self.edges_to_ignore
+        checked_edges = np.fromiter(
+            ((u, v) not in self.edges_to_ignore for u, v in edge_index),
+            dtype=bool,
+            count=len(edge_index),
+        )
+        violated = checked_edges & (np.abs(flow_from_paths - flows) > tolerance * num_paths_on_edges)
+        if violated.any():
+            i = int(np.flatnonzero(violated)[0])
+            u, v = list(edge_index)[i]
+            utils.logger.error(f"Flow validation failed for edge ({u}, {v}): expected {flows[i]}, got {flow_from_paths[i]}")
+            return False
 
         return True
     
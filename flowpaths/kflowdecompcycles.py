@@ -2,6 +2,7 @@ import networkx as nx
 import flowpaths.stdigraph as stdigraph
 import flowpaths.abstractwalkmodeldigraph as walkmodel
 import flowpaths.utils as utils
+import flowpaths.utils.graphutils as gu
 import flowpaths.nodeexpandeddigraph as nedg
 import copy
 import time
@@ -299,7 +300,8 @@ class kFlowDecompCycles(walkmodel.AbstractWalkModelDiGraph):
             The solution dictionary with empty walks removed.
 
         """
-        solution_copy = copy.deepcopy(solution)
+        # The walks are not deep-copied, since they are replaced below by the non-empty ones
+        solution_copy = {key: copy.deepcopy(value) for key, value in solution.items() if key != "walks"}
         non_empty_walks = []
         non_empty_weights = []
         for walk, weight in zip(solution["walks"], solution["weights"]):
@@ -340,14 +342,7 @@ class kFlowDecompCycles(walkmodel.AbstractWalkModelDiGraph):
 
         utils.logger.debug(f"{__name__}: weights_sol_dict = {weights_sol_dict}")
 
-        self.path_weights_sol = [
-            (
-                round(weights_sol_dict[i])
-                if self.weight_type == int
-                else float(weights_sol_dict[i])
-            )
-            for i in range(self.k)
-        ]
+        self.path_weights_sol = gu.solution_values_to_list(weights_sol_dict, self.k, self.weight_type)
 
         if self.flow_attr_origin == "edge":
             self._solution = {
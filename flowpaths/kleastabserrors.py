@@ -2,6 +2,7 @@ import networkx as nx
 import flowpaths.stdag as stdag
 import flowpaths.abstractpathmodeldag as pathmodel
 import flowpaths.utils as utils
+import flowpaths.utils.graphutils as gu
 import flowpaths.nodeexpandeddigraph as nedg
 import copy
 
@@ -214,7 +215,8 @@ class kLeastAbsErrors(pathmodel.AbstractPathModelDAG):
             if G.number_of_edges() == 0:
                 utils.logger.error(f"{__name__}: The input graph G has no edges. Please provide a graph with at least one edge.")
                 raise ValueError(f"The input graph G has no edges. Please provide a graph with at least one edge.")
-            self.G_internal = copy.deepcopy(G)
+            # A frozen graph cannot be modified, so if no additional edges need to be added, it is used as is, instead of a copy
+            self.G_internal = G if nx.is_frozen(G) and len(self.additional_edges) == 0 else copy.deepcopy(G)
             subpath_constraints_internal = subpath_constraints
             if not all(isinstance(edge, tuple) and len(edge) == 2 for edge in elements_to_ignore):
                 utils.logger.error(f"elements_to_ignore must be a list of edges (i.e. tuples of nodes), not {elements_to_ignore}")
@@ -240,7 +242,8 @@ class kLeastAbsErrors(pathmodel.AbstractPathModelDAG):
             utils.logger.info(f"{__name__}: additional_edges_lambda set automatically to {self.additional_edges_lambda}")
 
         # Add additional edges to the internal graph
-        self.G_internal.add_edges_from(additional_edges_internal, **{self.flow_attr: 0})
+        if additional_edges_internal:
+            self.G_internal.add_edges_from(additional_edges_internal, **{self.flow_attr: 0})
 
         self.G = stdag.stDAG(self.G_internal, additional_starts=additional_starts_internal, additional_ends=additional_ends_internal)
         self.subpath_constraints = subpath_constraints_internal
@@ -416,13 +419,14 @@ class kLeastAbsErrors(pathmodel.AbstractPathModelDAG):
             # Encoding the error on the edge (u, v) as the difference between 
             # the flow value of the edge and the sum of the weights of the paths that go through it (pi variables)
             # If we minimize the sum of edge_errors_vars, then we are minimizing the sum of the absolute errors.
+            pi_sum = self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k))
             self.solver.add_constraint(
-                f_u_v - sum(self.pi_vars[(u, v, i)] for i in range(self.k)) <= self.edge_errors_vars[(u, v)],
+                f_u_v - pi_sum <= self.edge_errors_vars[(u, v)],
                 name=f"9aa_u={u}_v={v}_i={i}",
             )
 
             self.solver.add_constraint(
-                self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k)) - f_u_v <= self.edge_errors_vars[(u, v)],
+                pi_sum - f_u_v <= self.edge_errors_vars[(u, v)],
                 name=f"9ab_u={u}_v={v}_i={i}",
             )
 
@@ -546,7 +550,8 @@ class kLeastAbsErrors(pathmodel.AbstractPathModelDAG):
             The solution dictionary with empty paths removed.
 
         """
-        solution_copy = copy.deepcopy(solution)
+        # The paths are not deep-copied, since they are replaced below by the non-empty ones
+        solution_copy = {key: copy.deepcopy(value) for key, value in solution.items() if key != "paths"}
         non_empty_paths = []
         non_empty_weights = []
         for path, weight in zip(solution["paths"], solution["weights"]):
@@ -588,14 +593,7 @@ class kLeastAbsErrors(pathmodel.AbstractPathModelDAG):
         else:
             weights_sol_dict = {i: self.solution_weights_superset[i] for i in range(self.k)}
 
-        self.path_weights_sol = [
-            (
-                round(weights_sol_dict[i])
-                if self.weight_type == int
-                else float(weights_sol_dict[i])
-            )
-            for i in range(self.k)
-        ]
+        self.path_weights_sol = gu.solution_values_to_list(weights_sol_dict, self.k, self.weight_type)
         self.edge_errors_sol = self.solver.get_values(self.edge_errors_vars)
         for (u,v) in self.edge_indexes_basic:
             self.edge_errors_sol[(u,v)] = round(self.edge_errors_sol[(u,v)]) if self.weight_type == int else float(self.edge_errors_sol[(u,v)])
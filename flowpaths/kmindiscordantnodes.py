@@ -2,6 +2,7 @@ import networkx as nx
 import flowpaths.stdag as stdag
 import flowpaths.abstractpathmodeldag as pathmodel
 import flowpaths.utils as utils
+import flowpaths.utils.graphutils as gu
 import flowpaths.nodeexpandeddigraph as nedg
 import math
 import copy
@@ -331,7 +332,7 @@ class kMinDiscordantNodes(pathmodel.AbstractPathModelDAG):
             expanded_path.extend([expanded_edge[0], expanded_edge[1]])
         expanded_path.append(self.G.sink)
 
-        for edge in zip(expanded_path[:-1], expanded_path[1:]):
+        for edge in gu.pairwise(expanded_path):
             if not self.G.has_edge(*edge):
                 return None
 
@@ -371,7 +372,7 @@ class kMinDiscordantNodes(pathmodel.AbstractPathModelDAG):
             seeded_paths.append(list(seeded_paths[0]))
 
         path_edge_sets = [
-            set(zip(path[:-1], path[1:]))
+            set(gu.pairwise(path))
             for path in seeded_paths
         ]
 
@@ -422,7 +423,8 @@ class kMinDiscordantNodes(pathmodel.AbstractPathModelDAG):
             The solution dictionary with empty paths removed.
 
         """
-        solution_copy = copy.deepcopy(solution)
+        # The paths are not deep-copied, since they are replaced below by the non-empty ones
+        solution_copy = {key: copy.deepcopy(value) for key, value in solution.items() if key != "paths"}
         non_empty_paths = []
         non_empty_weights = []
         for path, weight in zip(solution["paths"], solution["weights"]):
@@ -463,14 +465,7 @@ class kMinDiscordantNodes(pathmodel.AbstractPathModelDAG):
 
         weights_sol_dict = self.solver.get_values(self.path_weights_vars)
 
-        self.path_weights_sol = [
-            (
-                round(weights_sol_dict[i])
-                if self.weight_type == int
-                else float(weights_sol_dict[i])
-            )
-            for i in range(self.k)
-        ]
+        self.path_weights_sol = gu.solution_values_to_list(weights_sol_dict, self.k, self.weight_type)
         discordant_lows = self.solver.get_values(self.discordant_low_vars)
         discordant_highs = self.solver.get_values(self.discordant_high_vars)
         self.discordant_edges_sol = {}
@@ -8,6 +8,7 @@ import flowpaths.abstractwalkmodeldigraph as walkmodel
 import flowpaths.nodeexpandeddigraph as nedg
 import flowpaths.stdigraph as stdigraph
 import flowpaths.utils as utils
+import flowpaths.utils.graphutils as gu
 
 
 class kMinDiscordantNodesCycles(walkmodel.AbstractWalkModelDiGraph):
@@ -309,7 +310,8 @@ class kMinDiscordantNodesCycles(walkmodel.AbstractWalkModelDiGraph):
         """
         Removes empty walks from the solution. Empty walks are those with 0 or 1 nodes.
         """
-        solution_copy = copy.deepcopy(solution)
+        # The walks are not deep-copied, since they are replaced below by the non-empty ones
+        solution_copy = {key: copy.deepcopy(value) for key, value in solution.items() if key != "walks"}
         non_empty_walks = []
         non_empty_weights = []
         for walk, weight in zip(solution["walks"], solution["weights"]):
@@ -333,10 +335,7 @@ class kMinDiscordantNodesCycles(walkmodel.AbstractWalkModelDiGraph):
 
         weights_sol_dict = self.solver.get_values(self.path_weights_vars)
 
-        self.path_weights_sol = [
-            round(weights_sol_dict[i]) if self.weight_type == int else float(weights_sol_dict[i])
-            for i in range(self.k)
-        ]
+        self.path_weights_sol = gu.solution_values_to_list(weights_sol_dict, self.k, self.weight_type)
 
         discordant_lows = self.solver.get_values(self.discordant_low_vars)
         discordant_highs = self.solver.get_values(self.discordant_high_vars)
@@ -1,7 +1,9 @@
 import networkx as nx
+import numpy as np
 import flowpaths.stdag as stdag
 import flowpaths.abstractpathmodeldag as pathmodel
 import flowpaths.utils as utils
+import flowpaths.utils.graphutils as gu
 import flowpaths.nodeexpandeddigraph as nedg
 import copy
 
@@ -29,6 +31,7 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
         solution_weights_superset: list = None,
         optimization_options: dict = None,
         solver_options: dict = None,
+        base_model: "kMinPathError" = None,
     ):
         """
         This class implements the k-MinPathError model from 
@@ -163,6 +166,13 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
 
             Dictionary with the solver options. Default is `{}`. See [solver options documentation](solver-options-optimizations.md).
 
+        - `base_model: kMinPathError`, optional
+
+            Another `kMinPathError` model built on the same graph `G` (the same object), with the same `flow_attr`, `flow_attr_origin`, 
+            `length_attr`, `additional_starts`, `additional_ends` and `additional_edges`, e.g. a model with different `elements_to_ignore`, 
+            `weight_type`, `error_scaling` or path length factors. Default is `None`. If set, the internal graph and the internal st-DAG 
+            (with its cached data) are taken from `base_model` instead of being built again, and so is the automatic `additional_edges_lambda`.
+
         Raises
         ----------
         - `ValueError`
@@ -175,10 +185,22 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
             - If the graph contains edges with negative (<0) flow values.  
             - If `additional_edges_lambda` is provided and is not numeric or is negative.
             - ValueError: If `flow_attr_origin` is not "node" or "edge".          
+            - If `base_model` is not built on the same graph, `flow_attr`, `flow_attr_origin`, `length_attr`, additional starts, ends and edges.
         """
 
         utils.logger.info(f"{__name__}: START initialized with graph id = {utils.fpid(G)}, k = {k}")
 
+        # Kept to check if this model can be the base_model of another one
+        self._input_graph = G
+        self._given_graph_options = (flow_attr, flow_attr_origin, length_attr, list(additional_starts), list(additional_ends), set(additional_edges or []))
+        if base_model is not None and not (
+            isinstance(base_model, kMinPathError)
+            and base_model._input_graph is G
+            and base_model._given_graph_options == self._given_graph_options
+        ):
+            utils.logger.error(f"{__name__}: base_model must be a kMinPathError model on the same graph, with the same flow_attr, flow_attr_origin, length_attr, additional starts, ends and edges.")
+            raise ValueError("base_model must be a kMinPathError model on the same graph, with the same flow_attr, flow_attr_origin, length_attr, additional starts, ends and edges.")
+
         # Validate additional_edges_lambda early; if None, compute graph-dependent default later.
         if additional_edges_lambda is not None:
             if not isinstance(additional_edges_lambda, (int, float)):
@@ -210,7 +232,7 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
             if G.number_of_nodes() == 0:
                 utils.logger.error(f"{__name__}: The input graph G has no nodes. Please provide a graph with at least one node.")
                 raise ValueError(f"The input graph G has no nodes. Please provide a graph with at least one node.")
-            self.G_internal = nedg.NodeExpandedDiGraph(G, node_flow_attr=flow_attr, node_length_attr=length_attr)
+            self.G_internal = base_model.G_internal if base_model is not None else nedg.NodeExpandedDiGraph(G, node_flow_attr=flow_attr, node_length_attr=length_attr)
             subpath_constraints_internal = self.G_internal.get_expanded_subpath_constraints(subpath_constraints)
             additional_starts_internal = self.G_internal.get_expanded_additional_starts(additional_starts)
             additional_ends_internal = self.G_internal.get_expanded_additional_ends(additional_ends)
@@ -218,7 +240,8 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
             if not all(isinstance(element_to_ignore, str) for element_to_ignore in elements_to_ignore):
                 utils.logger.error(f"elements_to_ignore must be a list of nodes (i.e strings), not {elements_to_ignore}")
                 raise ValueError(f"elements_to_ignore must be a list of nodes (i.e strings), not {elements_to_ignore}")
-            edges_to_ignore_internal = self.G_internal.edges_to_ignore
+            # A new list, since self.G_internal (and its edges_to_ignore) may be shared with other models
+            edges_to_ignore_internal = list(self.G_internal.edges_to_ignore)
             edges_to_ignore_internal += [self.G_internal.get_expanded_edge(node) for node in elements_to_ignore]
             edges_to_ignore_internal = list(set(edges_to_ignore_internal))
             additional_edges_internal = set([self.G_internal.get_expanded_edge(edge, check_in_graph=False) for edge in self.additional_edges])
@@ -229,7 +252,13 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
             if G.number_of_edges() == 0:
                 utils.logger.error(f"{__name__}: The input graph G has no edges. Please provide a graph with at least one edge.")
                 raise ValueError(f"The input graph G has no edges. Please provide a graph with at least one edge.")
-            self.G_internal = copy.deepcopy(G)
+            if base_model is not None:
+                self.G_internal = base_model.G_internal
+            elif nx.is_frozen(G) and len(self.additional_edges) == 0:
+                # A frozen graph cannot be modified, so it is used as is, instead of a copy
+                self.G_internal = G
+            else:
+                self.G_internal = copy.deepcopy(G)
             subpath_constraints_internal = subpath_constraints
             if not all(isinstance(edge, tuple) and len(edge) == 2 for edge in elements_to_ignore):
                 utils.logger.error(f"elements_to_ignore must be a list of edges (i.e. tuples of nodes), not {elements_to_ignore}")
@@ -245,18 +274,26 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
 
         self.flow_attr = flow_attr
 
+        self._auto_additional_edges_lambda = base_model._auto_additional_edges_lambda if base_model is not None else None
         if self.additional_edges_lambda is None:
-            self.additional_edges_lambda = utils.auto_additional_edges_lambda(
-                G,
-                flow_attr=self.flow_attr,
-                flow_attr_origin=self.flow_attr_origin,
-            )
+            if self._auto_additional_edges_lambda is None:
+                self._auto_additional_edges_lambda = utils.auto_additional_edges_lambda(
+                    G,
+                    flow_attr=self.flow_attr,
+                    flow_attr_origin=self.flow_attr_origin,
+                )
+            self.additional_edges_lambda = self._auto_additional_edges_lambda
             utils.logger.info(f"{__name__}: additional_edges_lambda set automatically to {self.additional_edges_lambda}")
 
-        # Add additional edges with default flow_attr 0
-        self.G_internal.add_edges_from(additional_edges_internal, **{self.flow_attr: 0})
+        if base_model is not None:
+            # The additional edges are already in base_model.G_internal, and the stDAG is frozen, so it can be shared
+            self.G = base_model.G
+        else:
+            # Add additional edges with default flow_attr 0
+            if additional_edges_internal:
+                self.G_internal.add_edges_from(additional_edges_internal, **{self.flow_attr: 0})
 
-        self.G = stdag.stDAG(self.G_internal, additional_starts=additional_starts_internal, additional_ends=additional_ends_internal)
+            self.G = stdag.stDAG(self.G_internal, additional_starts=additional_starts_internal, additional_ends=additional_ends_internal)
         self.subpath_constraints = subpath_constraints_internal
         self.edges_to_ignore = self.G.source_sink_edges.union(edges_to_ignore_internal)
         self.additional_edges = additional_edges_internal
@@ -450,12 +487,12 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
                     name=f"scaled_slack_i{i}",
                 )
                         
-        for u, v, data in self.G.edges(data=True):
+        # The flow values are read from the cached array of the st-DAG, in the order of self.G.edges()
+        for (u, v), f_u_v in zip(self.G.edges(), self.G.get_edge_attr_array(self.flow_attr).tolist()):
             if (u, v) in self.edges_to_ignore:
                 continue
             if (u, v) in self.additional_edges:
                 continue
-            f_u_v = data[self.flow_attr]
             edge_error_scaling_u_v = self.edge_error_scaling.get((u, v), 1)
 
             # We encode that edge_vars[(u,v,i)] * self.path_weights_vars[(i)] = self.pi_vars[(u,v,i)],
@@ -511,16 +548,15 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
             #   abs(f_u_v - sum(self.pi_vars[(u, v, i)] for i in range(self.k))) 
             #   * edge_error_scale_u_v 
             #   <= sum(self.gamma_vars[(u, v, i)] for i in range(self.k))
+            # The two sums are built once, and used in both constraints
+            weighted_error = (f_u_v - self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k))) * edge_error_scaling_u_v
+            gamma_sum = self.solver.quicksum(self.gamma_vars[(u, v, i)] for i in range(self.k))
             self.solver.add_constraint(
-                (f_u_v - self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k))) 
-                * edge_error_scaling_u_v
-                <= self.solver.quicksum(self.gamma_vars[(u, v, i)] for i in range(self.k)),
+                weighted_error <= gamma_sum,
                 name=f"9aa_u={u}_v={v}_i={i}",
             )
             self.solver.add_constraint(
-                (f_u_v - self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k))) 
-                * edge_error_scaling_u_v
-                >= -self.solver.quicksum(self.gamma_vars[(u, v, i)] for i in range(self.k)),
+                weighted_error >= -gamma_sum,
                 name=f"9ab_u={u}_v={v}_i={i}",
             )
 
@@ -596,13 +632,13 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
                     name=f"scaled_slack_i{i}",
                 )
                         
-        for u, v, data in self.G.edges(data=True):
+        # The flow values are read from the cached array of the st-DAG, in the order of self.G.edges()
+        for (u, v), f_u_v in zip(self.G.edges(), self.G.get_edge_attr_array(self.flow_attr).tolist()):
             if (u, v) in self.edges_to_ignore:
                 continue
             if (u, v) in self.additional_edges:
                 continue
 
-            f_u_v = data[self.flow_attr]
             edge_error_scaling_u_v = self.edge_error_scaling.get((u, v), 1)
 
             # We encode that edge_vars[(u,v,i)] * self.path_slacks_vars[(i)] = self.gamma_vars[(u,v,i)],
@@ -625,16 +661,15 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
             #   abs(f_u_v - sum(self.pi_vars[(u, v, i)] for i in range(self.k))) 
             #   * edge_error_scale_u_v 
             #   <= sum(self.gamma_vars[(u, v, i)] for i in range(self.k))
+            # The two sums are built once, and used in both constraints
+            weighted_error = (f_u_v - self.solver.quicksum(self.solution_weights_superset[i] * self.edge_vars[(u, v, i)] for i in range(self.k))) * edge_error_scaling_u_v
+            gamma_sum = self.solver.quicksum(self.gamma_vars[(u, v, i)] for i in range(self.k))
             self.solver.add_constraint(
-                (f_u_v - self.solver.quicksum(self.solution_weights_superset[i] * self.edge_vars[(u, v, i)] for i in range(self.k))) 
-                * edge_error_scaling_u_v
-                <= self.solver.quicksum(self.gamma_vars[(u, v, i)] for i in range(self.k)),
+                weighted_error <= gamma_sum,
                 name=f"9aa_u={u}_v={v}_i={i}",
             )
             self.solver.add_constraint(
-                (f_u_v - self.solver.quicksum(self.solution_weights_superset[i] * self.edge_vars[(u, v, i)] for i in range(self.k))) 
-                * edge_error_scaling_u_v
-                >= -self.solver.quicksum(self.gamma_vars[(u, v, i)] for i in range(self.k)),
+                weighted_error >= -gamma_sum,
                 name=f"9ab_u={u}_v={v}_i={i}",
             )
         
@@ -695,7 +730,8 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
             The solution dictionary with empty paths removed.
 
         """
-        solution_copy = copy.deepcopy(solution)
+        # The paths are not deep-copied, since they are replaced below by the non-empty ones
+        solution_copy = {key: copy.deepcopy(value) for key, value in solution.items() if key != "paths"}
         non_empty_paths = []
         non_empty_weights = []
         non_empty_slacks = []
@@ -748,23 +784,9 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
         else:
             weights_sol_dict = {i: self.solution_weights_superset[i] for i in range(self.k)}
 
-        self.path_weights_sol = [
-            (
-                round(weights_sol_dict[i])
-                if self.weight_type == int
-                else float(weights_sol_dict[i])
-            )
-            for i in range(self.k)
-        ]
+        self.path_weights_sol = gu.solution_values_to_list(weights_sol_dict, self.k, self.weight_type)
         slacks_sol_dict = self.solver.get_values(self.path_slacks_vars)
-        self.path_slacks_sol = [
-            (
-                round(slacks_sol_dict[i])
-                if self.weight_type == int
-                else float(slacks_sol_dict[i])
-            )
-            for i in range(self.k)
-        ]
+        self.path_slacks_sol = gu.solution_values_to_list(slacks_sol_dict, self.k, self.weight_type)
 
         if self.flow_attr_origin == "edge":
             self._solution = {
@@ -831,35 +853,46 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
             for path in solution_paths
         ]
 
-        weight_from_paths = {e: 0 for e in self.G.edges()}
-        slack_from_paths = {e: 0 for e in self.G.edges()}
-        num_paths_on_edges = {e: 0 for e in self.G.edges()}
+        # Per-edge sums as arrays indexed by the position of the edge in self.G.edges(),
+        # aligned with the cached array of flow values of the st-DAG
+        edge_index = self.G.get_edge_index()
+        flows = self.G.get_edge_attr_array(self.flow_attr)
+        weight_from_paths = np.zeros(len(edge_index))
+        slack_from_paths = np.zeros(len(edge_index))
+        num_paths_on_edges = np.zeros(len(edge_index), dtype=np.int64)
         for weight, slack, path in zip(
             solution_weights, solution_slacks, solution_paths_of_edges
         ):
-            for e in path:
-                if e in weight_from_paths:
-                    weight_from_paths[e] += weight
-                    slack_from_paths[e] += slack
-                    num_paths_on_edges[e] += 1
-
-        for u, v, data in self.G.edges(data=True):
-            if self.flow_attr in data and (u,v) not in self.edges_to_ignore and (u, v) not in self.additional_edges:
-                if (
-                    abs(data[self.flow_attr] - weight_from_paths[(u, v)])
-                    > tolerance * num_paths_on_edges[(u, v)] + slack_from_paths[(u, v)]
-                ):
-                    utils.logger.debug(f"{__name__}: Solution: {self._solution}")
-                    utils.logger.debug(f"{__name__}: num_paths_on_edges[(u, v)] = {num_paths_on_edges[(u, v)]}")
-                    utils.logger.debug(f"{__name__}: slack_from_paths[(u, v)] = {slack_from_paths[(u, v)]}")
-                    utils.logger.debug(f"{__name__}: data[self.flow_attr] = {data[self.flow_attr]}")
-                    utils.logger.debug(f"{__name__}: weight_from_paths[(u, v)] = {weight_from_paths[(u, v)]}")
-                    utils.logger.debug(f"{__name__}: > {tolerance * num_paths_on_edges[(u, v)] + slack_from_paths[(u, v)]}")
-                    
-                    var_dict = {var: val for var, val in zip(self.solver.get_all_variable_names(), self.solver.get_all_variable_values())}
-                    utils.logger.debug(f"{__name__}: Variable dictionary: {var_dict}")
-
-                    return False
+            path_edge_indices = [edge_index[e] for e in path if e in edge_index]
+            np.add.at(weight_from_paths, path_edge_indices, weight)
+            np.add.at(slack_from_paths, path_edge_indices, slack)
+            np.add.at(num_paths_on_edges, path_edge_indices, 1)
+
+        # The edges without flow_attr are the source and sink edges, which are in self.edges_to_ignore
+        checked_edges = np.fromiter(
+            ((u, v) not in self.edges_to_ignore and (u, v) not in self.additional_edges for u, v in edge_index),
+            dtype=bool,
+            count=len(edge_index),
+        )
+        violated = checked_edges & (
+            np.abs(flows - weight_from_paths) > tolerance * num_paths_on_edges + slack_from_paths
+        )
+        if violated.any():
+            i = int(np.flatnonzero(violated)[0])
+            # The variable dictionary asks the solver for all variables, so it is built only when it is logged
+            if utils.logger.isEnabledFor(utils.logging.DEBUG):
+                utils.logger.debug(f"{__name__}: Solution: {self._solution}")
+                utils.logger.debug(f"{__name__}: edge = {list(edge_index)[i]}")
+                utils.logger.debug(f"{__name__}: num_paths_on_edges[(u, v)] = {num_paths_on_edges[i]}")
+                utils.logger.debug(f"{__name__}: slack_from_paths[(u, v)] = {slack_from_paths[i]}")
+                utils.logger.debug(f"{__name__}: flow value of (u, v) = {flows[i]}")
+                utils.logger.debug(f"{__name__}: weight_from_paths[(u, v)] = {weight_from_paths[i]}")
+                utils.logger.debug(f"{__name__}: > {tolerance * num_paths_on_edges[i] + slack_from_paths[i]}")
+
+                var_dict = {var: val for var, val in zip(self.solver.get_all_variable_names(), self.solver.get_all_variable_values())}
+                utils.logger.debug(f"{__name__}: Variable dictionary: {var_dict}")
+
+            return False
 
         obj_tolerance = tolerance * self.k
         if self.additional_edges_lambda > 0 and len(self.additional_edges) > 0:
@@ -876,18 +909,20 @@ class kMinPathError(pathmodel.AbstractPathModelDAG):
             path_slack_scaled_sol = self.solver.get_values(self.slack_factors_vars)
             scaled_slack_sol = self.solver.get_values(self.scaled_slack_vars) 
             
-            for i in range(self.k):
-                # Checking which interval the path length is in,
-                # and then checking if the error scale factor is correctly encoded, 
-                for index, interval in enumerate(self.path_length_ranges):
-                    if path_length_sol[i] >= interval[0] and path_length_sol[i] <= interval[1]:
-                        if abs(path_slack_scaled_sol[i] - self.path_length_factors[index]) > tolerance:
-                            utils.logger.debug(f"{__name__}: path_length_sol: {path_length_sol}")
-                            utils.logger.debug(f"{__name__}: slack_sol: {slack_sol}")
-                            utils.logger.debug(f"{__name__}: path_slack_scaled_sol: {path_slack_scaled_sol}")
-                            utils.logger.debug(f"{__name__}: scaled_slack_sol: {scaled_slack_sol}")
-
-                            return False
+            # Checking which intervals the length of every path is in (one row per path, one column per interval),
+            # and then checking if the error scale factor is correctly encoded
+            path_lengths = np.array([path_length_sol[i] for i in range(self.k)], dtype=np.float64)
+            path_factors = np.array([path_slack_scaled_sol[i] for i in range(self.k)], dtype=np.float64)
+            ranges = np.asarray(self.path_length_ranges, dtype=np.float64).reshape(-1, 2)
+            factors = np.asarray(self.path_length_factors, dtype=np.float64)
+            in_interval = (path_lengths[:, None] >= ranges[:, 0]) & (path_lengths[:, None] <= ranges[:, 1])
+            if np.any(in_interval & (np.abs(path_factors[:, None] - factors) > tolerance)):
+                utils.logger.debug(f"{__name__}: path_length_sol: {path_length_sol}")
+                utils.logger.debug(f"{__name__}: slack_sol: {slack_sol}")
+                utils.logger.debug(f"{__name__}: path_slack_scaled_sol: {path_slack_scaled_sol}")
+                utils.logger.debug(f"{__name__}: scaled_slack_sol: {scaled_slack_sol}")
+
+                return False
 
         if not self.verify_edge_position():
             return False
@@ -2,15 +2,17 @@ import networkx as nx
 import flowpaths.stdigraph as stdigraph
 import flowpaths.abstractwalkmodeldigraph as walkmodel
 import flowpaths.utils as utils
+import flowpaths.utils.graphutils as gu
 import flowpaths.nodeexpandeddigraph as nedg
 import copy
 import numpy as np
 import time
+from typing import Union, Optional
 
 class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
     def __init__(
         self,
-        G: nx.DiGraph,
+        G: Union[nx.DiGraph, stdigraph.stDiGraph],
         flow_attr: str,
         k: int = None,
         flow_attr_origin: str = "edge",
@@ -23,7 +25,7 @@ class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
         additional_starts: list = [],
         additional_ends: list = [],
         additional_edges: list = [],
-        additional_edges_lambda: float | None = None,
+        additional_edges_lambda: Optional[float] = None,
         optimization_options: dict = None,
         solver_options: dict = {},
         trusted_edges_for_safety_percentile: float = None,
@@ -39,6 +41,10 @@ class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
             
             The input directed graph, as [networkx DiGraph](https://networkx.org/documentation/stable/reference/classes/digraph.html), which can have cycles.
 
+            It can also be an already built [`stDiGraph`](stdigraph.md) (e.g. one on which safe sequences were computed), which is then used as is,
+            together with its cached data, instead of building another one. In this case `flow_attr_origin` must be `"edge"`, and
+            `additional_starts`, `additional_ends` and `additional_edges` must be empty (those of the `stDiGraph` are used).
+
         - `flow_attr: str`
             
             The attribute name from where to get the flow values on the edges.
@@ -141,8 +147,18 @@ class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
             - If `elements_to_ignore_percentile` is set and is not in `[0, 100]`.
             - If `elements_to_ignore_percentile` is set together with `elements_to_ignore`.
             - If `additional_edges_lambda` is provided and is not numeric or is negative.
+            - If `G` is an `stDiGraph` and `flow_attr_origin` is not `"edge"`, or additional starts, ends or edges are given.
         """
 
+        # An already built stDiGraph is used as is (see the docstring), and the model is built on its base graph
+        given_stG = None
+        if isinstance(G, stdigraph.stDiGraph):
+            if flow_attr_origin != "edge" or additional_starts or additional_ends or additional_edges:
+                utils.logger.error(f"{__name__}: if G is an stDiGraph, flow_attr_origin must be 'edge', and additional_starts, additional_ends and additional_edges must be empty.")
+                raise ValueError("if G is an stDiGraph, flow_attr_origin must be 'edge', and additional_starts, additional_ends and additional_edges must be empty.")
+            given_stG = G
+            G = given_stG.base_graph
+
         # Validate additional_edges_lambda early before any graph processing
         if additional_edges_lambda is not None:
             if not isinstance(additional_edges_lambda, (int, float)):
@@ -193,7 +209,9 @@ class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
             if G.number_of_edges() == 0:
                 utils.logger.error(f"{__name__}: The input graph G has no edges. Please provide a graph with at least one edge.")
                 raise ValueError(f"The input graph G has no edges. Please provide a graph with at least one edge.")
-            self.G_internal = copy.deepcopy(G)
+            # A frozen graph cannot be modified, so if no additional edges need to be added, it is used as is, instead of a copy
+            # (as is the base graph of a given stDiGraph, which has no additional edges)
+            self.G_internal = G if (nx.is_frozen(G) or given_stG is not None) and len(self.additional_edges) == 0 else copy.deepcopy(G)
             subset_constraints_internal = subset_constraints
             if not all(isinstance(edge, tuple) and len(edge) == 2 for edge in elements_to_ignore):
                 utils.logger.error(f"elements_to_ignore must be a list of edges (i.e. tuples of nodes), not {elements_to_ignore}")
@@ -218,9 +236,13 @@ class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
             utils.logger.info(f"{__name__}: additional_edges_lambda set automatically to {self.additional_edges_lambda}")
 
         # Add additional edges with default flow_attr 0
-        self.G_internal.add_edges_from(additional_edges_internal, **{self.flow_attr: 0})
+        if additional_edges_internal:
+            self.G_internal.add_edges_from(additional_edges_internal, **{self.flow_attr: 0})
 
-        self.G = stdigraph.stDiGraph(self.G_internal, additional_starts=additional_starts_internal, additional_ends=additional_ends_internal)
+        if given_stG is not None:
+            self.G = given_stG
+        else:
+            self.G = stdigraph.stDiGraph(self.G_internal, additional_starts=additional_starts_internal, additional_ends=additional_ends_internal)
         self.subset_constraints = subset_constraints_internal
         self.additional_edges = additional_edges_internal
 
@@ -237,7 +259,8 @@ class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
             percentile = np.percentile(flow_values, elements_to_ignore_percentile) if flow_values else 0
             edges_to_ignore_internal = [edge for edge in self.G.edges() if flow_attr in self.G.edges[edge] and self.G.edges[edge][flow_attr] < percentile]
 
-        utils.logger.debug(f"{__name__}: edges_to_ignore_internal set to {edges_to_ignore_internal}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: edges_to_ignore_internal set to {edges_to_ignore_internal}")
 
         self.edges_to_ignore = self.G.source_sink_edges.union(edges_to_ignore_internal)
         self.edge_error_scaling = error_scaling_internal
@@ -447,16 +470,15 @@ class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
             #   abs(f_u_v - sum(self.pi_vars[(u, v, i)] for i in range(self.k))) 
             #   * edge_error_scale_u_v 
             #   <= sum(self.gamma_vars[(u, v, i)] for i in range(self.k))
+            # The two sums are built once, and used in both constraints
+            weighted_error = (f_u_v - self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k))) * edge_error_scaling_u_v
+            gamma_sum = self.solver.quicksum(self.gamma_vars[(u, v, i)] for i in range(self.k))
             self.solver.add_constraint(
-                (f_u_v - self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k))) 
-                * edge_error_scaling_u_v
-                <= self.solver.quicksum(self.gamma_vars[(u, v, i)] for i in range(self.k)),
+                weighted_error <= gamma_sum,
                 name=f"9aa_u={u}_v={v}_i={i}",
             )
             self.solver.add_constraint(
-                (f_u_v - self.solver.quicksum(self.pi_vars[(u, v, i)] for i in range(self.k))) 
-                * edge_error_scaling_u_v
-                >= -self.solver.quicksum(self.gamma_vars[(u, v, i)] for i in range(self.k)),
+                weighted_error >= -gamma_sum,
                 name=f"9ab_u={u}_v={v}_i={i}",
             )
 
@@ -507,7 +529,8 @@ class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
             The solution dictionary with empty walks removed.
 
         """
-        solution_copy = copy.deepcopy(solution)
+        # The walks are not deep-copied, since they are replaced below by the non-empty ones
+        solution_copy = {key: copy.deepcopy(value) for key, value in solution.items() if key != "walks"}
         non_empty_walks = []
         non_empty_weights = []
         non_empty_slacks = []
@@ -550,23 +573,9 @@ class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
         self.check_is_solved()
 
         weights_sol_dict = self.solver.get_values(self.path_weights_vars)
-        self.path_weights_sol = [
-            (
-                round(weights_sol_dict[i])
-                if self.weight_type == int
-                else float(weights_sol_dict[i])
-            )
-            for i in range(self.k)
-        ]
+        self.path_weights_sol = gu.solution_values_to_list(weights_sol_dict, self.k, self.weight_type)
         slacks_sol_dict = self.solver.get_values(self.path_slacks_vars)
-        self.path_slacks_sol = [
-            (
-                round(slacks_sol_dict[i])
-                if self.weight_type == int
-                else float(slacks_sol_dict[i])
-            )
-            for i in range(self.k)
-        ]
+        self.path_slacks_sol = gu.solution_values_to_list(slacks_sol_dict, self.k, self.weight_type)
 
         if self.flow_attr_origin == "edge":
             self._solution = {
@@ -643,15 +652,17 @@ class kMinPathErrorCycles(walkmodel.AbstractWalkModelDiGraph):
                     abs(data[self.flow_attr] - weight_from_walks[(u, v)])
                     > tolerance * num_edge_walks_on_edges[(u, v)] + slack_from_walks[(u, v)]
                 ):
-                    utils.logger.debug(f"{__name__}: Solution: {self._solution}")
-                    utils.logger.debug(f"{__name__}: num_edge_walks_on_edges[(u, v)] = {num_edge_walks_on_edges[(u, v)]}")
-                    utils.logger.debug(f"{__name__}: slack_from_walks[(u, v)] = {slack_from_walks[(u, v)]}")
-                    utils.logger.debug(f"{__name__}: data[self.flow_attr] = {data[self.flow_attr]}")
-                    utils.logger.debug(f"{__name__}: weight_from_walks[(u, v)] = {weight_from_walks[(u, v)]}")
-                    utils.logger.debug(f"{__name__}: > {tolerance * num_edge_walks_on_edges[(u, v)] + slack_from_walks[(u, v)]}")
-
-                    var_dict = {var: val for var, val in zip(self.solver.get_all_variable_names(), self.solver.get_all_variable_values())}
-                    utils.logger.debug(f"{__name__}: Variable dictionary: {var_dict}")
+                    # The variable dictionary asks the solver for all variables, so it is built only when it is logged
+                    if utils.logger.isEnabledFor(utils.logging.DEBUG):
+                        utils.logger.debug(f"{__name__}: Solution: {self._solution}")
+                        utils.logger.debug(f"{__name__}: num_edge_walks_on_edges[(u, v)] = {num_edge_walks_on_edges[(u, v)]}")
+                        utils.logger.debug(f"{__name__}: slack_from_walks[(u, v)] = {slack_from_walks[(u, v)]}")
+                        utils.logger.debug(f"{__name__}: data[self.flow_attr] = {data[self.flow_attr]}")
+                        utils.logger.debug(f"{__name__}: weight_from_walks[(u, v)] = {weight_from_walks[(u, v)]}")
+                        utils.logger.debug(f"{__name__}: > {tolerance * num_edge_walks_on_edges[(u, v)] + slack_from_walks[(u, v)]}")
+
+                        var_dict = {var: val for var, val in zip(self.solver.get_all_variable_names(), self.solver.get_all_variable_values())}
+                        utils.logger.debug(f"{__name__}: Variable dictionary: {var_dict}")
 
                     return False
 
@@ -176,7 +176,7 @@ class kPathCover(pathmodel.AbstractPathModelDAG):
         
         subpath_constraint_edges = set()
         for subpath_constraint in self.subpath_constraints:
-            for edge in zip(subpath_constraint[:-1], subpath_constraint[1:]):
+            for edge in gu.pairwise(subpath_constraint):
                 subpath_constraint_edges.add(edge)
 
         for u, v in self.G.edges():
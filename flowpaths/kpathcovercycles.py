@@ -2,6 +2,7 @@ import networkx as nx
 import flowpaths.stdigraph as stdigraph
 import flowpaths.abstractwalkmodeldigraph as walkmodel
 import flowpaths.utils as utils
+import flowpaths.utils.graphutils as gu
 import flowpaths.nodeexpandeddigraph as nedg
 from copy import deepcopy
 import time
@@ -160,7 +161,7 @@ class kPathCoverCycles(walkmodel.AbstractWalkModelDiGraph):
         
         subset_constraint_edges = set()
         for subset_constraint in self.subset_constraints:
-            for edge in zip(subset_constraint[:-1], subset_constraint[1:]):
+            for edge in gu.pairwise(subset_constraint):
                 subset_constraint_edges.add(edge)
 
         for u, v in self.G.edges():
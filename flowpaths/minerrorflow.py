@@ -2,6 +2,8 @@ import flowpaths.utils.solverwrapper as sw
 import flowpaths.stdag as stdag
 import flowpaths.utils as utils
 import flowpaths.nodeexpandeddigraph as nedg
+import flowpaths.minflowdecomp as mfd
+import flowpaths.minflowdecompcycles as mfdc
 import networkx as nx
 from copy import deepcopy
 import time
@@ -90,6 +92,10 @@ class MinErrorFlow():
             A dictionary containing the options for the solver. The options are passed to the solver wrapper. Default is `{}`. See [solver options documentation](solver-options-optimizations.md).
         """
 
+        # Kept to decompose the corrected graph with the same start/end nodes (see decompose())
+        self.additional_starts = additional_starts
+        self.additional_ends = additional_ends
+
         # Handling node-weighted graphs
         self.flow_attr_origin = flow_attr_origin
         if self.flow_attr_origin == "node":
@@ -503,6 +509,34 @@ class MinErrorFlow():
         return solution["graph"]
     
 
+    def decompose(self, weight_type: type = None, optimization_options: dict = None, solver_options: dict = None):
+        """
+        Returns a minimum flow decomposition model of the corrected graph, namely a `MinFlowDecomp` model
+        (or a `MinFlowDecompCycles` model, if the graph has cycles), which still needs to be solved.
+
+        The model is built directly on the corrected graph of the solution (without another copy of it), with the same
+        `flow_attr`, `flow_attr_origin`, additional start/end nodes and, unless given, `weight_type` and `solver_options`
+        as this model.
+
+        !!! warning "Warning"
+            Call the `solve` method first.
+        """
+        corrected_graph = self.get_corrected_graph()
+
+        kwargs = dict(
+            G=corrected_graph,
+            flow_attr=self.flow_attr,
+            flow_attr_origin=self.flow_attr_origin,
+            weight_type=self.weight_type if weight_type is None else weight_type,
+            additional_starts=self.additional_starts,
+            additional_ends=self.additional_ends,
+            optimization_options=optimization_options if optimization_options is not None else {},
+            solver_options=self.solver_options if solver_options is None else solver_options,
+        )
+        if self.is_acyclic:
+            return mfd.MinFlowDecomp(**kwargs)
+        return mfdc.MinFlowDecompCycles(**kwargs)
+
     def get_objective_value(self):
         """
         Returns the sum of the errors of the optimum solution.
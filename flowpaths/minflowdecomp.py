@@ -43,6 +43,7 @@ class MinFlowDecomp(pathmodel.AbstractPathModelDAG): # Note that we inherit from
         additional_ends: list = [],
         optimization_options: dict = {},
         solver_options: dict = {},
+        base_model: "MinFlowDecomp" = None,
     ):
         """
         Initialize the Minimum Flow Decomposition model, minimizing the number of paths.
@@ -122,6 +123,15 @@ class MinFlowDecomp(pathmodel.AbstractPathModelDAG): # Note that we inherit from
             
             Dictionary with the solver options. Default is `{}`. See [solver options documentation](solver-options-optimizations.md).
 
+        - `base_model : MinFlowDecomp`, optional
+
+            Another `MinFlowDecomp` model on the same graph `G` (the same object), with the same `flow_attr`, `flow_attr_origin`, `elements_to_ignore`, 
+            `additional_starts` and `additional_ends`, which was already solved (e.g. with different subpath constraints or optimization options). Default is `None`. 
+            If set, the parts that do not depend on these differences are taken from `base_model` instead of being computed again: 
+            the node-expanded graph (if `flow_attr_origin` is `"node"`), the st-DAG, the flow safe paths, 
+            the safe paths/sequences if also the subpath constraints (with their coverage) and `optimization_options` are the same,
+            and, if also `optimization_options` are the same, the lowerbound on the number of paths (see also `base_model` of `kFlowDecomp`).
+
         Raises
         ------
         `ValueError`
@@ -132,15 +142,31 @@ class MinFlowDecomp(pathmodel.AbstractPathModelDAG): # Note that we inherit from
         - If the graph contains edges with negative (<0) flow values.
         - If the graph is not acyclic.
         - If `flow_attr_origin` is not "node" or "edge".
+        - If `base_model` is not on the same graph, `flow_attr`, `flow_attr_origin`, `elements_to_ignore`, `additional_starts` and `additional_ends`.
         """
 
+        if base_model is not None and not (
+            isinstance(base_model, MinFlowDecomp)
+            and base_model._input_graph is G
+            and base_model.flow_attr == flow_attr
+            and base_model.flow_attr_origin == flow_attr_origin
+            and base_model._given_elements == (list(elements_to_ignore), list(additional_starts), list(additional_ends))
+        ):
+            utils.logger.error(f"{__name__}: base_model must be a MinFlowDecomp model on the same graph, with the same flow_attr, flow_attr_origin, elements_to_ignore, additional_starts and additional_ends.")
+            raise ValueError("base_model must be a MinFlowDecomp model on the same graph, with the same flow_attr, flow_attr_origin, elements_to_ignore, additional_starts and additional_ends.")
+        # Kept to check if this model can be the base_model of another one
+        self._input_graph = G
+        self._given_elements = (list(elements_to_ignore), list(additional_starts), list(additional_ends))
+
         # Handling node-weighted graphs
         self.flow_attr_origin = flow_attr_origin
         if self.flow_attr_origin == "node":
             if G.number_of_nodes() == 0:
                 utils.logger.error(f"{__name__}: The input graph G has no nodes. Please provide a graph with at least one node.")
                 raise ValueError(f"The input graph G has no nodes. Please provide a graph with at least one node.")
-            if len(additional_starts) + len(additional_ends) == 0:
+            if base_model is not None:
+                self.G_internal = base_model.G_internal
+            elif len(additional_starts) + len(additional_ends) == 0:
                 self.G_internal = nedg.NodeExpandedDiGraph(
                     G=G, 
                     node_flow_attr=flow_attr, 
@@ -156,7 +182,8 @@ class MinFlowDecomp(pathmodel.AbstractPathModelDAG): # Note that we inherit from
                 )
             subpath_constraints_internal = self.G_internal.get_expanded_subpath_constraints(subpath_constraints)
             
-            edges_to_ignore_internal = self.G_internal.edges_to_ignore
+            # A copy, since the list of the node-expanded graph (possibly shared with base_model) must not change
+            edges_to_ignore_internal = list(self.G_internal.edges_to_ignore)
             if not all(isinstance(element_to_ignore, str) for element_to_ignore in elements_to_ignore):
                 utils.logger.error(f"elements_to_ignore must be a list of nodes (i.e strings), not {elements_to_ignore}")
                 raise ValueError(f"elements_to_ignore must be a list of nodes (i.e strings), not {elements_to_ignore}")
@@ -206,6 +233,14 @@ class MinFlowDecomp(pathmodel.AbstractPathModelDAG): # Note that we inherit from
         self._given_weights_model = None
         self._source_flow = None
 
+        # The last kFlowDecomp model of base_model, which is the base_model of the first kFlowDecomp model of this one.
+        # Its st-DAG and flow safe paths do not depend on the subpath constraints, and kFlowDecomp itself checks 
+        # if its safe lists can be reused (same subpath constraints, coverage, length_attr and optimization options).
+        # The lowerbound does not depend on the subpath constraints either, only on the optimization options.
+        self._base_fd_model = getattr(base_model, "fd_model", None) if base_model is not None else None
+        if base_model is not None and base_model.optimization_options == self.optimization_options:
+            self._lowerbound_k = base_model._lowerbound_k
+
         utils.logger.info(f"{__name__}: initialized with graph id = {utils.fpid(G)}")
 
     def solve(self) -> bool:
@@ -227,6 +262,8 @@ class MinFlowDecomp(pathmodel.AbstractPathModelDAG): # Note that we inherit from
         if self.optimization_options.get("optimize_with_guessed_weights", MinFlowDecomp.optimize_with_given_weights):            
             self._solve_with_given_weights()
 
+        # The model for the previous k, whose parts not depending on k are reused by the next model
+        previous_fd_model = self._base_fd_model
         for i in range(self.get_lowerbound_k(), self.G.number_of_edges()):
             utils.logger.info(f"{__name__}: iteration with k = {i}")
             fd_model = None
@@ -253,8 +290,10 @@ class MinFlowDecomp(pathmodel.AbstractPathModelDAG): # Note that we inherit from
                     elements_to_ignore=self.edges_to_ignore,
                     optimization_options=self.optimization_options,
                     solver_options=fd_solver_options,
+                    base_model=previous_fd_model,
                 )
                 fd_model.solve()
+                previous_fd_model = fd_model
 
             if fd_model.is_solved():
                 self._solution = fd_model.get_solution(remove_empty_paths=True)
@@ -401,7 +440,8 @@ class MinFlowDecomp(pathmodel.AbstractPathModelDAG): # Note that we inherit from
         if limit_num_constraints is not None:
             partition_constraints_list = partition_constraints_list[:limit_num_constraints]
 
-        utils.logger.debug(f"{__name__}: partition_constraints = {partition_constraints_list}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: partition_constraints = {partition_constraints_list}")
 
         return partition_constraints_list
     
@@ -557,7 +597,7 @@ class MinFlowDecomp(pathmodel.AbstractPathModelDAG): # Note that we inherit from
         if self._lowerbound_k != None:
             return self._lowerbound_k
         
-        stG = stdag.stDAG(self.G)
+        stG = self._base_fd_model.G if self._base_fd_model is not None else stdag.stDAG(self.G)
 
         self._lowerbound_k = self.optimization_options.get("lowerbound_k", 1)
 
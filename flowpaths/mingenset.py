@@ -84,7 +84,8 @@ class MinGenSet():
         """
         
         self.numbers = list(numbers) # Make a copy of the list
-        utils.logger.debug(f"{__name__}: Initial numbers: {self.numbers}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: Initial numbers: {self.numbers}")
         self.initial_numbers = numbers
         self.total = total
         utils.logger.debug(f"{__name__}: Generating set sum = {self.total}")
@@ -122,25 +123,29 @@ class MinGenSet():
                 utils.logger.error(f"{__name__}: `remove_sums_of_two` is set to True, but `max_multiplicity > 1`. This is not allowed.")
                 raise ValueError("`remove_sums_of_two` is not allowed when `max_multiplicity > 1`.")
 
+            # Membership is checked in a set, not in the list, so that each check is O(1)
+            numbers_set = set(self.numbers)
             elements_to_remove = set()
-            for val1 in self.numbers:
-                for val2 in self.numbers:
-                    if val1 + val2 in self.numbers:
+            for val1 in numbers_set:
+                for val2 in numbers_set:
+                    if val1 + val2 in numbers_set:
                         elements_to_remove.add(val1 + val2)
 
-            self.numbers = list(set(self.numbers) - elements_to_remove)
+            self.numbers = list(numbers_set - elements_to_remove)
 
         if remove_complement_values:
+            numbers_set = set(self.numbers)
             elements_to_remove = set()
-            for val in self.numbers:
-                if total - val in self.numbers and total - val > val:
+            for val in numbers_set:
+                if total - val in numbers_set and total - val > val:
                     elements_to_remove.add(total - val)
                 if val == total or val == 0:
                     elements_to_remove.add(val)
 
-            self.numbers = list(set(self.numbers) - elements_to_remove)
+            self.numbers = list(numbers_set - elements_to_remove)
 
-        utils.logger.debug(f"{__name__}: Numbers after removing values: {self.numbers}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: Numbers after removing values: {self.numbers}")
 
     def _create_solver(self, k):
 
@@ -288,29 +293,33 @@ class MinGenSet():
                         name=f"pi_y_i={i}_j={j}_c={c}",
                     )
 
-        # Every element in the generating set must be used exactly once to obtain the numbers in each subset
-        for i in range(k):
-            for c in range(len(self.partition_constraints)):
-                self.solver.add_constraint(
-                    self.solver.quicksum(
-                        y_vars[(i, j, c)]
-                        for j in range(t)
-                    )
-                    == 1,
-                    name=f"used_exactly_once_constr={c}_i={j}",
-                )
+        # Every element in the generating set must be used exactly once to obtain the numbers in each subset.
+        # These rows, and the subset sum rows below, are plain sums of variables, so they are added in one batch.
+        used_once_groups = [
+            [y_vars[(i, j, c)] for j in range(t)]
+            for i in range(k)
+            for c in range(len(self.partition_constraints))
+        ]
+        self.solver.add_sum_range_constraints(
+            used_once_groups,
+            lb=[1] * len(used_once_groups),
+            ub=[1] * len(used_once_groups),
+            name="used_exactly_once",
+        )
 
         # Imposing the subset constraints
+        subset_sum_groups = []
+        subset_sums = []
         for c, constraint in enumerate(self.partition_constraints):
             for j in range(len(constraint)):
-                self.solver.add_constraint(
-                    self.solver.quicksum(
-                        pi_y_vars[(i, j, c)]
-                        for i in range(k)
-                    )
-                    == constraint[j],
-                    name=f"subset_sum_constr={c}_subset_j={j}",
-                )
+                subset_sum_groups.append([pi_y_vars[(i, j, c)] for i in range(k)])
+                subset_sums.append(constraint[j])
+        self.solver.add_sum_range_constraints(
+            subset_sum_groups,
+            lb=subset_sums,
+            ub=subset_sums,
+            name="subset_sum",
+        )
                 
     def solve(self):
         """
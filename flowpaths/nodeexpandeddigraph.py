@@ -99,7 +99,8 @@ class NodeExpandedDiGraph(nx.DiGraph):
             utils.logger.error(f"{__name__}: Graph id {utils.fpid(G)}: every node of the graph must be a string.")
             raise ValueError("Every node of the graph must be a string.")
 
-        self.original_G = deepcopy(G)
+        # A frozen graph cannot be modified, so it is kept as is, instead of a copy
+        self.original_G = G if nx.is_frozen(G) else deepcopy(G)
 
         if "id" in G.graph:
             self.graph["id"] = G.graph["id"]
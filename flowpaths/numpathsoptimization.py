@@ -1,5 +1,6 @@
 import time
 import copy
+import inspect
 import flowpaths.abstractpathmodeldag as pathmodel
 import flowpaths.abstractwalkmodeldigraph as walkmodel
 import flowpaths.utils as utils
@@ -121,6 +122,14 @@ class NumPathsOptimization(pathmodel.AbstractPathModelDAG, walkmodel.AbstractWal
         if 'k' in self.kwargs:
             raise ValueError("Do not pass the parameter `k` in the keyword arguments of NumPathsOptimization. This will be iterated over internally to find the best number of paths/walks according to the stopping criteria.")
         
+        # If the model type can reuse the k-independent setup of a model with another k (e.g. kFlowDecomp),
+        # each model of the sweep is built with the previous one as its `base_model`
+        self._reuse_base_model = (
+            "base_model" in inspect.signature(model_type).parameters
+            and self.kwargs.get("base_model") is None
+        )
+        self._base_model = None
+
         self.lowerbound_k = None
         self._solution = None
         self._incumbent_solution = None
@@ -130,6 +139,17 @@ class NumPathsOptimization(pathmodel.AbstractPathModelDAG, walkmodel.AbstractWal
 
         utils.logger.info(f"{__name__}: created NumPathsOptimization with model_type = {model_type}")
 
+    def _copy_kwargs(self):
+        """
+        Returns a deep copy of the keyword arguments of the model, except for the input graph, 
+        which is not modified by the models, and which must be the same object for `base_model` to be used.
+        """
+
+        memo = {}
+        if "G" in self.kwargs:
+            memo[id(self.kwargs["G"])] = self.kwargs["G"]
+        return copy.deepcopy(self.kwargs, memo)
+
     def _get_unfiltered_solution_from_model(self, model):
         """
         Retrieve solution from wrapped model without removing empty paths/walks,
@@ -205,7 +225,7 @@ class NumPathsOptimization(pathmodel.AbstractPathModelDAG, walkmodel.AbstractWal
                 )
                 break
 
-            model_kwargs = copy.deepcopy(self.kwargs)
+            model_kwargs = self._copy_kwargs()
             # Enforce a global wall-clock budget by capping each per-k model with
             # the remaining time (without overriding a stricter caller-provided cap).
             if self.time_limit != float("inf"):
@@ -218,7 +238,11 @@ class NumPathsOptimization(pathmodel.AbstractPathModelDAG, walkmodel.AbstractWal
 
             # Create the model
             utils.logger.info(f"{__name__}: model id = {id(self)}, iteration with k = {k}")
+            if self._reuse_base_model:
+                model_kwargs["base_model"] = self._base_model
             model = self.model_type(**model_kwargs, k=k)
+            if self._reuse_base_model:
+                self._base_model = model
             model.solve()
 
             model_status = None
@@ -431,6 +455,8 @@ class NumPathsOptimization(pathmodel.AbstractPathModelDAG, walkmodel.AbstractWal
         
         tmp_model = self.model_type(**self.kwargs, k = 1)
         self.lowerbound_k = tmp_model.get_lowerbound_k()
+        if self._reuse_base_model:
+            self._base_model = tmp_model
 
         return self.lowerbound_k
     
@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 from flowpaths.utils import graphutils
 import flowpaths.utils as utils
 from flowpaths.abstractsourcesinkgraph import AbstractSourceSinkGraph
@@ -48,6 +49,7 @@ class stDAG(AbstractSourceSinkGraph):
         self._reachable_edges_from = None
         self._nodes_reaching = None
         self._reachable_edges_rev_from = None
+        self._edge_index_arrays = None
 
     @property
     def reachable_nodes_from(self):
@@ -114,20 +116,22 @@ class stDAG(AbstractSourceSinkGraph):
         except those in the `edges_to_ignore` list. 
         
         If the width has already been computed and `edges_to_ignore` is empty,
-        the stored value is returned.
+        the stored value is returned. Any iterable of edges is accepted as `edges_to_ignore`.
 
         Returns
         ----------
         - int: The width of the graph.
         """
 
+        edges_to_ignore = frozenset(edges_to_ignore or ())
+
         if subpath_constraints is not None:
             # When constraints are provided, width is the constrained minimum path cover size.
             from flowpaths.minpathcover import MinPathCover
 
             edges_to_ignore_list = [
                 edge
-                for edge in set(edges_to_ignore or [])
+                for edge in edges_to_ignore
                 if isinstance(edge, tuple) and len(edge) == 2 and self.base_graph.has_edge(edge[0], edge[1])
             ]
 
@@ -149,15 +153,13 @@ class stDAG(AbstractSourceSinkGraph):
                 raise ValueError("Could not compute constrained width with MinPathCover.")
             return mpc_model.get_objective_value()
 
-        if self.width is not None and (edges_to_ignore is None or len(edges_to_ignore) == 0):
+        if self.width is not None and not edges_to_ignore:
             return self.width
-        
-        edges_to_ignore_set = set(edges_to_ignore or [])
 
-        weight_function = {e: 1 for e in self.edges() if e not in edges_to_ignore_set}
+        weight_function = {e: 1 for e in self.edges() if e not in edges_to_ignore}
         
         width = self.compute_max_edge_antichain(get_antichain=False, weight_function=weight_function)
-        if (edges_to_ignore is None or len(edges_to_ignore) == 0):
+        if not edges_to_ignore:
             self.width = width
 
         return width
@@ -202,6 +204,22 @@ class stDAG(AbstractSourceSinkGraph):
 
         return self.flow_width
 
+    def _get_edge_index_arrays(self):
+        """
+        Returns (and caches) the tuple `(edges, tails, heads, node_index)`, where `edges` is the list of edges of the graph,
+        `node_index` maps every node to its integer id (position in `self.nodes()`), and `tails[i]`, `heads[i]`
+        are the integer ids of the endpoints of `edges[i]`.
+        """
+
+        if self._edge_index_arrays is None:
+            node_index = {node: i for i, node in enumerate(self.nodes())}
+            edges = list(self.edges())
+            tails = np.fromiter((node_index[u] for u, _ in edges), dtype=np.int64, count=len(edges))
+            heads = np.fromiter((node_index[v] for _, v in edges), dtype=np.int64, count=len(edges))
+            self._edge_index_arrays = (edges, tails, heads, node_index)
+
+        return self._edge_index_arrays
+
     def compute_max_edge_antichain(self, get_antichain=False, weight_function=None):
         """
         Computes the maximum edge antichain in a directed graph.
@@ -222,6 +240,24 @@ class stDAG(AbstractSourceSinkGraph):
                 size of maximum edge antichain and the antichain.
         """
 
+        if not get_antichain:
+            # Only the size of the antichain (i.e. the min flow value) is needed, so we try the SciPy max-flow path first
+            edges, tails, heads, node_index = self._get_edge_index_arrays()
+            if weight_function:
+                demands = np.fromiter((weight_function.get(e, 0) for e in edges), dtype=np.float64, count=len(edges))
+            else:
+                demands = ((tails != node_index[self.source]) & (heads != node_index[self.sink])).astype(np.float64)
+            min_flow_value = graphutils.min_flow_value_scipy(
+                n=self.number_of_nodes(),
+                tails=tails,
+                heads=heads,
+                demands=demands,
+                s=node_index[self.source],
+                t=node_index[self.sink],
+            )
+            if min_flow_value is not None:
+                return min_flow_value
+
         G_nx = nx.DiGraph()
         demand = dict()
 
@@ -255,6 +291,11 @@ class stDAG(AbstractSourceSinkGraph):
         #             DFS_find_reachable_from_source(v, visited)
         
         # The following code was created by Claude 3.7 Sonnet to avoid recursion and uses a stack instead.
+        # We iterate over self._adj / self._pred directly, instead of self.successors / self.predecessors,
+        # to avoid creating an iterator view at every step of the DFS.
+        succ = self._adj
+        pred = self._pred
+
         def DFS_find_reachable_from_source(start_node, visited):
             stack = [start_node]
             
@@ -266,11 +307,12 @@ class stDAG(AbstractSourceSinkGraph):
                 assert u != self.sink
                 visited[u] = 1
                 
-                for v in self.successors(u):
-                    if minFlow[u][v] > demand[(u, v)] and visited[v] == 0:
+                minFlow_u = minFlow[u]
+                for v in succ[u]:
+                    if visited[v] == 0 and minFlow_u[v] > demand[(u, v)]:
                         stack.append(v)
                         
-                for v in self.predecessors(u):
+                for v in pred[u]:
                     if visited[v] == 0:
                         stack.append(v)
 
@@ -303,17 +345,18 @@ class stDAG(AbstractSourceSinkGraph):
                 visited[u] = 2
                 
                 # Process successors
-                for v in self.successors(u):
-                    if minFlow[u][v] > demand[(u, v)]:
+                minFlow_u = minFlow[u]
+                for v in succ[u]:
+                    if minFlow_u[v] > demand[(u, v)]:
                         if visited[v] == 1:  # Only visit nodes marked as reachable (1)
                             stack.append(v)
-                    elif (minFlow[u][v] == demand[(u, v)] 
+                    elif (minFlow_u[v] == demand[(u, v)] 
                         and demand[(u, v)] >= 1 
                         and visited[v] == 0):
                         antichain.append((u, v))
                 
                 # Process predecessors
-                for v in self.predecessors(u):
+                for v in pred[u]:
                     if visited[v] == 1:  # Only visit nodes marked as reachable (1)
                         stack.append(v)
 
@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 import copy
 from flowpaths.utils import graphutils
 from flowpaths.stdag import stDAG
@@ -47,6 +48,7 @@ class stDiGraph(AbstractSourceSinkGraph):
         self._condensation_with_parallel_edges = None
         self._edge_to_parallel_first_edge: Dict[Tuple[str, str], Tuple[str, str]] = {}
         self._parallel_first_to_second_edge: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._scc_sizes: Optional[np.ndarray] = None
         super().__init__(
             base_graph=base_graph,
             additional_starts=additional_starts,
@@ -89,9 +91,29 @@ class stDiGraph(AbstractSourceSinkGraph):
 
         return str(v) + "_expanded"
 
+    def _compute_sccs(self) -> List[Set[str]]:
+        """
+        Computes the SCCs of the graph, in the format expected by `nx.condensation`.
+
+        The CSR adjacency and the SCC label of every node are cached (see `graphutils._scc_labels`),
+        so that the SCC statistics (e.g. `get_size_of_largest_SCC`) are simple array reductions.
+        """
+
+        nodes, indptr, indices, labels = graphutils._scc_labels(self)
+        self._csr_nodes = nodes
+        self._csr_indptr = indptr
+        self._csr_indices = indices
+        self._scc_labels = labels
+
+        sccs = [set() for _ in range(int(labels.max()) + 1)]
+        for node, label in zip(nodes, labels.tolist()):
+            sccs[label].add(node)
+
+        return sccs
+
     def _build_condensation_expanded(self):
 
-        self._condensation: nx.DiGraph = nx.condensation(self)
+        self._condensation: nx.DiGraph = nx.condensation(self, scc=self._compute_sccs())
         # We add the dict `member_edges` storing for each node in the condensation, the edges in that SCC
         self._condensation.graph["member_edges"] = {str(node): set() for node in self._condensation.nodes()}
         # We add the dict `edge_multiplicity` for each edge in the condensation to store the number of 
@@ -105,9 +127,10 @@ class stDiGraph(AbstractSourceSinkGraph):
             else:
                 # Otherwise, we increase the multiplicity of the condensation edge between the different SCCs
                 self._condensation.graph["edge_multiplicity"][self._edge_to_condensation_edge(u, v)] += 1
-        utils.logger.debug(f"{__name__}: Condensation graph: {self._condensation.edges()}")
-        utils.logger.debug(f"{__name__}: Condensation member edges: {self._condensation.graph['member_edges']}")
-        utils.logger.debug(f"{__name__}: Condensation mapping: {self._condensation.graph['mapping']}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: Condensation graph: {self._condensation.edges()}")
+            utils.logger.debug(f"{__name__}: Condensation member edges: {self._condensation.graph['member_edges']}")
+            utils.logger.debug(f"{__name__}: Condensation mapping: {self._condensation.graph['mapping']}")
 
         # Conventions
         # self._condensation has int nodes 
@@ -142,7 +165,8 @@ class stDiGraph(AbstractSourceSinkGraph):
 
         self._condensation_expanded = stDAG(condensation_expanded)
 
-        utils.logger.debug(f"{__name__}: Condensation expanded graph: {self._condensation_expanded.edges()}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: Condensation expanded graph: {self._condensation_expanded.edges()}")
 
     def _build_condensation_with_parallel_edges(self):
         """Build a DAG where inter-SCC multiplicities are represented explicitly.
@@ -201,9 +225,10 @@ class stDiGraph(AbstractSourceSinkGraph):
                 self._parallel_first_to_second_edge[first_edge] = second_edge
 
         self._condensation_with_parallel_edges = stDAG(condensation_with_parallel_edges)
-        utils.logger.debug(
-            f"{__name__}: Condensation with parallel edges graph: {self._condensation_with_parallel_edges.edges()}"
-        )
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(
+                f"{__name__}: Condensation with parallel edges graph: {self._condensation_with_parallel_edges.edges()}"
+            )
 
     def _edge_to_condensation_expanded_edge(self, u, v) -> tuple:
         """
@@ -314,15 +339,19 @@ class stDiGraph(AbstractSourceSinkGraph):
                 then we remove the edge `(u,v)` from (a copy of) the member edges of the SCC in the condensation. 
                 If an SCC `v` has no more member edges left, we can also add the condensation edge `(v, v_expanded)` to
                 the list of edges to ignore when computing the width of the condensation.
+
+            Any iterable of edges is accepted; it is converted to a `frozenset` (so duplicates are counted once).
         """
 
+        edges_to_ignore = frozenset(edges_to_ignore or ())
+
         if subset_constraints is not None:
             # When constraints are provided, width is the constrained minimum walk cover size.
             from flowpaths.minpathcovercycles import MinPathCoverCycles
 
             edges_to_ignore_list = [
                 edge
-                for edge in set(edges_to_ignore or [])
+                for edge in edges_to_ignore
                 if isinstance(edge, tuple) and len(edge) == 2 and self.base_graph.has_edge(edge[0], edge[1])
             ]
 
@@ -342,7 +371,7 @@ class stDiGraph(AbstractSourceSinkGraph):
                 raise ValueError("Could not compute constrained width with MinPathCoverCycles.")
             return mpc_cycles_model.get_objective_value()
 
-        if self.condensation_width is not None and (edges_to_ignore is None or len(edges_to_ignore) == 0):
+        if self.condensation_width is not None and not edges_to_ignore:
             return self.condensation_width
 
         # We transform each edge in edges_to_ignore (which are edges of self)
@@ -350,9 +379,10 @@ class stDiGraph(AbstractSourceSinkGraph):
         edges_to_ignore_expanded = []
         member_edges = copy.deepcopy(self._condensation.graph['member_edges'])
         edge_multiplicity = copy.deepcopy(self._condensation.graph["edge_multiplicity"])
-        utils.logger.debug(f"{__name__}: edge_multiplicity for edges in the condensation: {edge_multiplicity}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: edge_multiplicity for edges in the condensation: {edge_multiplicity}")
 
-        for u, v in (edges_to_ignore or []):
+        for u, v in edges_to_ignore:
             # If (u,v) is an edge between different SCCs
             # Then the corresponding edge to ignore is between the two SCCs
             if not self.is_scc_edge(u, v):
@@ -377,17 +407,20 @@ class stDiGraph(AbstractSourceSinkGraph):
             else:
                 weight_function_condensation_expanded[(str(node), self._expanded(node))] = 1
 
-        utils.logger.debug(f"{__name__}: Edges to ignore in the expanded graph: {edges_to_ignore_expanded}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: Edges to ignore in the expanded graph: {edges_to_ignore_expanded}")
 
-        utils.logger.debug(f"{__name__}: Condensation expanded graph: {self._condensation_expanded.edges()}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: Condensation expanded graph: {self._condensation_expanded.edges()}")
         # width = self._condensation_expanded.get_width(edges_to_ignore=edges_to_ignore_expanded)
 
         width = self._condensation_expanded.compute_max_edge_antichain(get_antichain=False, weight_function=weight_function_condensation_expanded)
 
-        utils.logger.debug(f"{__name__}: weight_function_condensation_expanded: {weight_function_condensation_expanded}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: weight_function_condensation_expanded: {weight_function_condensation_expanded}")
         utils.logger.debug(f"{__name__}: Width of the condensation expanded graph: {width}")
 
-        if (edges_to_ignore is None or len(edges_to_ignore) == 0):
+        if not edges_to_ignore:
             self.condensation_width = width
 
         # DEBUG code
@@ -417,27 +450,53 @@ class stDiGraph(AbstractSourceSinkGraph):
 
         return self._condensation.graph['mapping'][u] == self._condensation.graph['mapping'][v]
 
+    def _get_scc_sizes(self) -> np.ndarray:
+        """
+        Returns an array indexed by SCC label, storing the number of edges inside each SCC.
+        """
+
+        if self._scc_sizes is None:
+            tails = np.repeat(np.arange(len(self._csr_nodes)), np.diff(self._csr_indptr))
+            tail_labels = self._scc_labels[tails]
+            internal = tail_labels == self._scc_labels[self._csr_indices]
+            self._scc_sizes = np.bincount(tail_labels[internal], minlength=self._condensation.number_of_nodes())
+
+        return self._scc_sizes
+
     def get_number_of_nontrivial_SCCs(self) -> int:
         """
         Returns the number of non-trivial SCCs (i.e. SCCs with at least one edge).
         """
 
-        return sum(1 for v in self._condensation.nodes() if len(self._condensation.graph['member_edges'][str(v)]) > 0)
+        return int(np.count_nonzero(self._get_scc_sizes()))
 
     def get_size_of_largest_SCC(self) -> int:
         """
         Returns the size of the largest SCC (in terms of number of edges).
         """
-        return max((len(self._condensation.graph['member_edges'][str(v)]) for v in self._condensation.nodes()), default=0)
+        return int(self._get_scc_sizes().max(initial=0))
     
     def get_avg_size_of_non_trivial_SCC(self) -> int:
         """
         Returns the average size (in terms of number of edges) of non-trivial SCCs (i.e. SCCs with at least one edge).
         """
-        sizes = [len(self._condensation.graph['member_edges'][str(v)]) for v in self._condensation.nodes() if len(self._condensation.graph['member_edges'][str(v)]) > 0]
-        return sum(sizes) // len(sizes) if sizes else 0
+        sizes = self._get_scc_sizes()
+        sizes = sizes[sizes > 0]
+        return int(sizes.sum()) // len(sizes) if len(sizes) > 0 else 0
 
     def get_longest_incompatible_sequences(self, sequences: list, large_constant: int = 0) -> list:
+        # Short-circuits, avoiding the min-flow on the whole condensation:
+        # without sequences (and without large_constant), the antichain carries no sequence at all,
+        # and a single non-empty sequence is trivially incompatible with itself only.
+        if large_constant == 0:
+            non_empty_sequences = [sequence for sequence in sequences if len(sequence) > 0]
+            if len(non_empty_sequences) == 0:
+                return []
+            if len(non_empty_sequences) == 1:
+                for u, v in non_empty_sequences[0]:
+                    self._edge_to_condensation_expanded_edge(u, v) # checks that the edges exist
+                return non_empty_sequences
+
         # We map the edges in sequences to edges in self._condensation_expanded
 
         sequence_function = {e: [] for e in self._condensation_expanded.edges} # edge in self._condensation_expanded -> list of ids of all sequences using that edge
@@ -472,14 +531,16 @@ class stDiGraph(AbstractSourceSinkGraph):
 
         weight_function = {edge: large_constant + sum(len(sequences[seq_idx]) for seq_idx in sequence_function[edge]) for edge in self._condensation_expanded.edges()}
 
-        utils.logger.debug(f"{__name__}: Weight function for incompatible sequences: {weight_function}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: Weight function for incompatible sequences: {weight_function}")
 
         _, antichain = self._condensation_expanded.compute_max_edge_antichain(
             get_antichain=True,
             weight_function=weight_function,
         )
 
-        utils.logger.debug(f"{__name__}: Antichain in the expanded graph: {antichain}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: Antichain in the expanded graph: {antichain}")
 
         incompatible_sequences = []
 
@@ -530,14 +591,16 @@ class stDiGraph(AbstractSourceSinkGraph):
             for edge in self._condensation_with_parallel_edges.edges()
         }
 
-        utils.logger.debug(f"{__name__}: Weight function for incompatible sequences (parallel edges): {weight_function}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: Weight function for incompatible sequences (parallel edges): {weight_function}")
 
         _, antichain = self._condensation_with_parallel_edges.compute_max_edge_antichain(
             get_antichain=True,
             weight_function=weight_function,
         )
 
-        utils.logger.debug(f"{__name__}: Antichain in the parallel-expanded graph: {antichain}")
+        if utils.logger.isEnabledFor(utils.logging.DEBUG):
+            utils.logger.debug(f"{__name__}: Antichain in the parallel-expanded graph: {antichain}")
 
         incompatible_sequences = []
         seq_idx_set = set()
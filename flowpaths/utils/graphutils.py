@@ -1,8 +1,14 @@
 from pathlib import Path
 import csv
+import os
+import functools
+import hashlib
+import pickle
+import re
 import platform
-from itertools import count
+from itertools import count, cycle, tee
 import networkx as nx
+import numpy as np
 import flowpaths.utils as utils
 # NOTE: Do NOT import flowpaths.stdigraph at module import time to avoid a circular
 # import chain: stdag -> graphutils -> stdigraph -> stdag. We instead lazily import
@@ -10,6 +16,16 @@ import flowpaths.utils as utils
 
 bigNumber = 1 << 32
 
+try:
+    from itertools import pairwise
+except ImportError:
+    # itertools.pairwise is new in Python 3.10
+    def pairwise(iterable):
+        """Return the consecutive pairs `(s0, s1), (s1, s2), ...` of `iterable`."""
+        a, b = tee(iterable)
+        next(b, None)
+        return zip(a, b)
+
 
 def _read_tsv_rows(file_path: Path) -> list:
     with file_path.open("r", newline="") as handle:
@@ -29,7 +45,7 @@ def _parse_path_simple_nodes(path_simple: str) -> list:
 
 
 def _nodes_to_edges(nodes: list) -> list:
-    return [(u, v) for u, v in zip(nodes, nodes[1:])]
+    return list(pairwise(nodes))
 
 
 def read_intron_graph(graph_dir) -> nx.DiGraph:
@@ -256,37 +272,14 @@ def fpid(G) -> str:
 
     return str(id(G))
 
-def read_graph(graph_raw) -> nx.DiGraph:
+def _parse_graph_header(graph_raw) -> tuple:
     """
-    Parse a single graph block from a list of lines.
-
-    Accepts one or more header lines at the beginning (each prefixed by '#'),
-    followed by a line containing the number of vertices (n), then any number
-    of edge lines of the form: "u v w" (whitespace-separated).
-
-    Subpath constraint lines:
-        Lines starting with "#S" define a (directed) subpath constraint as a
-        sequence of nodes: "#S n1 n2 n3 ...". For each such line we build the
-        list of consecutive edge tuples [(n1,n2), (n2,n3), ...] and append this
-        edge-list (the subpath) to G.graph["constraints"]. Duplicate filtering
-        is applied on the whole node sequence: if an identical sequence of
-        nodes has already appeared in a previous "#S" line, the entire subpath
-        line is ignored (its edges are not added again). Different subpaths may
-    share edges; they are kept as separate entries. After all graph edges
-    are parsed, every constraint edge is validated to ensure it exists in
-    the graph; a missing edge raises ValueError.
+    Parse the header of a single graph block (see `read_graph` for the format).
 
-    Example block:
-        # graph number = 1 name = foo
-        # any other header line
-        #S a b c d          (adds subpath [(a,b),(b,c),(c,d)])
-        #S b c e            (adds subpath [(b,c),(c,e)])
-        #S a b c d          (ignored: exact node sequence already seen)
-        5
-        a b 1.0
-        b c 2.5
-        c d 3.0
-        c e 4.0
+    Returns
+    -------
+    - tuple `(graph_id, constraint_subpaths, n, idx)`, where `n` is the number of vertices,
+        and `idx` is the index in `graph_raw` of the first line after the vertex-count line.
     """
 
     # Collect leading header lines (prefixed by '#') and parse constraint lines prefixed by '#S'
@@ -306,7 +299,7 @@ def read_graph(graph_raw) -> nx.DiGraph:
                 # Skip if this exact subpath sequence already processed
                 if seq_key not in subpaths_seen:
                     subpaths_seen.add(seq_key)
-                    edges_list = [(u, v) for u, v in zip(nodes_seq, nodes_seq[1:])]
+                    edges_list = list(pairwise(nodes_seq))
                     # Only append if there is at least one edge (>=2 nodes)
                     if edges_list:
                         constraint_subpaths.append(edges_list)
@@ -335,6 +328,44 @@ def read_graph(graph_raw) -> nx.DiGraph:
 
     idx += 1
 
+    return graph_id, constraint_subpaths, n, idx
+
+
+def read_graph(graph_raw) -> nx.DiGraph:
+    """
+    Parse a single graph block from a list of lines.
+
+    Accepts one or more header lines at the beginning (each prefixed by '#'),
+    followed by a line containing the number of vertices (n), then any number
+    of edge lines of the form: "u v w" (whitespace-separated).
+
+    Subpath constraint lines:
+        Lines starting with "#S" define a (directed) subpath constraint as a
+        sequence of nodes: "#S n1 n2 n3 ...". For each such line we build the
+        list of consecutive edge tuples [(n1,n2), (n2,n3), ...] and append this
+        edge-list (the subpath) to G.graph["constraints"]. Duplicate filtering
+        is applied on the whole node sequence: if an identical sequence of
+        nodes has already appeared in a previous "#S" line, the entire subpath
+        line is ignored (its edges are not added again). Different subpaths may
+    share edges; they are kept as separate entries. After all graph edges
+    are parsed, every constraint edge is validated to ensure it exists in
+    the graph; a missing edge raises ValueError.
+
+    Example block:
+        # graph number = 1 name = foo
+        # any other header line
+        #S a b c d          (adds subpath [(a,b),(b,c),(c,d)])
+        #S b c e            (adds subpath [(b,c),(c,e)])
+        #S a b c d          (ignored: exact node sequence already seen)
+        5
+        a b 1.0
+        b c 2.5
+        c d 3.0
+        c e 4.0
+    """
+
+    graph_id, constraint_subpaths, n, idx = _parse_graph_header(graph_raw)
+
     G = nx.DiGraph()
     G.graph["id"] = graph_id
     # Store (possibly empty) list of subpaths (each a list of edge tuples)
@@ -344,11 +375,13 @@ def read_graph(graph_raw) -> nx.DiGraph:
         utils.logger.info(f"Graph {graph_id} has 0 vertices.")
         return G
 
-    # Parse edges: skip blanks and comment/header lines defensively
+    # Parse edges: skip blanks and comment/header lines defensively.
+    # Every line is split once, and the edges are added to G in a single add_edges_from call.
+    edges = []
     for line in graph_raw[idx:]:
-        if not line.strip() or line.lstrip().startswith('#'):
-            continue
         elements = line.split()
+        if not elements or elements[0].startswith('#'):
+            continue
         if len(elements) != 3:
             utils.logger.error(f"{__name__}: Invalid edge format: {line.rstrip()}")
             raise ValueError(f"Invalid edge format: {line.rstrip()}")
@@ -358,7 +391,8 @@ def read_graph(graph_raw) -> nx.DiGraph:
         except ValueError:
             utils.logger.error(f"{__name__}: Invalid weight value in edge: {line.rstrip()}")
             raise
-        G.add_edge(u.strip(), v.strip(), flow=w)
+        edges.append((u, v, {"flow": w}))
+    G.add_edges_from(edges)
 
     # Validate that every constraint edge exists in the graph
     for subpath in constraint_subpaths:
@@ -392,7 +426,13 @@ def read_graphs(filename):
     with open(filename, "r") as f:
         lines = f.readlines()
 
-    graphs = []
+    return [read_graph(block) for block in _split_graph_blocks(lines)]
+
+
+def _split_graph_blocks(lines):
+    """
+    Yield the graph blocks (lists of lines) of a file in the format of `read_graphs`.
+    """
     n_lines = len(lines)
     i = 0
 
@@ -415,12 +455,194 @@ def read_graphs(filename):
         while j < n_lines and not lines[j].lstrip().startswith('#'):
             j += 1
 
-        graphs.append(read_graph(lines[start:j]))
+        yield lines[start:j]
         i = j
 
+
+def read_graphs_cached(filename, cache_dir=None) -> tuple:
+    """
+    Cached version of `read_graphs`, for scripts that parse the same file several times
+    (e.g. one model per test function).
+
+    The parsed graphs are cached per file (and per modification time of the file, so that an edited file
+    is parsed again), and returned as a tuple. The same graph objects are shared between all callers,
+    so they must not be modified; the models of this package do not modify their input graph.
+    Use `G.copy()` to get a private copy where modification is needed.
+
+    If `cache_dir` is given, the parsed graphs are also pickled in that directory, so that later runs
+    (other processes) load them instead of parsing the file again.
+    """
+    cache_dir = os.fspath(cache_dir) if cache_dir is not None else None
+    return _read_graphs_cached(os.path.abspath(filename), os.stat(filename).st_mtime_ns, cache_dir)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_graphs_cached(filename: str, mtime_ns: int, cache_dir: str = None) -> tuple:
+    if cache_dir is None:
+        return tuple(read_graphs(filename))
+
+    key = hashlib.sha1(f"{filename}:{mtime_ns}".encode()).hexdigest()
+    cache_file = Path(cache_dir) / f"{Path(filename).name}.{key}.pkl"
+    if cache_file.exists():
+        try:
+            with cache_file.open("rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            utils.logger.warning(f"{__name__}: Could not load the cached graphs {cache_file} ({e}), parsing {filename} again.")
+
+    graphs = tuple(read_graphs(filename))
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    # Written to a temporary file first, so that a concurrent reader never sees a partial file
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    with tmp_file.open("wb") as f:
+        pickle.dump(graphs, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
+
     return graphs
 
 
+class CSRGraph:
+    """
+    Flow graph stored in CSR (compressed sparse row) form, as produced by `read_graph_csr`.
+
+    Attributes
+    ----------
+    - `nodes` (list): the node names; node `i` of the arrays below is `nodes[i]`.
+    - `indptr`, `indices` (np.ndarray): the out-neighbors of node `i` are `indices[indptr[i]:indptr[i+1]]`.
+    - `flow` (np.ndarray): `flow[j]` is the flow value of the edge stored at position `j` of `indices`.
+    - `graph` (dict): the graph attributes, as in `read_graph` (`id`, `constraints`, `n`, `m`), except for
+        the width `w`, which is computed only by `to_networkx`.
+    """
+
+    def __init__(self, nodes: list, indptr: np.ndarray, indices: np.ndarray, flow: np.ndarray, graph: dict):
+        self.nodes = nodes
+        self.indptr = indptr
+        self.indices = indices
+        self.flow = flow
+        self.graph = graph
+
+    @classmethod
+    def from_networkx(cls, G: nx.DiGraph, flow_attr: str = "flow") -> "CSRGraph":
+        """
+        Build the `CSRGraph` of `G` in a single pass over its adjacency, in the node and edge order of `G`.
+
+        Edges without `flow_attr` get flow 0. The graph attributes are copied from `G.graph`, with `n` and `m` set.
+        """
+        nodes, indptr, indices = _csr_adjacency(G)
+        adj = G._adj
+        flow = np.fromiter(
+            (data.get(flow_attr, 0) for u in nodes for data in adj[u].values()),
+            dtype=np.float64,
+            count=len(indices),
+        )
+        graph = dict(G.graph)
+        graph["n"] = len(nodes)
+        graph["m"] = len(indices)
+
+        return cls(nodes=nodes, indptr=indptr, indices=indices, flow=flow, graph=graph)
+
+    def number_of_nodes(self) -> int:
+        return len(self.nodes)
+
+    def number_of_edges(self) -> int:
+        return len(self.indices)
+
+    def edge_tails(self) -> np.ndarray:
+        """Return the array of the tail (as node id) of every edge, aligned with `indices` and `flow`."""
+        return np.repeat(np.arange(len(self.nodes), dtype=np.int32), np.diff(self.indptr))
+
+    def to_networkx(self, flow_attr: str = "flow") -> nx.DiGraph:
+        """
+        Build the `nx.DiGraph` that `read_graph` would return for the same block, for code that needs NetworkX.
+        """
+        G = nx.DiGraph()
+        G.graph.update(self.graph)
+        G.add_nodes_from(self.nodes)
+        nodes = self.nodes
+        G.add_edges_from(
+            (nodes[u], nodes[v], {flow_attr: w})
+            for u, v, w in zip(self.edge_tails().tolist(), self.indices.tolist(), self.flow.tolist())
+        )
+        if len(nodes) > 0:
+            # Lazy import here to avoid circular import at module load time
+            from flowpaths import stdigraph as _stdigraph  # type: ignore
+            G.graph["w"] = _stdigraph.stDiGraph(G).get_width()
+        return G
+
+
+def read_graph_csr(graph_raw) -> CSRGraph:
+    """
+    Parse a single graph block (in the format of `read_graph`) directly into a `CSRGraph`,
+    without building an intermediate `nx.DiGraph`.
+
+    Nodes are numbered in order of first appearance in the edge lines (the same order as in the
+    graph returned by `read_graph`), and the edges of every node keep their order in the block.
+    """
+    graph_id, constraint_subpaths, n, idx = _parse_graph_header(graph_raw)
+    graph = {"id": graph_id, "constraints": constraint_subpaths}
+
+    node_index = {}
+    tails = []
+    heads = []
+    flows = []
+    if n == 0:
+        utils.logger.info(f"Graph {graph_id} has 0 vertices.")
+    else:
+        for line in graph_raw[idx:]:
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            elements = line.split()
+            if len(elements) != 3:
+                utils.logger.error(f"{__name__}: Invalid edge format: {line.rstrip()}")
+                raise ValueError(f"Invalid edge format: {line.rstrip()}")
+            u, v, w_str = elements
+            try:
+                flows.append(float(w_str))
+            except ValueError:
+                utils.logger.error(f"{__name__}: Invalid weight value in edge: {line.rstrip()}")
+                raise
+            tails.append(node_index.setdefault(u, len(node_index)))
+            heads.append(node_index.setdefault(v, len(node_index)))
+
+    num_nodes = len(node_index)
+    tails = np.array(tails, dtype=np.int32)
+    # A stable sort keeps the order of the edges of every node
+    order = np.argsort(tails, kind="stable")
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(tails, minlength=num_nodes))
+    indices = np.array(heads, dtype=np.int32)[order]
+    flow = np.array(flows, dtype=np.float64)[order]
+
+    if len(indices) > 0:
+        keys = tails[order].astype(np.int64) * max(num_nodes, 1) + indices
+        if len(np.unique(keys)) != len(keys):
+            utils.logger.error(f"{__name__}: Graph {graph_id} has parallel edges, which are not supported in CSR form.")
+            raise ValueError(f"Graph {graph_id} has parallel edges, which are not supported in CSR form.")
+
+    # Validate that every constraint edge exists in the graph
+    for subpath in constraint_subpaths:
+        for (u, v) in subpath:
+            if u not in node_index or v not in node_index or \
+                    node_index[v] not in indices[indptr[node_index[u]]:indptr[node_index[u] + 1]]:
+                utils.logger.error(f"{__name__}: Constraint edge ({u}, {v}) not found in graph {graph_id} edges.")
+                raise ValueError(f"Constraint edge ({u}, {v}) not found in graph edges.")
+
+    graph["n"] = num_nodes
+    graph["m"] = len(indices)
+
+    return CSRGraph(nodes=list(node_index), indptr=indptr, indices=indices, flow=flow, graph=graph)
+
+
+def read_graphs_csr(filename) -> list:
+    """
+    Read one or more graphs from a file (in the format of `read_graphs`) as a list of `CSRGraph`.
+    """
+    with open(filename, "r") as f:
+        lines = f.readlines()
+
+    return [read_graph_csr(block) for block in _split_graph_blocks(lines)]
+
+
 def read_ngraph(graph_raw) -> nx.DiGraph:
     """
     Parse a single node-weighted ngraph block from a list of lines.
@@ -660,6 +882,207 @@ def min_cost_flow(G: nx.DiGraph, s, t, demands_attr = 'l', capacities_attr = 'u'
         return None, None
 
 
+def solution_values_to_list(values: dict, k: int, value_type: type) -> list:
+    """
+    Returns the list `[values[0], ..., values[k-1]]` of solver values (e.g. path weights), rounded to the nearest
+    integer if `value_type` is `int`, and converted to float otherwise.
+
+    The values are collected into a numpy array with one `np.fromiter` pass, and rounded with `np.rint`
+    (which, like `round`, rounds halves to even), instead of one Python `round`/`float` call per value.
+    """
+    array = np.fromiter((values[i] for i in range(k)), dtype=np.float64, count=k)
+    if value_type == int:
+        return np.rint(array).astype(np.int64).tolist()
+    return array.tolist()
+
+
+def min_flow_value_scipy(n: int, tails: np.ndarray, heads: np.ndarray, demands: np.ndarray, s: int, t: int):
+    """
+    Computes the value of a minimum `s`-`t` flow in a DAG with `n` nodes (numbered `0 .. n-1`),
+    where edge `i` goes from `tails[i]` to `heads[i]`, has lower bound (demand) `demands[i]`, and no upper bound.
+
+    This uses `scipy.sparse.csgraph.maximum_flow` twice: first to find a feasible flow (with the standard
+    super-source / super-sink reduction of the lower bounds, and a `t`-`s` circulation edge), and then to
+    push back as much flow as possible from `t` to `s` in the residual graph.
+
+    Returns
+    -------
+    - The minimum flow value, or `None` if SciPy is not available, the demands are not integral or too large
+        for SciPy's 32-bit capacities, or no feasible flow was found. In that case, use `min_cost_flow`.
+    """
+    try:
+        from scipy.sparse import coo_array
+        from scipy.sparse.csgraph import maximum_flow
+    except ImportError:
+        utils.logger.debug(f"{__name__}: scipy not found, cannot use min_flow_value_scipy.")
+        return None
+
+    demands = np.asarray(demands)
+    if not np.all(np.equal(np.mod(demands, 1), 0)) or np.any(demands < 0):
+        return None
+    demands = demands.astype(np.int64)
+
+    total = int(demands.sum())
+    if total == 0:
+        return 0
+    # In a DAG, no edge of a minimum flow carries more than the flow value, which is at most `total`.
+    # So `total` acts as the infinite capacity. The factor 2 keeps sums of capacities within int32.
+    if total >= np.iinfo(np.int32).max // 2:
+        return None
+    # The t -> s circulation edge must not share its node pair with an original edge.
+    if np.any((tails == t) & (heads == s)) or np.any((tails == s) & (heads == t)):
+        return None
+
+    # Step 1: feasible flow. Node n is the super-source, node n+1 the super-sink.
+    excess = np.bincount(heads, weights=demands, minlength=n) - np.bincount(tails, weights=demands, minlength=n)
+    excess = excess.astype(np.int64)
+    pos = np.flatnonzero(excess > 0)
+    neg = np.flatnonzero(excess < 0)
+
+    rows = np.concatenate((tails, [t], np.full(len(pos), n), neg))
+    cols = np.concatenate((heads, [s], pos, np.full(len(neg), n + 1)))
+    data = np.concatenate((total - demands, [total], excess[pos], -excess[neg]))
+    capacities = coo_array((data.astype(np.int32), (rows, cols)), shape=(n + 2, n + 2)).tocsr()
+    capacities.eliminate_zeros()
+
+    result = maximum_flow(capacities, n, n + 1)
+    if result.flow_value != int(excess[pos].sum()):
+        return None
+    flow = result.flow.tocsr()
+    flow_value = int(flow[t, s])
+    edge_flow = np.asarray(flow[tails, heads]).ravel().astype(np.int64) + demands
+
+    # Step 2: reduce the flow by a maximum t -> s flow in the residual graph.
+    rows = np.concatenate((tails, heads))
+    cols = np.concatenate((heads, tails))
+    data = np.concatenate((total - edge_flow, edge_flow - demands))
+    residual = coo_array((data.astype(np.int32), (rows, cols)), shape=(n, n)).tocsr()
+    residual.eliminate_zeros()
+
+    return flow_value - int(maximum_flow(residual, t, s).flow_value)
+
+
+def _csr_adjacency(G: nx.DiGraph) -> tuple:
+    """
+    Build a CSR (compressed sparse row) adjacency of `G` in a single pass over `G._adj`.
+
+    Returns
+    -------
+    - tuple `(nodes, indptr, indices)`, where `nodes` is the list of nodes of `G` (position = integer id),
+        and the out-neighbors of `nodes[i]` are `indices[indptr[i]:indptr[i+1]]`.
+    """
+    nodes = list(G.nodes())
+    node_index = {node: i for i, node in enumerate(nodes)}
+    adj = G._adj
+
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.fromiter((len(adj[u]) for u in nodes), dtype=np.int64, count=len(nodes)))
+    indices = np.fromiter(
+        (node_index[v] for u in nodes for v in adj[u]),
+        dtype=np.int32,
+        count=int(indptr[-1]),
+    )
+
+    return nodes, indptr, indices
+
+
+def _tarjan_scc_labels(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Single-pass iterative Tarjan SCC labelling on a CSR adjacency (see `_csr_adjacency`).
+
+    Every arc is scanned exactly once. Instead of successor iterators, the work stack stores
+    `(v, pos)` pairs, where `pos` is the next position to scan in `indices[indptr[v]:indptr[v+1]]`,
+    so only nodes currently on the visit stack hold any traversal state.
+
+    Returns
+    -------
+    - `labels`, where `labels[i]` is the SCC id of node `i`. SCCs are numbered in reverse topological order.
+    """
+    n = len(indptr) - 1
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+
+    index = [-1] * n
+    lowlink = [0] * n
+    on_stack = [False] * n
+    labels = [-1] * n
+    stack = []
+    counter = 0
+    label = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr[root])]
+
+        while work:
+            v, pos = work[-1]
+            end = indptr[v + 1]
+            while pos < end:
+                w = indices[pos]
+                pos += 1
+                if index[w] == -1:
+                    # Descend into w, remembering where to resume the scan of v
+                    work[-1] = (v, pos)
+                    index[w] = lowlink[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, indptr[w]))
+                    break
+                if on_stack[w] and index[w] < lowlink[v]:
+                    lowlink[v] = index[w]
+            else:
+                # All successors of v are scanned
+                work.pop()
+                if lowlink[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        labels[w] = label
+                        if w == v:
+                            break
+                    label += 1
+                if work:
+                    u = work[-1][0]
+                    if lowlink[v] < lowlink[u]:
+                        lowlink[u] = lowlink[v]
+
+    return np.array(labels, dtype=np.int32)
+
+
+def _scc_labels(G: nx.DiGraph) -> tuple:
+    """
+    Label every node of `G` with the id of its strongly connected component (SCC).
+
+    If SciPy is available, the SCCs are computed by `scipy.sparse.csgraph.connected_components`
+    on the CSR adjacency of `G` (see `_csr_adjacency`). Otherwise, we fall back to `_tarjan_scc_labels`.
+
+    Returns
+    -------
+    - tuple `(nodes, indptr, indices, labels)`, where `nodes`, `indptr`, `indices` are as in `_csr_adjacency`,
+        and `labels[i]` is the SCC id (in `0 .. number of SCCs - 1`) of `nodes[i]`.
+    """
+    nodes, indptr, indices = _csr_adjacency(G)
+
+    try:
+        from scipy.sparse import csr_array
+        from scipy.sparse.csgraph import connected_components
+    except ImportError:
+        utils.logger.debug(f"{__name__}: scipy not found, computing SCCs with single-pass Tarjan.")
+        return nodes, indptr, indices, _tarjan_scc_labels(indptr, indices)
+
+    n = len(nodes)
+    csr = csr_array((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n))
+    _, labels = connected_components(csr, directed=True, connection="strong", return_labels=True)
+
+    return nodes, indptr, indices, labels
+
+
 def max_bottleneck_path(G: nx.DiGraph, flow_attr) -> tuple:
     """
     Computes the maximum bottleneck path in a directed graph.
@@ -999,29 +1422,25 @@ def draw(
                 "rgba(255, 193, 37, 0.4)",   # goldenrod 
             ]
             
-            # Build links with path information to maintain consistent ordering at nodes
-            # Structure: list of (source, target, weight, color, path_idx)
-            links_with_metadata = []
+            # Build the links directly as one list per field, path after path. Links are thus
+            # grouped by path index, which keeps a consistent ordering throughout the diagram:
+            # edges from the same path appear in the same relative order at all nodes.
+            link_sources = []
+            link_targets = []
+            link_values = []
+            link_colors = []
             
             for path_idx, path in enumerate(paths):
                 path_weight = weights[path_idx] if path_idx < len(weights) else 1
                 path_color = colors[path_idx % len(colors)]
+                indices = [node_dict[node] for node in path]
+                num_edges = len(path) - 1
                 
                 # Add each edge in the path
-                for i in range(len(path) - 1):
-                    source = node_dict[path[i]]
-                    target = node_dict[path[i + 1]]
-                    links_with_metadata.append((source, target, path_weight, path_color, path_idx))
-            
-            # Sort links by path index to maintain consistent ordering throughout the diagram
-            # This ensures edges from the same path appear in the same relative order at all nodes
-            links_with_metadata.sort(key=lambda x: x[4])
-            
-            # Extract sorted components
-            link_sources = [link[0] for link in links_with_metadata]
-            link_targets = [link[1] for link in links_with_metadata]
-            link_values = [link[2] for link in links_with_metadata]
-            link_colors = [link[3] for link in links_with_metadata]
+                link_sources.extend(indices[:-1])
+                link_targets.extend(indices[1:])
+                link_values.extend([path_weight] * num_edges)
+                link_colors.extend([path_color] * num_edges)
             
             # Create Sankey diagram
             link_dict = dict(
@@ -1188,6 +1607,13 @@ def draw(
 
             dot.attr('node', fontname='Arial')
 
+            # The drawing options used for every node / edge are looked up once
+            show_node_weights = draw_options.get("show_node_weights", False) and flow_attr is not None
+            show_edge_weights = draw_options.get("show_edge_weights", False)
+            show_path_weight_on_first_edge = draw_options.get("show_path_weight_on_first_edge", True)
+            show_path_weights = draw_options.get("show_path_weights", True)
+            path_penwidth = str(draw_options.get("pathwidth", 3.0))
+
             if draw_options.get("show_graph_edges", True):
                 # drawing nodes
                 for node in G.nodes():
@@ -1203,7 +1629,7 @@ def draw(
                             color = "red"
                             penwidth = "2.0"
 
-                    if draw_options.get("show_node_weights", False) and flow_attr is not None and flow_attr in G.nodes[node]:
+                    if show_node_weights and flow_attr in G.nodes[node]:
                         label = f"{G.nodes[node][flow_attr]}\\n{node}" if style != "points" else ""
                         dot.node(
                             name=str(node),
@@ -1221,7 +1647,7 @@ def draw(
 
                 # drawing edges
                 for u, v, data in G.edges(data=True):
-                    if draw_options.get("show_edge_weights", False):
+                    if show_edge_weights:
                         dot.edge(
                             tail_name=str(u), 
                             head_name=str(v), 
@@ -1244,27 +1670,28 @@ def draw(
 
             for index, path in enumerate(paths):
                 pathColor = colors[index % len(colors)]
+                path_label = str(weights[index]) if len(weights) > 0 else ""
+                names = [str(node) for node in path]
                 for i in range(len(path) - 1):
-                    if i == 0 and draw_options.get("show_path_weight_on_first_edge", True) or \
-                        draw_options.get("show_path_weights", True):
+                    if i == 0 and show_path_weight_on_first_edge or show_path_weights:
                         dot.edge(
-                            str(path[i]),
-                            str(path[i + 1]),
+                            names[i],
+                            names[i + 1],
                             fontcolor=pathColor,
                             color=pathColor,
-                            penwidth=str(draw_options.get("pathwidth", 3.0)),
-                            label=str(weights[index]) if len(weights) > 0 else "",
+                            penwidth=path_penwidth,
+                            label=path_label,
                             fontname="Arial",
                         )
                     else:
                         dot.edge(
-                            str(path[i]),
-                            str(path[i + 1]),
+                            names[i],
+                            names[i + 1],
                             color=pathColor,
-                            penwidth=str(draw_options.get("pathwidth", 3.0)),
+                            penwidth=path_penwidth,
                             )
                 if len(path) == 1:
-                    dot.node(str(path[0]), color=pathColor, penwidth=str(draw_options.get("pathwidth", 3.0)))        
+                    dot.node(names[0], color=pathColor, penwidth=path_penwidth)        
                 
             # Process subpath constraints: auto-detect node-based vs edge-based
             # Build mapping of nodes to constraint colors for node-based constraints
@@ -1311,7 +1738,7 @@ def draw(
                     # Re-draw the node with the constraint color as fillcolor
                     # Preserve node label (including weights) and styling
                     label = str(node) if style != "points" else ""
-                    if draw_options.get("show_node_weights", False) and flow_attr is not None and flow_attr in G.nodes[node]:
+                    if show_node_weights and flow_attr in G.nodes[node]:
                         label = f"{G.nodes[node][flow_attr]}\\n{node}" if style != "points" else ""
                     
                     # Determine the style based on the drawing style
@@ -1419,10 +1846,38 @@ def get_subgraph_between_topological_nodes(graph: nx.DiGraph, topo_order: list,
 
     return subgraph
 
+# A node statement with a "x,y" position. Edge positions are splines ("e,x,y x,y ...")
+# and thus do not match.
+_DOT_NODE_POS_RE = re.compile(rb'(?:"((?:[^"\\]|\\.)*)"|([\w.]+))\s*\[[^\]]*?\bpos="([-+\d.eE]+),([-+\d.eE]+)!?"')
+
+def _dot_node_positions(dot_data: bytes) -> dict:
+    """
+    Return a dictionary mapping each node id of the laid out DOT graph `dot_data` to its `(x, y)` position.
+    """
+    matches = _DOT_NODE_POS_RE.findall(dot_data)
+    if not matches:
+        return {}
+
+    names = [(quoted or plain).decode() for quoted, plain, _, _ in matches]
+    coords = np.array([(x, y) for _, _, x, y in matches], dtype=np.float64)
+
+    return dict(zip(names, map(tuple, coords.tolist())))
+
+# matplotlib is not a dependency of flowpaths and is slow to import, so it is imported
+# on the first call of `_lazy_plt`, and the module is kept here for later calls
+_plt = None
+
+def _lazy_plt():
+    global _plt
+    if _plt is None:
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
+
 def draw_WIP(graph: nx.DiGraph, paths: list, weights: list, id:str):
 
-    import matplotlib.pyplot as plt
-    import pydot
+    # pydot is imported by networkx in `to_pydot`
+    plt = _lazy_plt()
 
     pydot_graph = nx.drawing.nx_pydot.to_pydot(graph)
     pydot_graph.set_graph_defaults(rankdir='LR')
@@ -1430,19 +1885,9 @@ def draw_WIP(graph: nx.DiGraph, paths: list, weights: list, id:str):
     
     print("Hello")
     pydot_graph.get_node("a")[0].get_pos()
-    pydot_graph.write_dot(f"{id}.dot")
     
-    # Read the dot file and extract node positions
-    pos = {}
-    with open(f"{id}.dot", "r") as file:
-        lines = file.readlines()
-        for i, line in enumerate(lines):
-            if "pos=" in line and "->" not in lines[i - 1]:
-                node_id = lines[i - 1].split("[")[0].strip()
-                print("node_id", node_id)
-                pos_str = line.split("pos=")[1].split('"')[1]
-                x, y = map(float, pos_str.split(","))
-                pos[node_id] = (x, y)
+    # Lay out the graph with dot, piping the DOT output back (no temporary file), and extract node positions
+    pos = _dot_node_positions(pydot_graph.create(prog="dot", format="dot"))
     
     print(pos)
     
@@ -1478,26 +1923,26 @@ def draw_WIP(graph: nx.DiGraph, paths: list, weights: list, id:str):
     #     plt.arrow(x1, y1, x2 - x1, y2 - y1, head_width=1, head_length=1, fc='tab:gray', ec='tab:gray')
 
     # Draw paths
-    # Sort paths by weight in decreasing order
-    sorted_paths = sorted(zip(paths, weights), key=lambda x: x[1], reverse=True)
-    total_weight = sum(weights)
+    # Sort paths by weight in decreasing order (stable on -w, so that paths of equal weight keep their order)
+    w = np.asarray(weights, dtype=np.float64)
+    order = np.argsort(-w, kind="stable")
+    total_weight = w.sum()
     colors = ["tab:red", "tab:green", "tab:blue", "tab:orange", "tab:purple", "tab:brown"]
     separator = 2  # Smaller separator between paths
     previous_shift = basic_line_width  # Initial shift up
-    linewidth = [0 for i in range(len(sorted_paths))]
+    # Set linewidth proportional to the path weight as a percentage of the total weight
+    linewidth = np.maximum(2, w[order] / total_weight * 30).tolist()
+
+    # Positions as one array, so that the coordinates of a path are a single gather
+    node_idx = {node: i for i, node in enumerate(pos)}
+    pos_arr = np.array(list(pos.values()), dtype=np.float64).reshape(-1, 2)
 
-    for i, (path, weight) in enumerate(sorted_paths):
-        path_edges = list(zip(path[:-1], path[1:]))
-        x_coords = []
-        y_coords = []
-        linewidth[i] = max(2,(weight / total_weight) * 30)  # Set linewidth proportional to the path weight as a percentage of the total weight
+    for i, (path_index, color) in enumerate(zip(order.tolist(), cycle(colors))):
+        path = paths[path_index]
         print("linewidth", linewidth[i])
-        for (u, v) in path_edges:
-            x1, y1 = pos[str(u)]
-            x2, y2 = pos[str(v)]
-            x_coords.extend([x1, x2])
-            y_coords.extend([y1, y2])
-        plt.plot(x_coords, y_coords, color=colors[i % len(colors)], alpha=0.35, linestyle='-', linewidth=linewidth[i])
+        idx = np.fromiter((node_idx[str(node)] for node in path), dtype=np.intp, count=len(path))
+        xy = pos_arr[idx]
+        plt.plot(xy[:, 0], xy[:, 1], color=color, alpha=0.35, linestyle='-', linewidth=linewidth[i])
         print("previous_shift", previous_shift)
         previous_shift += linewidth[i]/8 + separator  # Shift up for the next path
 
@@ -0,0 +1,57 @@
+import functools
+import importlib
+
+# The numeric kernels of the package (see `kernel`) run as plain Python by default: importing numba and loading
+# the compiled kernels costs about half a second in every process, more than the kernels take on graphs of the usual size.
+# On graphs with at least this many edges they run compiled by numba, if it is installed (`pip install flowpaths[numba]`).
+# This is about where the safe sequences of random and cyclic test graphs are computed faster with numba than without.
+numba_min_edges = 20000
+
+# The numba module, once imported (False if it is not installed)
+_numba = None
+
+
+def _import_numba():
+    global _numba
+    if _numba is None:
+        try:
+            _numba = importlib.import_module("numba")
+        except ImportError:
+            _numba = False
+    return _numba
+
+
+def use_numba(num_edges: int) -> bool:
+    """
+    Returns `True` if the kernels should run compiled by numba on a graph with `num_edges` edges,
+    that is, if `num_edges` is at least `numba_min_edges` and numba is installed (which is imported only then).
+    """
+    return num_edges >= numba_min_edges and _import_numba() is not False
+
+
+class _Kernel:
+    def __init__(self, func):
+        functools.update_wrapper(self, func)
+        self.py_func = func
+        self._compiled = None
+
+    def __call__(self, *args):
+        return self.py_func(*args)
+
+    def compiled(self):
+        """
+        Returns the kernel compiled by numba (on the first call). Call it only if `use_numba` is `True`.
+        """
+        if self._compiled is None:
+            self._compiled = _import_numba().njit(cache=True, boundscheck=False, nogil=True)(self.py_func)
+        return self._compiled
+
+
+def kernel(func):
+    """
+    Decorator for the numeric kernels, which are written so that they run both as plain Python (on lists, which are
+    faster than numpy arrays for element-wise access) and compiled by numba (on numpy arrays).
+    Calling the kernel runs the plain Python function, and `kernel.compiled()` returns it compiled by numba.
+    A kernel cannot call another kernel, since only the outer one would be compiled.
+    """
+    return _Kernel(func)
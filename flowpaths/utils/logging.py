@@ -1,4 +1,7 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 
 # Expose logging levels through fp.utils
 DEBUG = logging.DEBUG
@@ -11,11 +14,24 @@ CRITICAL = logging.CRITICAL
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())  # Prevent issues if no handler is set
 
+# The listener writing the records queued by configure_logging(..., log_in_background=True), if any
+_queue_listener = None
+
+def _stop_queue_listener():
+    # Writes the records still in the queue, and stops the listener thread
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+atexit.register(_stop_queue_listener)
+
 def configure_logging(
         level=logging.DEBUG, 
         log_to_console=True, 
         log_file=None, 
-        file_mode="w"  # "a" for append, "w" for overwrite
+        file_mode="w",  # "a" for append, "w" for overwrite
+        log_in_background=False,
     ):
     """
     Configures logging for the flowpaths package.
@@ -23,9 +39,10 @@ def configure_logging(
     Parameters:
     -----------
 
-    - `level: int`, optional
+    - `level: int | str`, optional
         
-        Logging level (e.g., fp.utils.logging.DEBUG, fp.utils.logging.INFO). 
+        Logging level (e.g., fp.utils.logging.DEBUG, fp.utils.logging.INFO), or its name (e.g. "DEBUG", as in the
+        `FP_LOG_LEVEL` environment variable read by the examples). 
         Default is fp.utils.logging.DEBUG.
 
     - `log_to_console: bool`, optional
@@ -42,8 +59,16 @@ def configure_logging(
         
         Mode for the log file. "a" (append) or "w" (overwrite). Default is "w".
 
+    - `log_in_background: bool`, optional
+
+        Whether the records are written to the console and to the file by a background thread. Default is False.
+        If True, logging calls only put the records in a queue, so they do not wait for the console or the file 
+        (useful with the DEBUG level, which logs a lot). The queued records are written at the latest when 
+        the program exits, or when `configure_logging` is called again.
+
     """
     # Remove existing handlers to avoid duplicate logs
+    _stop_queue_listener()
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
 
@@ -53,12 +78,14 @@ def configure_logging(
     # Define a formatter
     formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
+    handlers = []
+
     # Add console handler if enabled
     if log_to_console:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
     if file_mode not in ["a", "w"]:
         raise ValueError("file_mode must be either 'a' (append) or 'w' (overwrite)")
@@ -68,7 +95,17 @@ def configure_logging(
         file_handler = logging.FileHandler(log_file, mode=file_mode)  # Use file_mode
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    if log_in_background and handlers:
+        global _queue_listener
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
-    logger.info("Logging initialized: level=%s, console=%s, file=%s, mode=%s", 
-                level, log_to_console, log_file, file_mode)
\ No newline at end of file
+    logger.info("Logging initialized: level=%s, console=%s, file=%s, mode=%s, background=%s", 
+                level, log_to_console, log_file, file_mode, log_in_background)
\ No newline at end of file
@@ -2,6 +2,7 @@ import flowpaths.stdag as stdag
 import networkx as nx
 from collections import deque 
 import flowpaths.utils as utils
+import flowpaths.utils.graphutils as gu
 
 def compute_inexact_flow_decomp_safe_paths(
     G: nx.DiGraph, 
@@ -61,7 +62,7 @@ def compute_inexact_flow_decomp_safe_paths(
 
     # Check the necessary constraints
     for path in decomp_paths:
-        for u, v in zip(path, path[1:]):
+        for u, v in gu.pairwise(path):
             for flow_attr in [lowerbound_attr, upperbound_attr]:
                 if flow_attr not in G.edges[u, v]:
                     utils.logger.error(
@@ -2,122 +2,256 @@ import flowpaths.stdigraph as stdigraph
 import flowpaths.stdag as stdag
 import flowpaths.abstractsourcesinkgraph as abssg
 import flowpaths.utils.dominators as dominators
-from queue import Queue
-
-def find_path(adj_dict, s, t):
-    """Find a path from s to t using DFS."""
-    def dfs_path(node, path: list, visited: set):
-        if node == t:
-            return True
-        visited.add(node)
-        for neighbor in adj_dict[node]:
-            if neighbor not in visited:
-                path.append(neighbor)
-                if dfs_path(neighbor, path, visited):
-                    return True
-                path.pop()  # Backtrack if this path doesn't lead to t
-        return False
-    
-    path = [s]
-    visited = set()
-    dfs_path(s, path, visited)
-    return path
-
-def find_idom(adj_dict, s, t) -> list:
-    
-    # find arbitrary s-t path p
-    p = find_path(adj_dict, s, t)
-
-    # add reversed path to G
-    # and remove the original edges of the path
-    for i in range(len(p)-1):
-        adj_dict[p[i]].remove(p[i+1])  # remove original edges
-        adj_dict[p[i+1]].append(p[i])
-
-    n            = len(adj_dict)
-    i            = 1
-    component = dict()  # [0] * n
-    for v in adj_dict.keys():
-        component[v] = 0
-    q            = Queue(maxsize = n+1)
-    component[s] = 1
-    first_node   = 0
-    first_bridge = None
-    q.put(s)
-
-    while component[t]==0: #do while :(
-
-        if i!=1:
-            #find first node u of P with component[u]=0. all in all we pay |P| time for this
-            while component[p[first_node]] != 0:
-                first_node += 1
-
-            first_bridge = ( p[first_node-1] ,p[first_node] )
-            break
-
-        while not q.empty():
-            u = q.get()
-            for v in adj_dict[u]:
-                if component[v]==0:
-                    q.put(v)
-                    component[v]=i
-        i = i+1
-
-    #recover original adjacency relation
-    for i in range(len(p)-1):
-        u,v = p[i],p[i+1]
-        adj_dict[v].pop()      #remove reversed edges
-        adj_dict[u].append(v)  #reinsert removed edges
-
-    return first_bridge
-
-def maximal_safe_sequences_via_dominators(G : abssg.AbstractSourceSinkGraph, X = set()) -> list :
-
-    if X == None or len(X) == 0:
-        return []
+import flowpaths.utils.graphutils as graphutils
+import flowpaths.utils.jit as jit
+import numpy as np
+from collections import OrderedDict
 
-    s_idoms = dict()
-    t_idoms = dict()
 
-    adj_dict = {u: list(G.successors(u)) for u in G.nodes()}
-    adj_dict_rev = {u: list(G.predecessors(u)) for u in G.nodes()}
+def _first_bridge_arrays(G: abssg.AbstractSourceSinkGraph) -> tuple:
+    """
+    For every edge `(u,v)` of `G`, computes the first bridge from `u` back to `G.source`,
+    and from `v` to `G.sink`, for all nodes at once.
 
-    for (u,v) in G.edges:
+    The first bridge from `G.source` to `u` is the immediate arc dominator of `u`, so all of them are
+    obtained from a single dominator tree computation (`dominators.immediate_arc_dominators`), and
+    those towards `G.sink` from the dominator tree of the reverse graph rooted at `G.sink`.
 
-        s_idom = find_idom(adj_dict_rev, u, G.source)
-        t_idom = find_idom(adj_dict    , v,   G.sink)
-        s_idoms[(u,v)] = tuple(reversed(s_idom)) if s_idom != None else G.source
-        t_idoms[(u,v)] = t_idom                  if t_idom != None else G.sink
+    Returns
+    -------
+    - tuple `(s_par, t_par)` of integer arrays, where `s_par[i]` (resp. `t_par[i]`) is the position in `G.edges()` of the
+        first bridge of the `i`-th edge of `G.edges()` towards `G.source` (resp. `G.sink`), or `-1` if there is none.
+        These are the parents of the edges in the arc dominator trees rooted at `G.source` and `G.sink`.
+    """
+    # The edges of the CSR adjacency are in the same order as G.edges()
+    nodes, indptr, indices = graphutils._csr_adjacency(G)
+    n = len(nodes)
+    source = sink = -1
+    for i, node in enumerate(nodes):
+        if node == G.source:
+            source = i
+        elif node == G.sink:
+            sink = i
 
-    T_s = dominators.Arc_Dominator_Tree(G.number_of_nodes(), G.source, s_idoms, G.edges, X, G.id+str("_s-domtree"))
-    T_t = dominators.Arc_Dominator_Tree(G.number_of_nodes(), G.sink  , t_idoms, G.edges, X, G.id+str("_t-domtree"))
+    tails = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    heads = indices.astype(np.int64)
 
-    leaves_s_X = [ node for node,children in T_s.children_X.items() if len(children)==0 ] #those nodes in X that do not s-dominate other nodes with respect to X
+    s_arc = dominators.immediate_arc_dominators(n, tails, heads, source)
+    # in the reverse graph the edge i goes from heads[i] to tails[i], so the positions of the edges are the same as in G
+    t_arc = dominators.immediate_arc_dominators(n, heads, tails, sink)
 
-    cores = []
-    for leaf in leaves_s_X: # O(m): the paths are unitary, so no node can belong to two distinct s- (or t-) unitary paths
-        s_unitary_path = T_s.find_unitary_path_X(leaf,   "up")
-        t_unitary_path = T_t.find_unitary_path_X(leaf, "down")
-        
-        if len(t_unitary_path) > len(s_unitary_path):
-            continue
+    return s_arc[tails], t_arc[heads]
+
+
+@jit.kernel
+def _restrict_to_X(par, in_X):
+    """
+    Restricts the arc dominator tree given by `par` (the parent of every edge, with the root as `len(par)`)
+    to the edges in `X` (those `i` with `in_X[i]`).
+
+    Returns `(par_X, num_children_X, child_X)`, where `par_X[i]` is the closest proper ancestor of `i` in `X` (or the root),
+    `num_children_X[j]` is the number of edges of `X` with `par_X` equal to `j` (the root included), and `child_X[j]` one of them.
+    """
+    m = len(par)
+    # closest[i]: the closest ancestor of i in X (i itself included), or the root; -1 if not yet known
+    closest = np.full(m + 1, -1, np.int64)
+    closest[m] = m
+    path = np.empty(m + 1, np.int64)
+    for i in range(m):
+        # Go up until an edge whose closest ancestor in X is known, then set it for the edges on the way back
+        length = 0
+        x = i
+        while closest[x] == -1:
+            path[length] = x
+            length += 1
+            x = par[x]
+        value = closest[x]
+        for pos in range(length - 1, -1, -1):
+            y = path[pos]
+            if in_X[y]:
+                value = y
+            closest[y] = value
+
+    par_X = np.full(m, m, np.int64)
+    num_children_X = np.zeros(m + 1, np.int64)
+    child_X = np.full(m + 1, -1, np.int64)
+    for i in range(m):
+        if in_X[i]:
+            par_X[i] = closest[par[i]]
+            num_children_X[par_X[i]] += 1
+            child_X[par_X[i]] = i
+
+    return par_X, num_children_X, child_X
+
+
+@jit.kernel
+def _safe_sequences_from_arc_dominators(s_par, t_par, in_X, s_par_X, s_num_children_X, t_num_children_X, t_child_X):
+    """
+    The maximal safe sequences (see `_maximal_safe_sequences_via_dominators`) from the arc dominator trees `s_par` and `t_par`
+    (with the root as `len(s_par)`), the edges of `X` (those `i` with `in_X[i]`), and the restrictions of the trees to `X`
+    (see `_restrict_to_X`).
+
+    Returns `(flat, offsets)`, where the `k`-th safe sequence is made of the edges `flat[offsets[k]:offsets[k+1]]`.
+    """
+    m = len(s_par)
 
-        i=0
+    cores = np.empty(m, np.int64)
+    num_cores = 0
+    for leaf in range(m):
+        # those edges in X that do not s-dominate other edges with respect to X
+        if not in_X[leaf] or s_num_children_X[leaf] != 0:
+            continue
+        # The t-unitary path down from leaf must be a prefix of the s-unitary path up from leaf, and end at a leaf of T_t.
+        # The paths are unitary, so no edge belongs to two distinct s- (or t-) unitary paths, and this is O(m) over all leaves
+        s_edge = leaf
+        t_edge = leaf
         good_sequence = True
-        while good_sequence and i<len(t_unitary_path):
-            if s_unitary_path[i] != t_unitary_path[i]:
+        while t_num_children_X[t_edge] == 1:
+            t_edge = t_child_X[t_edge]
+            up = s_par_X[s_edge]
+            if up == m or s_num_children_X[up] != 1 or up != t_edge:
                 good_sequence = False
-            else:
-                i=i+1
-                
-        if i == len(t_unitary_path) and T_t.is_leaf_X(t_unitary_path[len(t_unitary_path)-1]):
-            assert(good_sequence==True)
-            cores.append(leaf)
-
-    maximal_safe_sequences = []
-    for core in cores: # O(length of all maximal safe sequences), with no duplicates
-        s_doms = T_s.get_dominators(core)
-        t_doms = T_t.get_dominators(core)
-        maximal_safe_sequences.append( s_doms[::-1] + t_doms[1:] )
-    
+                break
+            s_edge = up
+        if good_sequence and t_num_children_X[t_edge] == 0:
+            cores[num_cores] = leaf
+            num_cores += 1
+
+    # Every core gives the sequence of its s-dominators (from the root down), followed by its t-dominators
+    offsets = np.zeros(num_cores + 1, np.int64)
+    for k in range(num_cores):
+        length = -1 # the core is both an s- and a t-dominator of itself
+        x = cores[k]
+        while x != m:
+            length += 1
+            x = s_par[x]
+        x = cores[k]
+        while x != m:
+            length += 1
+            x = t_par[x]
+        offsets[k + 1] = offsets[k] + length
+
+    flat = np.empty(offsets[num_cores], np.int64)
+    for k in range(num_cores):
+        core = cores[k]
+        num_s_doms = 0
+        x = core
+        while x != m:
+            num_s_doms += 1
+            x = s_par[x]
+        pos = offsets[k] + num_s_doms - 1
+        x = core
+        while x != m:
+            flat[pos] = x
+            pos -= 1
+            x = s_par[x]
+        pos = offsets[k] + num_s_doms
+        x = t_par[core]
+        while x != m:
+            flat[pos] = x
+            pos += 1
+            x = t_par[x]
+
+    return flat, offsets
+
+
+# Cache of maximal safe sequences, shared between all the models built on the same graph.
+# Every model builds its own stDiGraph, whose global source/sink names depend on the object id,
+# so the cache key and the cached sequences use placeholders for the global source and sink.
+_SOURCE = ("__source__",)
+_SINK = ("__sink__",)
+_safe_sequences_cache = OrderedDict()
+_safe_sequences_cache_maxsize = 16
+
+
+def _canonical_edges(G: abssg.AbstractSourceSinkGraph, edges) -> list:
+    canonical = {G.source: _SOURCE, G.sink: _SINK}
+    return [(canonical.get(u, u), canonical.get(v, v)) for (u, v) in edges]
+
+
+def _restore_edges(G: abssg.AbstractSourceSinkGraph, edges) -> list:
+    restore = {_SOURCE: G.source, _SINK: G.sink}
+    return [(restore.get(u, u), restore.get(v, v)) for (u, v) in edges]
+
+
+def _graph_edges_key(G: abssg.AbstractSourceSinkGraph) -> frozenset:
+    # The edges of G, with placeholders for the global source and sink. G is frozen, so this is computed once per graph
+    if "edges_key" not in G._safety_cache:
+        G._safety_cache["edges_key"] = frozenset(_canonical_edges(G, G.edges()))
+    return G._safety_cache["edges_key"]
+
+
+def _cached_first_bridges(G: abssg.AbstractSourceSinkGraph) -> tuple:
+    # The first bridges (see `_first_bridge_arrays`) depend only on G and not on the trusted edges X, so they are kept
+    # on G, and models on the same graph that differ only in their trusted edges (e.g. in `trusted_edges_for_safety_percentile`)
+    # compute them only once. The root of both arc dominator trees is numbered as len(G.edges()).
+    if "first_bridges" not in G._safety_cache:
+        m = G.number_of_edges()
+        G._safety_cache["first_bridges"] = tuple(
+            np.where(par == -1, m, par) for par in _first_bridge_arrays(G)
+        )
+    return G._safety_cache["first_bridges"]
+
+
+def maximal_safe_sequences_via_dominators(G : abssg.AbstractSourceSinkGraph, X = None) -> list :
+    """
+    Returns the maximal safe sequences of `G` with respect to the set of edges `X`.
+    If `X` is `None`, all edges of `G` are used (`G.get_edge_set()`, computed once per graph).
+
+    The result is cached (for the last few distinct inputs), keyed by the edges of `G` and by `X`,
+    so that several models built on the same graph (e.g. with different objectives) compute the
+    safe sequences only once. If only `X` changes, the first bridges (the expensive, `X`-independent
+    part of the computation) are reused, and only their restriction to `X` is computed again.
+    """
+
+    if X is None:
+        X = G.get_edge_set()
+    if len(X) == 0:
+        return []
+    # Any other iterable is turned into a set once, for the cache key and for the mask of X
+    if not isinstance(X, (set, frozenset)):
+        X = frozenset(X)
+
+    edges_key = _graph_edges_key(G)
+    # When X is all the edges of G, its key is the same as the one of the graph
+    X_key = edges_key if X is G.get_edge_set() else frozenset(_canonical_edges(G, X))
+    key = (edges_key, X_key)
+    if key in _safe_sequences_cache:
+        _safe_sequences_cache.move_to_end(key)
+        return [_restore_edges(G, sequence) for sequence in _safe_sequences_cache[key]]
+
+    maximal_safe_sequences = _maximal_safe_sequences_via_dominators(G, X)
+
+    _safe_sequences_cache[key] = [_canonical_edges(G, sequence) for sequence in maximal_safe_sequences]
+    if len(_safe_sequences_cache) > _safe_sequences_cache_maxsize:
+        _safe_sequences_cache.popitem(last=False)
+
     return maximal_safe_sequences
+
+
+def _maximal_safe_sequences_via_dominators(G : abssg.AbstractSourceSinkGraph, X) -> list :
+
+    # The arc dominator trees T_s and T_t, as arrays indexed by the positions of the edges in G.edges()
+    s_par, t_par = _cached_first_bridges(G)
+
+    if X is G.get_edge_set():
+        in_X = np.ones(G.number_of_edges(), dtype=np.bool_)
+    else:
+        edge_index = G.get_edge_index()
+        in_X = np.zeros(len(edge_index), dtype=np.bool_)
+        in_X[[edge_index[edge] for edge in X if edge in edge_index]] = True
+
+    if jit.use_numba(len(s_par)):
+        restrict_to_X, safe_sequences_from_arc_dominators = _restrict_to_X.compiled(), _safe_sequences_from_arc_dominators.compiled()
+    else:
+        restrict_to_X, safe_sequences_from_arc_dominators = _restrict_to_X, _safe_sequences_from_arc_dominators
+        s_par, t_par, in_X = s_par.tolist(), t_par.tolist(), in_X.tolist()
+
+    s_par_X, s_num_children_X, _ = restrict_to_X(s_par, in_X)
+    _, t_num_children_X, t_child_X = restrict_to_X(t_par, in_X)
+    flat, offsets = safe_sequences_from_arc_dominators(s_par, t_par, in_X, s_par_X, s_num_children_X, t_num_children_X, t_child_X)
+
+    edges = list(G.edges())
+    flat = flat.tolist()
+    offsets = offsets.tolist()
+    return [[edges[i] for i in flat[offsets[k]:offsets[k + 1]]] for k in range(len(offsets) - 1)]
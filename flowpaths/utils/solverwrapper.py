@@ -9,6 +9,8 @@ import math
 import flowpaths.utils as utils
 import numpy as np
 import warnings
+import numbers
+from functools import lru_cache
 
 class SolverWrapper:
     """Unified MILP/LP modelling convenience layer for HiGHS and Gurobi.
@@ -22,9 +24,9 @@ class SolverWrapper:
     Key capabilities
     ----------------
     - Create variables (continuous / integer) in bulk with name prefixing
-    - Add linear constraints
+    - Add linear constraints (also two-sided range constraints as a single row)
     - Add specialized modelling shortcuts:
-            - binary * continuous (McCormick) product constraints
+            - binary * continuous (McCormick) product constraints (also batched)
             - integer * continuous product constraints (bit expansion + binaries)
             - piecewise constant constraints (one-hot selection)
     - Build linear objectives without triggering a solve (HiGHS) or with native
@@ -51,7 +53,8 @@ class SolverWrapper:
     **kwargs :
         Flexible configuration. Recognised keys (all optional):
         - ``external_solver`` (str): ``"highs"`` (default) or ``"gurobi"``.
-        - ``threads`` (int): Thread limit for solver (default: ``4``).
+        - ``threads`` (int): Thread limit for solver (default: ``4``). ``0`` uses
+            all the CPUs of the machine.
         - ``time_limit`` (float): Internal solver time limit in seconds
             (default: ``inf`` = no limit).
         - ``use_also_custom_timeout`` (bool): If ``True`` activate an *extra*
@@ -100,6 +103,11 @@ class SolverWrapper:
     infeasible_status = "kInfeasible"
     use_also_custom_timeout = False
 
+    # HiGHS runs all its instances on a single global thread scheduler, created with the `threads` value of the
+    # first solve in the process. A later solve asking for a different number of threads fails (with status kNotset),
+    # unless the scheduler is reset. This is the number of threads of the current scheduler.
+    _highs_scheduler_threads = None
+
     # We try to map gurobi status codes to HiGHS status codes when there is a clear correspondence
     gurobi_status_to_highs = {
         2: "kOptimal",
@@ -135,7 +143,11 @@ class SolverWrapper:
         if self.external_solver == "highs":
             self.solver = HighsCustom()
             self.solver.setOptionValue("solver", "choose")
-            self.solver.setOptionValue("threads", kwargs.get("threads", SolverWrapper.threads))
+            self.threads = kwargs.get("threads", SolverWrapper.threads)
+            if self.threads == 0:
+                # 0 means all the CPUs (HiGHS itself would use only half of them)
+                self.threads = os.cpu_count() or 1
+            self.solver.setOptionValue("threads", self.threads)
             self.solver.setOptionValue("time_limit", kwargs.get("time_limit", SolverWrapper.time_limit))
             self.solver.setOptionValue("presolve", kwargs.get("presolve", SolverWrapper.presolve))
             self.solver.setOptionValue("log_to_console", kwargs.get("log_to_console", SolverWrapper.log_to_console))
@@ -281,11 +293,13 @@ class SolverWrapper:
         
     # No internal tracking of prefixes; caller must avoid collisions.
         
-        # Normalize bounds to per-index arrays when necessary
+        # Normalize bounds to per-index arrays when necessary.
+        # Scalar bounds (also numpy scalars) are kept as a single float: both backends
+        # apply them to all the variables natively, without a per-variable Python list.
         def _materialize_bounds(param, default_value, param_name):
             # scalar
-            if isinstance(param, (int, float)):
-                return [float(param)] * len(indexes)
+            if isinstance(param, numbers.Real):
+                return float(param)
             # dict mapping index -> value
             if isinstance(param, dict):
                 vals = []
@@ -308,7 +322,7 @@ class SolverWrapper:
                 return [float(x) for x in seq]
             except TypeError:
                 # Not iterable; fall back to default scalar for all
-                return [float(default_value)] * len(indexes)
+                return float(default_value)
 
         lbs = _materialize_bounds(lb, 0.0, "lb")
         ubs = _materialize_bounds(ub, 1.0, "ub")
@@ -335,10 +349,10 @@ class SolverWrapper:
                 "continuous": gurobipy.GRB.CONTINUOUS,
                 "binary": gurobipy.GRB.BINARY,
             }
-            # Single batched call using keys with per-index bounds
+            # Single batched call using keys with per-index bounds (scalar bounds are passed as they are)
             keys = list(indexes)
-            lb_map = {idx: float(lbs[pos]) for pos, idx in enumerate(keys)}
-            ub_map = {idx: float(ubs[pos]) for pos, idx in enumerate(keys)}
+            lb_map = lbs if isinstance(lbs, float) else {idx: lbs[pos] for pos, idx in enumerate(keys)}
+            ub_map = ubs if isinstance(ubs, float) else {idx: ubs[pos] for pos, idx in enumerate(keys)}
 
             vars_td = self.solver.addVars(
                 keys,
@@ -366,6 +380,84 @@ class SolverWrapper:
         elif self.external_solver == "gurobi":
             self.solver.addConstr(expr, name=name)
 
+    def add_range_constraint(self, expr, lb, ub, name=""):
+        """Add the two-sided linear constraint ``lb <= expr <= ub`` as a single row.
+
+        This is equivalent to adding ``expr >= lb`` and ``expr <= ub`` with
+        ``add_constraint``, but builds ``expr`` once and contributes only one
+        row to the constraint matrix.
+
+        Parameters
+        ----------
+        expr : linear expression
+            The solver specific linear expression (e.g. built with ``quicksum``).
+        lb, ub : float
+            The lower and upper bounds of ``expr``.
+        name : str, optional
+            Optional identifier for the constraint.
+        """
+        if self.external_solver == "highs":
+            expr = highspy.highs_linear_expression(expr)
+            # if we have duplicate variables, add the vals
+            idxs, vals = expr.unique_elements()
+            offset = expr.constant or 0.0
+            self.solver.addRow(lb - offset, ub - offset, len(idxs), idxs, vals)
+            if name:
+                self.solver.passRowName(self.solver.getNumRow() - 1, name)
+        elif self.external_solver == "gurobi":
+            self.solver.addRange(expr, lb, ub, name=name)
+
+    def add_sum_range_constraints(self, var_groups, lb, ub, name: str = ""):
+        """Add the rows ``lb[j] <= sum(var_groups[j]) <= ub[j]``, for every position ``j``.
+
+        With HiGHS, all the rows are posted with a single ``addRows`` call on a CSR matrix
+        whose column indices are read off the variables, instead of building one linear
+        expression per row. With Gurobi, this falls back to ``add_range_constraint`` for
+        every row.
+
+        Parameters
+        ----------
+        var_groups : list of lists
+            The variables summed in each row. A variable must not appear twice in a group.
+        lb, ub : list of float
+            The lower and upper bounds of each row.
+        name : str, optional
+            Optional name prefix of the rows. With HiGHS, rows are left unnamed if empty.
+        """
+        if len(lb) != len(var_groups) or len(ub) != len(var_groups):
+            utils.logger.error(f"{__name__}: var_groups, lb and ub must have the same length.")
+            raise ValueError("var_groups, lb and ub must have the same length.")
+
+        if self.external_solver != "highs":
+            for j, group in enumerate(var_groups):
+                self.add_range_constraint(self.quicksum(group), lb=lb[j], ub=ub[j], name=f"{name}_{j}")
+            return
+
+        n = len(var_groups)
+        if n == 0:
+            return
+
+        lengths = np.fromiter((len(group) for group in var_groups), dtype=np.int32, count=n)
+        starts = np.zeros(n, dtype=np.int32)
+        np.cumsum(lengths[:-1], out=starts[1:])
+        num_nz = int(lengths.sum())
+        indices = np.fromiter((var.index for group in var_groups for var in group), dtype=np.int32, count=num_nz)
+
+        first_row = self.solver.getNumRow()
+        self.solver.addRows(
+            n,
+            np.asarray(lb, dtype=np.float64),
+            np.asarray(ub, dtype=np.float64),
+            num_nz,
+            starts,
+            indices,
+            np.ones(num_nz, dtype=np.float64),
+        )
+
+        if name:
+            for j in range(n):
+                self.solver.passRowName(first_row + j, f"{name}_{j}")
+
     def add_indicator_constraint(self, binary_var, binary_value: int, expr, name=""):
         """Add an indicator constraint (Gurobi only).
 
@@ -398,8 +490,9 @@ class SolverWrapper:
         Notes
         -----
         - Gurobi: values are assigned to the ``Start`` attribute.
-        - HiGHS: current wrapper exposes no MIP-start support; the call is a
-          no-op and is kept for a uniform API.
+        - HiGHS: values are passed as a sparse (possibly partial) solution via
+          ``setSolution``; HiGHS tries to complete it to a feasible solution
+          at the start of the MIP solve.
         """
         if not variable_values:
             return
@@ -412,9 +505,11 @@ class SolverWrapper:
             self.solver.setAttr(gp.GRB.Attr.Start, vars_to_seed, start_values)
             self.solver.update()
         elif self.external_solver == "highs":
-            utils.logger.debug(
-                f"{__name__}: Ignoring MIP-start request because HiGHS warm starts are not exposed by SolverWrapper.",
-            )
+            indices = np.fromiter((var.index for var in variable_values.keys()), dtype=np.int32, count=len(variable_values))
+            start_values = np.fromiter(variable_values.values(), dtype=np.float64, count=len(variable_values))
+            status = self.solver.setSolution(len(indices), indices, start_values)
+            if status != highspy.HighsStatus.kOk:
+                utils.logger.debug(f"{__name__}: HiGHS did not accept the MIP start (status {status}).")
 
     def add_binary_continuous_product_constraint(self, binary_var, continuous_var, product_var, lb, ub, name: str):
         """
@@ -442,6 +537,66 @@ class SolverWrapper:
         self.add_constraint(product_var <= continuous_var - lb * (1 - binary_var), name=name + "_c")
         self.add_constraint(product_var >= continuous_var - ub * (1 - binary_var), name=name + "_d")
 
+    def add_binary_continuous_product_constraints(self, binary_vars, continuous_vars, product_vars, lb, ub, name: str = ""):
+        r"""
+        Description
+        -----------
+        Batched version of `add_binary_continuous_product_constraint`: for every position `j`, this adds
+        the constraints modelling `binary_vars[j]` * `continuous_vars[j]` = `product_vars[j]`.
+
+        With HiGHS, all the 4 * len(`product_vars`) McCormick rows are posted with a single `addRows` call
+        on a CSR matrix, instead of one Python call (and one expression object) per row. With Gurobi, this
+        falls back to calling `add_binary_continuous_product_constraint` for every position.
+
+        Assumptions:
+            - `binary_vars[j]` $\in [0,1]$
+            - lb ≤ `continuous_vars[j]` ≤ ub
+
+        Args:
+            binary_vars (list): The binary variables.
+            continuous_vars (list): The continuous variables (can also be integer).
+            product_vars (list): The variables that should be equal to the products.
+            lb (float): The lower bound of the continuous variables.
+            ub (float): The upper bound of the continuous variables.
+            name (str): Optional name prefix of the constraints. With HiGHS, rows are left unnamed if empty.
+        """
+        if len(binary_vars) != len(product_vars) or len(continuous_vars) != len(product_vars):
+            utils.logger.error(f"{__name__}: binary_vars, continuous_vars and product_vars must have the same length.")
+            raise ValueError("binary_vars, continuous_vars and product_vars must have the same length.")
+
+        if self.external_solver != "highs":
+            for j in range(len(product_vars)):
+                self.add_binary_continuous_product_constraint(
+                    binary_var=binary_vars[j],
+                    continuous_var=continuous_vars[j],
+                    product_var=product_vars[j],
+                    lb=lb,
+                    ub=ub,
+                    name=f"{name}_{j}",
+                )
+            return
+
+        n = len(product_vars)
+        if n == 0:
+            return
+
+        # Columns of every product: (product_var, continuous_var, binary_var)
+        cols = np.empty((n, 3), dtype=np.int32)
+        cols[:, 0] = [var.index for var in product_vars]
+        cols[:, 1] = [var.index for var in continuous_vars]
+        cols[:, 2] = [var.index for var in binary_vars]
+
+        # The rows depend only on (n, lb, ub) up to the columns, which are gathered from cols
+        lower, upper, starts, gather, values = _product_rows_template(n, float(lb), float(ub))
+
+        first_row = self.solver.getNumRow()
+        self.solver.addRows(4 * n, lower, upper, len(values), starts, cols.ravel()[gather], values)
+
+        if name:
+            for j in range(n):
+                for r, suffix in enumerate("abcd"):
+                    self.solver.passRowName(first_row + 4 * j + r, f"{name}_{j}_{suffix}")
+
     def add_integer_continuous_product_constraint(self, integer_var, continuous_var, product_var, lb, ub, name: str):
         """
         This function adds constraints to model the equality:
@@ -587,6 +742,11 @@ class SolverWrapper:
         # Apply any queued bound updates right before solving
         self._apply_pending_bound_updates()
 
+        if self.external_solver == "highs":
+            if SolverWrapper._highs_scheduler_threads not in (None, self.threads):
+                highspy.Highs.resetGlobalScheduler(True)
+            SolverWrapper._highs_scheduler_threads = self.threads
+
         if self.time_limit == float('inf') or (not self.use_also_custom_timeout):
             self.solver.optimize()
         else:
@@ -1183,4 +1343,39 @@ class HighsCustom(highspy.Highs):
         elif sense in ["maximize", "max"]:
             super().changeObjectiveSense(highspy.ObjSense.kMaximize)
         else:
-            raise ValueError(f"Invalid objective sense: {sense}. Use 'minimize' or 'maximize'.")
\ No newline at end of file
+            raise ValueError(f"Invalid objective sense: {sense}. Use 'minimize' or 'maximize'.")
+
+
+@lru_cache(maxsize=16)
+def _product_rows_template(n: int, lb: float, ub: float) -> tuple:
+    """
+    Returns `(lower, upper, starts, gather, values)` of the 4 * `n` McCormick rows posted by
+    `SolverWrapper.add_binary_continuous_product_constraints` for `n` products with bounds `lb`, `ub`.
+    The column of the i-th nonzero is `cols.ravel()[gather[i]]`, with `cols` the (n, 3) array of the
+    (product, continuous, binary) column indices.
+
+    Models post many batches of the same size and bounds (e.g. one batch of k products per edge),
+    so the template is computed once and cached. The arrays must not be modified.
+    """
+    inf = highspy.kHighsInf
+
+    # The four rows of add_binary_continuous_product_constraint, moved to the form `lower <= A x <= upper`:
+    #   _a: product - ub * binary <= 0
+    #   _b: product - lb * binary >= 0
+    #   _c: product - continuous - lb * binary <= -lb
+    #   _d: product - continuous - ub * binary >= -ub
+    coefs = np.array([[1, 0, -ub], [1, 0, -lb], [1, -1, -lb], [1, -1, -ub]], dtype=np.float64)
+    lower = np.tile(np.array([-inf, 0, -inf, -ub], dtype=np.float64), n)
+    upper = np.tile(np.array([0, inf, -lb, inf], dtype=np.float64), n)
+
+    positions = 3 * np.arange(n, dtype=np.int64)[:, None, None] + np.arange(3, dtype=np.int64)[None, None, :]
+    gather = np.broadcast_to(positions, (n, 4, 3)).reshape(4 * n, 3)
+    values = np.broadcast_to(coefs[None, :, :], (n, 4, 3)).reshape(4 * n, 3)
+    nonzero = values != 0
+    starts = np.zeros(4 * n, dtype=np.int32)
+    starts[1:] = np.cumsum(nonzero.sum(axis=1))[:-1]
+
+    template = (lower, upper, starts, np.ascontiguousarray(gather[nonzero]), np.ascontiguousarray(values[nonzero]))
+    for array in template:
+        array.setflags(write=False)
+    return template
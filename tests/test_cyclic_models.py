@@ -99,7 +99,24 @@ class TestCyclicModels:
         solution = mpe.get_solution()
         assert len(solution["walks"]) == k
         assert "slacks" in solution
-    
+
+    def test_kmin_path_error_cycles_on_given_stdigraph(self, complex_cycle_graph):
+        """Test kMinPathErrorCycles on an already built stDiGraph."""
+        stG = fp.stDiGraph(complex_cycle_graph)
+        mpe = fp.kMinPathErrorCycles(stG, k=2, flow_attr="flow", weight_type=int)
+        mpe.solve()
+
+        assert mpe.G is stG
+        assert mpe.is_solved()
+        assert mpe.is_valid_solution()
+
+        mpe_graph = fp.kMinPathErrorCycles(complex_cycle_graph, k=2, flow_attr="flow", weight_type=int)
+        mpe_graph.solve()
+        assert mpe.get_objective_value() == mpe_graph.get_objective_value()
+
+        with pytest.raises(ValueError):
+            fp.kMinPathErrorCycles(stG, k=2, flow_attr="flow", additional_starts=["a"])
+
     def test_cycles_with_subset_constraints(self, complex_cycle_graph):
         """Test cyclic models with subset constraints."""
         # Create subset constraints
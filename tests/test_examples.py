@@ -5,7 +5,8 @@ import pytest
 
 EXAMPLES_DIR = pathlib.Path(__file__).parent.parent / "examples"
 
-example_files = list(EXAMPLES_DIR.glob("**/*.py"))
+# helpers.py is imported by some examples, and is not an example itself
+example_files = [path for path in EXAMPLES_DIR.glob("**/*.py") if path.name != "helpers.py"]
 
 @pytest.fixture(scope="module", autouse=True)
 def _suppress_draw():
@@ -32,6 +33,25 @@ def _suppress_draw():
         _utils.draw = original  # restore
 
 
+@pytest.fixture(autouse=True)
+def _verify_solutions(monkeypatch):
+    """Auto-used fixture to make the examples check their solutions.
+
+    Some examples call is_valid_solution() only if the environment variable
+    FP_VERIFY is set (see examples/README.md), so it is set for every test.
+    """
+    monkeypatch.setenv("FP_VERIFY", "1")
+
+
+@pytest.fixture(autouse=True)
+def _examples_dir_in_sys_path(monkeypatch):
+    """Auto-used fixture to let the examples import helpers.py.
+
+    As when an example is run as a script, the examples directory is in sys.path.
+    """
+    monkeypatch.syspath_prepend(str(EXAMPLES_DIR))
+
+
 @pytest.mark.parametrize("example_path", example_files, ids=lambda path: path.name)
 def test_example(example_path):
     spec = importlib.util.spec_from_file_location(example_path.stem, example_path)
@@ -0,0 +1,47 @@
+import flowpaths.utils.graphutils as graphutils
+
+
+def test_read_graph_csr_matches_read_graph():
+    block = [
+        "# graph number = 1 name = foo\n",
+        "#S a b c\n",
+        "4\n",
+        "a b 1.0\n",
+        "b c 2.5\n",
+        "a c 3.0\n",
+        "c d 4.0\n",
+    ]
+
+    graph = graphutils.read_graph(block)
+    graph_csr = graphutils.read_graph_csr(block)
+
+    assert graph_csr.nodes == ["a", "b", "c", "d"]
+    assert graph_csr.indptr.tolist() == [0, 2, 3, 4, 4]
+    assert graph_csr.indices.tolist() == [1, 2, 2, 3]
+    assert graph_csr.flow.tolist() == [1.0, 3.0, 2.5, 4.0]
+    assert graph_csr.graph["n"] == 4
+    assert graph_csr.graph["m"] == 4
+
+    graph_nx = graph_csr.to_networkx()
+    assert graph_nx.graph == graph.graph
+    assert sorted(graph_nx.edges(data=True)) == sorted(graph.edges(data=True))
+
+
+def test_csr_graph_from_networkx_round_trip():
+    block = [
+        "# graph number = 1 name = foo\n",
+        "#S a b c\n",
+        "4\n",
+        "a b 1.0\n",
+        "b c 2.5\n",
+        "a c 3.0\n",
+        "c d 4.0\n",
+    ]
+
+    graph = graphutils.read_graph(block)
+    graph_csr = graphutils.CSRGraph.from_networkx(graph)
+
+    assert graph_csr.nodes == list(graph.nodes())
+    assert graph_csr.number_of_edges() == graph.number_of_edges()
+    assert graph_csr.graph["id"] == graph.graph["id"]
+    assert sorted(graph_csr.to_networkx().edges(data=True)) == sorted(graph.edges(data=True))
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import flowpaths.utils.graphutils as graphutils
@@ -161,3 +162,32 @@ def test_read_intron_graphs_reads_all_graph_subfolders():
     assert len(graphs) == 8
     assert graphs[0].graph["id"] == "SIRV1.1.SIRV1"
     assert graphs[-1].graph["id"] == "SIRV7.3.region_147969_148930"
+
+
+def test_dot_node_positions_skips_edges():
+    dot_data = (
+        b"digraph {\n"
+        b'\tgraph [bb="0,0,200,100", rankdir=LR];\n'
+        b'\ta\t[pos="27,18", shape=rectangle];\n'
+        b'\t"b c"\t[height=0.5,\n\t\tpos="99.5,-18"];\n'
+        b'\ta -> "b c"\t[pos="e,63.1,18 27.1,18"];\n'
+        b"}\n"
+    )
+
+    assert graphutils._dot_node_positions(dot_data) == {"a": (27.0, 18.0), "b c": (99.5, -18.0)}
+
+
+def test_read_graphs_cached_pickles_to_cache_dir(tmp_path: Path):
+    graph_file = tmp_path / "g.graph"
+    graph_file.write_text("# graph number = 0 name = g\n3\na b 1.0\nb c 2.0\n")
+    cache_dir = tmp_path / "cache"
+
+    graphs = graphutils.read_graphs_cached(graph_file, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("g.graph.*.pkl"))) == 1
+
+    # A new process would not have the in-memory cache, so we bypass it here
+    loaded = graphutils._read_graphs_cached.__wrapped__(
+        os.path.abspath(graph_file), graph_file.stat().st_mtime_ns, str(cache_dir)
+    )
+    assert len(list(cache_dir.glob("g.graph.*.pkl"))) == 1
+    assert [sorted(G.edges(data=True)) for G in loaded] == [sorted(G.edges(data=True)) for G in graphs]
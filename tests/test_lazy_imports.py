@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+import pytest
+
+import flowpaths as fp
+
+
+def test_models_are_imported_on_first_access():
+    # In a fresh interpreter, since the test session has already imported most modules
+    code = (
+        "import sys, flowpaths as fp\n"
+        "fp.stDiGraph\n"
+        "assert 'flowpaths.stdigraph' in sys.modules\n"
+        "assert 'flowpaths.kflowdecomp' not in sys.modules\n"
+        "fp.kFlowDecomp\n"
+        "assert 'flowpaths.kflowdecomp' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_attributes():
+    assert fp.kFlowDecomp.__module__ == "flowpaths.kflowdecomp"
+    assert fp.graphutils is fp.utils.graphutils
+    assert set(fp.__all__) <= set(dir(fp))
+    with pytest.raises(AttributeError):
+        fp.NotAModel
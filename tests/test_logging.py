@@ -0,0 +1,20 @@
+import logging.handlers
+
+import flowpaths as fp
+
+
+def test_configure_logging_in_background_writes_to_file(tmp_path):
+    log_file = tmp_path / "flowpaths.log"
+    fp.utils.configure_logging(
+        level=fp.utils.logging.DEBUG,
+        log_to_console=False,
+        log_file=str(log_file),
+        log_in_background=True,
+    )
+    fp.utils.logger.debug("message from the test")
+
+    # Configuring again stops the background listener, after writing the queued records
+    fp.utils.configure_logging(level=fp.utils.logging.WARNING, log_to_console=False)
+
+    assert "message from the test" in log_file.read_text()
+    assert not any(isinstance(handler, logging.handlers.QueueHandler) for handler in fp.utils.logger.handlers)
@@ -1,5 +1,6 @@
 import pytest
 import itertools
+import networkx as nx
 import flowpaths as fp
 
 weight_type = [int, float]
@@ -77,3 +78,139 @@ graphs = fp.graphutils.read_graphs("./tests/test_graphs_flow_conservation.graph"
 @pytest.mark.parametrize("graph, idx", [(g, i) for i, g in enumerate(graphs)])
 def test(graph, idx):
     run_test(graph, idx, params)
+
+
+def test_kflowdecomp_base_model_reuses_graph_and_safe_lists():
+    graph = graphs[0]
+    optimization_options = {"optimize_with_greedy": False}
+    k = fp.MinFlowDecomp(graph, flow_attr="flow").get_lowerbound_k() + 1
+
+    base = fp.kFlowDecomp(graph, flow_attr="flow", k=k, optimization_options=optimization_options)
+    model = fp.kFlowDecomp(graph, flow_attr="flow", k=k + 1, optimization_options=optimization_options, base_model=base)
+    assert model.G is base.G
+    assert model.safe_lists == base.safe_lists
+
+    model.solve()
+    assert model.is_solved()
+    assert model.is_valid_solution()
+
+    with pytest.raises(ValueError):
+        fp.kFlowDecomp(graph, flow_attr="other", k=k, base_model=base)
+
+
+def test_kflowdecomp_base_model_reuses_node_expanded_graph():
+    graph = nx.DiGraph()
+    for node, flow in [("s", 13), ("a", 6), ("b", 9), ("c", 13), ("d", 6), ("t", 13)]:
+        graph.add_node(node, flow=flow)
+    graph.add_edges_from([("s", "a"), ("s", "b"), ("a", "b"), ("a", "c"), ("b", "c"), ("c", "d"), ("c", "t"), ("d", "t")])
+
+    base = fp.kFlowDecomp(graph, flow_attr="flow", flow_attr_origin="node", k=3, elements_to_ignore=["d"])
+    num_edges_to_ignore = len(base.G_internal.edges_to_ignore)
+    model = fp.kFlowDecomp(graph, flow_attr="flow", flow_attr_origin="node", k=4, elements_to_ignore=["d"], base_model=base)
+    assert model.G_internal is base.G_internal
+    assert len(base.G_internal.edges_to_ignore) == num_edges_to_ignore
+
+    model.solve()
+    assert model.is_solved()
+    assert model.is_valid_solution()
+
+
+def subpaths_graph():
+    graph = nx.DiGraph()
+    for u, v, flow in [("s", "a", 6), ("s", "b", 7), ("a", "b", 2), ("a", "c", 4), ("b", "c", 9), ("c", "d", 6), ("c", "t", 7), ("d", "t", 6)]:
+        graph.add_edge(u, v, flow=flow)
+    return graph
+
+
+def test_kflowdecomp_base_model_with_other_subpath_constraints_coverage():
+    graph = subpaths_graph()
+    subpath_constraints = [[("a", "c"), ("c", "t")]]
+    optimization_options = {"optimize_with_greedy": False}
+
+    base = fp.kFlowDecomp(graph, flow_attr="flow", k=3, subpath_constraints=subpath_constraints, optimization_options=optimization_options)
+    base.solve()
+    # With coverage 1 the subpath constraint is a safe sequence of base, but it is not safe with coverage 0.5
+    model = fp.kFlowDecomp(
+        graph,
+        flow_attr="flow",
+        k=3,
+        subpath_constraints=subpath_constraints,
+        subpath_constraints_coverage=0.5,
+        optimization_options=optimization_options,
+        base_model=base,
+    )
+    assert model._base_safe_lists is None
+    model.solve()
+    assert model.is_solved()
+    assert model.is_valid_solution()
+
+
+def test_minflowdecomp_base_model_gives_same_solution_size():
+    graph = graphs[1]
+    base = fp.MinFlowDecomp(graph, flow_attr="flow", optimization_options={"optimize_with_greedy": False})
+    base.solve()
+
+    model = fp.MinFlowDecomp(graph, flow_attr="flow", optimization_options={"optimize_with_greedy": False}, base_model=base)
+    assert model.get_lowerbound_k() == base.get_lowerbound_k()
+    model.solve()
+    assert model.is_solved()
+    assert model.is_valid_solution()
+    assert len(model.get_solution()["paths"]) == len(base.get_solution()["paths"])
+
+
+def test_minflowdecomp_base_model_with_other_subpath_constraints_coverage():
+    graph = subpaths_graph()
+    subpath_constraints = [[("a", "c"), ("c", "t")]]
+    optimization_options = {"optimize_with_greedy": False}
+
+    base = fp.MinFlowDecomp(graph, flow_attr="flow", subpath_constraints=subpath_constraints, optimization_options=optimization_options)
+    base.solve()
+    model = fp.MinFlowDecomp(
+        graph,
+        flow_attr="flow",
+        subpath_constraints=subpath_constraints,
+        subpath_constraints_coverage=0.5,
+        optimization_options=optimization_options,
+        base_model=base,
+    )
+    # The st-DAG and the lowerbound do not depend on the subpath constraints, but the safe lists of base do
+    assert model._base_fd_model is base.fd_model
+    assert model.get_lowerbound_k() == base.get_lowerbound_k()
+    model.solve()
+    assert model.is_solved()
+    assert model.is_valid_solution()
+    assert model.fd_model.G is base.fd_model.G
+    assert len(model.get_solution()["paths"]) == 3
+
+
+def test_minflowdecomp_base_model_keeps_edges_to_ignore_of_node_expanded_graph():
+    graph = nx.DiGraph()
+    for node, flow in [("s", 13), ("a", 6), ("b", 9), ("c", 13), ("d", 6), ("t", 13)]:
+        graph.add_node(node, flow=flow)
+    graph.add_edges_from([("s", "a"), ("s", "b"), ("a", "b"), ("a", "c"), ("b", "c"), ("c", "d"), ("c", "t"), ("d", "t")])
+
+    base = fp.MinFlowDecomp(graph, flow_attr="flow", flow_attr_origin="node", elements_to_ignore=["d"])
+    edges_to_ignore = list(base.G_internal.edges_to_ignore)
+    model = fp.MinFlowDecomp(graph, flow_attr="flow", flow_attr_origin="node", elements_to_ignore=["d"], base_model=base)
+    assert model.G_internal is base.G_internal
+    assert base.G_internal.edges_to_ignore == edges_to_ignore
+    assert set(model.edges_to_ignore) == set(base.edges_to_ignore)
+
+
+def test_num_paths_optimization_reuses_kflowdecomp_setup():
+    graph = graphs[0]
+    model = fp.NumPathsOptimization(
+        model_type=fp.kFlowDecomp,
+        stop_on_first_feasible=True,
+        G=graph,
+        flow_attr="flow",
+        optimization_options={"optimize_with_greedy": False},
+    )
+    # The model built to get the lowerbound is the base of the first model of the sweep
+    model.get_lowerbound_k()
+    first_model = model._base_model
+    model.solve()
+
+    assert model.is_solved()
+    assert model.is_valid_solution()
+    assert model.model.G is first_model.G
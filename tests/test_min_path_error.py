@@ -1,5 +1,6 @@
 import pytest
 import itertools
+import networkx as nx
 import flowpaths as fp
 
 weight_type = [int]
@@ -132,3 +133,63 @@ graphs = fp.graphutils.read_graphs("./tests/test_graphs_errors.graph")
 @pytest.mark.parametrize("graph, idx", [(g, i) for i, g in enumerate(graphs)])
 def test(graph, idx):
     run_test(graph, idx, params)
+
+def test_base_model_gives_same_objective():
+    graph = graphs[0]
+    mpe_model = fp.kMinPathError(graph, flow_attr="flow", k=3, weight_type=int)
+    mpe_model.solve()
+
+    edges_to_ignore = [next(iter(graph.edges()))]
+    fresh_model = fp.kMinPathError(graph, flow_attr="flow", k=3, weight_type=int, elements_to_ignore=edges_to_ignore)
+    fresh_model.solve()
+    reused_model = fp.kMinPathError(graph, flow_attr="flow", k=3, weight_type=int, elements_to_ignore=edges_to_ignore, base_model=mpe_model)
+    reused_model.solve()
+
+    assert reused_model.G is mpe_model.G
+    assert reused_model.is_valid_solution()
+    assert abs(fresh_model.get_objective_value() - reused_model.get_objective_value()) < tolerance
+    # the edges to ignore of the base model are not affected
+    assert not set(edges_to_ignore) & mpe_model.edges_to_ignore
+
+    with pytest.raises(ValueError):
+        fp.kMinPathError(graph.copy(), flow_attr="flow", k=3, base_model=mpe_model)
+
+
+def test_frozen_graph_is_not_copied():
+    graph = graphs[0].copy()
+    nx.freeze(graph)
+
+    mpe_model = fp.kMinPathError(graph, flow_attr="flow", k=3, weight_type=int)
+    mpe_model.solve()
+
+    assert mpe_model.G_internal is graph
+    assert mpe_model.is_valid_solution()
+
+
+def test_path_length_factors_are_checked_by_is_valid_solution():
+    graph = nx.DiGraph()
+    graph.add_edges_from([
+        ("0", "a", {"flow": 6, "length": 2}),
+        ("0", "b", {"flow": 7, "length": 4}),
+        ("a", "b", {"flow": 2, "length": 6}),
+        ("a", "c", {"flow": 5, "length": 3}),
+        ("b", "c", {"flow": 9, "length": 1}),
+        ("c", "d", {"flow": 6, "length": 8}),
+        ("c", "1", {"flow": 7, "length": 9}),
+        ("d", "1", {"flow": 6, "length": 4}),
+    ])
+    mpe_model = fp.kMinPathError(
+        graph,
+        flow_attr="flow",
+        k=3,
+        weight_type=int,
+        length_attr="length",
+        path_length_ranges=[[0, 15], [16, 18], [19, 20], [21, 30], [31, 100000]],
+        path_length_factors=[1.6, 1.0, 1.3, 1.7, 1.0],
+    )
+    mpe_model.solve()
+    assert mpe_model.is_valid_solution()
+
+    # Factors that do not match those used in the solution
+    mpe_model.path_length_factors = [factor + 1 for factor in mpe_model.path_length_factors]
+    assert not mpe_model.is_valid_solution()
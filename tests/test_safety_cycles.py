@@ -0,0 +1,330 @@
+import pytest
+import networkx as nx
+import numpy as np
+from queue import Queue
+
+import flowpaths as fp
+from flowpaths.utils import dominators, jit, safetypathcoverscycles
+
+
+# Reference implementations of the first bridges and of the arc dominator trees, to check the dominator arrays against
+
+def find_path(adj_dict, s, t):
+    """Find a path from s to t using DFS."""
+    def dfs_path(node, path: list, visited: set):
+        if node == t:
+            return True
+        visited.add(node)
+        for neighbor in adj_dict[node]:
+            if neighbor not in visited:
+                path.append(neighbor)
+                if dfs_path(neighbor, path, visited):
+                    return True
+                path.pop()  # Backtrack if this path doesn't lead to t
+        return False
+    
+    path = [s]
+    visited = set()
+    dfs_path(s, path, visited)
+    return path
+
+def find_idom(adj_dict, s, t) -> list:
+    
+    # find arbitrary s-t path p
+    p = find_path(adj_dict, s, t)
+
+    # add reversed path to G
+    # and remove the original edges of the path
+    for i in range(len(p)-1):
+        adj_dict[p[i]].remove(p[i+1])  # remove original edges
+        adj_dict[p[i+1]].append(p[i])
+
+    n            = len(adj_dict)
+    i            = 1
+    component = dict()  # [0] * n
+    for v in adj_dict.keys():
+        component[v] = 0
+    q            = Queue(maxsize = n+1)
+    component[s] = 1
+    first_node   = 0
+    first_bridge = None
+    q.put(s)
+
+    while component[t]==0: #do while :(
+
+        if i!=1:
+            #find first node u of P with component[u]=0. all in all we pay |P| time for this
+            while component[p[first_node]] != 0:
+                first_node += 1
+
+            first_bridge = ( p[first_node-1] ,p[first_node] )
+            break
+
+        while not q.empty():
+            u = q.get()
+            for v in adj_dict[u]:
+                if component[v]==0:
+                    q.put(v)
+                    component[v]=i
+        i = i+1
+
+    #recover original adjacency relation
+    for i in range(len(p)-1):
+        u,v = p[i],p[i+1]
+        adj_dict[v].pop()      #remove reversed edges
+        adj_dict[u].append(v)  #reinsert removed edges
+
+    return first_bridge
+
+
+def _first_bridges(G) -> tuple:
+    """
+    The first bridges of `_first_bridge_arrays`, as dicts from edges to edges (or to `G.source`, resp. `G.sink`, if there is none).
+
+    Returns
+    -------
+    - tuple `(s_idoms, t_idoms)` as expected by `Arc_Dominator_Tree`.
+    """
+    s_par, t_par = safetypathcoverscycles._first_bridge_arrays(G)
+    edges = list(G.edges())
+    s_idoms = {edge: (edges[i] if i != -1 else G.source) for edge, i in zip(edges, s_par.tolist())}
+    t_idoms = {edge: (edges[i] if i != -1 else G.sink) for edge, i in zip(edges, t_par.tolist())}
+
+    return s_idoms, t_idoms
+
+
+class Arc_Dominator_Tree:
+
+    def __init__(self, n:int, start:str, idoms:dict, edgelist : list, X : set, id:str):
+        self.id              = id
+        self.n               = n
+        self.start           = start
+        self.X               = X
+        self.idom            = idoms
+        self.children        = {e: [] for e in edgelist}
+        self.children[start] = []
+
+        for node,idom in self.idom.items():
+            self.children[idom].append(node)
+
+        self.idom_X            = dict()
+        # self.idom_X[start]     = start
+        self.children_X        = {e: [] for e in X}
+        self.children_X[start] = []
+        self.build_children_relation_X()
+
+    def is_leaf_X(self, arc : tuple):
+        # if arc not in self.children_X:
+        #     return False
+        return len(self.children_X[arc])==0
+
+    def has_unique_child_X(self, arc : tuple):
+        # if arc not in self.children_X:
+        #     return False
+        return len(self.children_X[arc])==1
+    
+    def get_dominators(self, arc : tuple):
+        dominators = []
+        while arc != self.start:
+            dominators.append(arc)
+            arc = self.idom[arc]
+        return dominators
+    
+    def build_children_relation_X(self):
+
+        # Iterative DFS (the dominator tree can be as deep as the number of arcs, too deep for recursion).
+        # Children are pushed in reverse, so that they are visited, and appended to children_X, in their order
+        stack = [(self.start, self.start)]
+        while stack:
+            node, last_in_X = stack.pop() # recall that X is a set of arcs. the term "node" is to allude to nodes of the dominator tree
+            if node != last_in_X and node in self.X: # note that sink and source are never in X
+                self.children_X[last_in_X].append(node)
+                self.idom_X[node] = last_in_X
+                last_in_X = node
+            stack.extend((child, last_in_X) for child in reversed(self.children[node]))
+
+    #a unitary path in a dominator tree is a path towards the root such that every node has exactly one children except the deepest node
+    def find_unitary_path_X(self, arc : tuple, mode : str):
+        if mode == "up":
+            fn = ( lambda node : self.idom_X[node]        if self.has_unique_child_X(self.idom_X[node]) and self.idom_X[node] != self.start else node )
+        if mode == "down":
+            fn = ( lambda node : self.children_X[node][0] if self.has_unique_child_X(node)                                                  else node )
+
+        path = [arc]
+        while arc != fn(arc):
+            arc = fn(arc)
+            path.append(arc)
+        return path
+
+
+def _make_graph():
+    graph = nx.DiGraph()
+    graph.add_edges_from([("a", "b"), ("b", "c"), ("c", "b"), ("c", "d"), ("a", "d")])
+    return graph
+
+
+def test_safe_sequences_cache_is_shared_between_graph_copies():
+    safetypathcoverscycles._safe_sequences_cache.clear()
+
+    stG1 = fp.stDiGraph(_make_graph())
+    sequences1 = safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG1, set(stG1.edges()))
+    assert len(safetypathcoverscycles._safe_sequences_cache) == 1
+
+    # A second stDiGraph of the same graph has different global source/sink names, but hits the cache
+    stG2 = fp.stDiGraph(_make_graph())
+    sequences2 = safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG2, set(stG2.edges()))
+    assert len(safetypathcoverscycles._safe_sequences_cache) == 1
+
+    rename = {stG1.source: stG2.source, stG1.sink: stG2.sink}
+    assert sequences2 == [[(rename.get(u, u), rename.get(v, v)) for u, v in seq] for seq in sequences1]
+    for sequence in sequences2:
+        for edge in sequence:
+            assert stG2.has_edge(*edge)
+
+
+def test_first_bridges_match_find_idom():
+    graph = fp.graphutils.read_graphs("tests/cyclic_graphs/gt5.kmer27.(655000.660000).V18.E27.mincyc4.e0.75.graph")[0]
+    stG = fp.stDiGraph(graph)
+
+    s_idoms, t_idoms = _first_bridges(stG)
+
+    adj_dict = {u: list(stG.successors(u)) for u in stG.nodes()}
+    adj_dict_rev = {u: list(stG.predecessors(u)) for u in stG.nodes()}
+    for (u, v) in stG.edges():
+        s_idom = find_idom(adj_dict_rev, u, stG.source)
+        t_idom = find_idom(adj_dict, v, stG.sink)
+        assert s_idoms[(u, v)] == (tuple(reversed(s_idom)) if s_idom is not None else stG.source)
+        assert t_idoms[(u, v)] == (t_idom if t_idom is not None else stG.sink)
+
+
+def test_first_bridges_reused_when_only_trusted_edges_change():
+    graph = fp.graphutils.read_graphs("tests/cyclic_graphs/gt5.kmer27.(655000.660000).V18.E27.mincyc4.e0.75.graph")[0]
+    safetypathcoverscycles._safe_sequences_cache.clear()
+
+    stG1 = fp.stDiGraph(graph)
+    trusted1 = set(list(stG1.edges())[::2])
+    fresh = safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG1, trusted1)
+
+    safetypathcoverscycles._safe_sequences_cache.clear()
+    stG2 = fp.stDiGraph(graph)
+    safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG2, set(stG2.edges()))
+    first_bridges = stG2._safety_cache["first_bridges"]
+
+    trusted2 = set(list(stG2.edges())[::2])
+    reused = safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG2, trusted2)
+    assert stG2._safety_cache["first_bridges"] is first_bridges
+
+    rename = {stG1.source: stG2.source, stG1.sink: stG2.sink}
+    assert reused == [[(rename.get(u, u), rename.get(v, v)) for u, v in seq] for seq in fresh]
+
+
+def test_first_bridges_match_find_idom_on_random_graphs():
+    for seed in range(30):
+        graph = nx.gnp_random_graph(25, 0.08, seed=seed, directed=True)
+        graph = nx.relabel_nodes(graph, {v: str(v) for v in graph.nodes()})
+        graph.add_edges_from([("s", "0"), ("24", "t")])
+        stG = fp.stDiGraph(graph)
+
+        s_idoms, t_idoms = _first_bridges(stG)
+
+        adj_dict = {u: list(stG.successors(u)) for u in stG.nodes()}
+        adj_dict_rev = {u: list(stG.predecessors(u)) for u in stG.nodes()}
+        # find_idom needs a path, and some cycles of a random graph are not reachable from the source (or the sink)
+        from_source = nx.descendants(stG, stG.source) | {stG.source}
+        to_sink = nx.ancestors(stG, stG.sink) | {stG.sink}
+        for (u, v) in stG.edges():
+            if u in from_source:
+                s_idom = find_idom(adj_dict_rev, u, stG.source)
+                assert s_idoms[(u, v)] == (tuple(reversed(s_idom)) if s_idom is not None else stG.source)
+            if v in to_sink:
+                t_idom = find_idom(adj_dict, v, stG.sink)
+                assert t_idoms[(u, v)] == (t_idom if t_idom is not None else stG.sink)
+
+
+def test_immediate_arc_dominators():
+    # 0 -> 1 -> 2 -> 4 and 1 -> 3 -> 4, 4 -> 5; node 6 is unreachable
+    tails = np.array([0, 1, 2, 1, 3, 4])
+    heads = np.array([1, 2, 4, 3, 4, 5])
+    arc_idom = dominators.immediate_arc_dominators(7, tails, heads, 0)
+    assert arc_idom.tolist() == [-1, 0, 1, 3, 0, 5, -1]
+
+
+def test_safe_sequences_on_a_long_path():
+    # The dominator trees of a long path are deeper than the default recursion limit
+    n = 3000
+    graph = nx.DiGraph()
+    graph.add_edges_from((str(i), str(i + 1)) for i in range(n))
+    stG = fp.stDiGraph(graph)
+
+    sequences = safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG, set(graph.edges()))
+    assert len(sequences) == 1
+    assert sequences[0][1:-1] == list(graph.edges())
+
+
+def test_first_bridges_kept_on_the_graph(monkeypatch):
+    graph = fp.graphutils.read_graphs("tests/cyclic_graphs/gt5.kmer27.(655000.660000).V18.E27.mincyc4.e0.75.graph")[0]
+    safetypathcoverscycles._safe_sequences_cache.clear()
+    stG = fp.stDiGraph(graph)
+    safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG, set(stG.edges()))
+
+    # Even without the module-level cache, a call with other trusted edges on the same graph
+    # takes the first bridges from the graph itself
+    safetypathcoverscycles._safe_sequences_cache.clear()
+
+    def fail(G):
+        raise AssertionError("first bridges computed again")
+
+    monkeypatch.setattr(safetypathcoverscycles, "_first_bridge_arrays", fail)
+    sequences = safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG, set(list(stG.edges())[::2]))
+    assert all(stG.has_edge(*edge) for sequence in sequences for edge in sequence)
+
+
+def test_safe_sequences_default_to_all_edges():
+    stG = fp.stDiGraph(_make_graph())
+
+    assert stG.get_edge_set() == frozenset(stG.edges())
+    assert stG.get_edge_set() is stG.get_edge_set()
+    assert safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG) == \
+        safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG, set(stG.edges()))
+    assert safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG, set()) == []
+
+
+def _safe_sequences_with_arc_dominator_trees(stG, X):
+    # The maximal safe sequences computed with Arc_Dominator_Tree, as a reference
+    s_idoms, t_idoms = _first_bridges(stG)
+    T_s = Arc_Dominator_Tree(stG.number_of_nodes(), stG.source, s_idoms, stG.edges, X, "s")
+    T_t = Arc_Dominator_Tree(stG.number_of_nodes(), stG.sink, t_idoms, stG.edges, X, "t")
+
+    sequences = []
+    for leaf in [arc for arc, children in T_s.children_X.items() if len(children) == 0 and arc != stG.source]:
+        s_unitary_path = T_s.find_unitary_path_X(leaf, "up")
+        t_unitary_path = T_t.find_unitary_path_X(leaf, "down")
+        if s_unitary_path[:len(t_unitary_path)] == t_unitary_path and T_t.is_leaf_X(t_unitary_path[-1]):
+            sequences.append(T_s.get_dominators(leaf)[::-1] + T_t.get_dominators(leaf)[1:])
+    return sequences
+
+
+def test_safe_sequences_match_arc_dominator_trees():
+    for seed in range(30):
+        graph = nx.gnp_random_graph(25, 0.08, seed=seed, directed=True)
+        graph = nx.relabel_nodes(graph, {v: str(v) for v in graph.nodes()})
+        graph.add_edges_from([("s", "0"), ("24", "t")])
+        stG = fp.stDiGraph(graph)
+
+        for X in (set(stG.edges()), set(list(stG.edges())[seed % 3::3])):
+            safetypathcoverscycles._safe_sequences_cache.clear()
+            sequences = safetypathcoverscycles.maximal_safe_sequences_via_dominators(stG, X)
+            assert sorted(sequences) == sorted(_safe_sequences_with_arc_dominator_trees(stG, X))
+
+
+def test_safe_sequences_with_numba_match_plain_python(monkeypatch):
+    pytest.importorskip("numba")
+    graph = fp.graphutils.read_graphs("tests/cyclic_graphs/gt5.kmer27.(655000.660000).V18.E27.mincyc4.e0.75.graph")[0]
+    stG = fp.stDiGraph(graph)
+    X = set(list(stG.edges())[::2])
+
+    plain = safetypathcoverscycles._maximal_safe_sequences_via_dominators(stG, X)
+    # Use the kernels compiled by numba on this small graph as well (with the first bridges computed again)
+    monkeypatch.setattr(jit, "numba_min_edges", 0)
+    stG._safety_cache.clear()
+    assert safetypathcoverscycles._maximal_safe_sequences_via_dominators(stG, X) == plain
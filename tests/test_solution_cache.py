@@ -0,0 +1,52 @@
+import networkx as nx
+
+import flowpaths as fp
+
+
+def _dag():
+    graph = nx.DiGraph()
+    graph.add_edge("s", "a", flow=3)
+    graph.add_edge("s", "b", flow=2)
+    graph.add_edge("a", "t", flow=3)
+    graph.add_edge("b", "t", flow=2)
+    return graph
+
+
+def _cyclic():
+    graph = nx.DiGraph()
+    graph.add_edge("s", "a", flow=2)
+    graph.add_edge("a", "b", flow=3)
+    graph.add_edge("b", "a", flow=1)
+    graph.add_edge("b", "t", flow=2)
+    return graph
+
+
+def test_solution_paths_are_decoded_once_and_reset():
+    model = fp.kFlowDecomp(G=_dag(), flow_attr="flow", k=2, optimization_options={"optimize_with_greedy": False})
+    model.solve()
+    paths = model.get_solution_paths()
+    assert model._solution_paths is not None
+
+    # callers get copies, so modifying them does not affect the cache
+    paths[0].append("x")
+    assert model.get_solution_paths() != paths
+
+    model.get_solution()
+    model.reset_solution_cache()
+    assert model._solution_paths is None and model._solution is None and model.edge_vars_sol == {}
+    model.get_solution()
+    assert model.is_valid_solution()
+
+
+def test_solution_walks_are_decoded_once_and_reset():
+    model = fp.kFlowDecompCycles(G=_cyclic(), flow_attr="flow", k=2)
+    model.solve()
+    walks = model.get_solution_walks()
+    assert model._solution_walks is not None
+    assert model.get_solution_walks() == walks
+
+    model.reset_solution_cache()
+    assert model._solution_walks is None and model._solution is None
+    assert model.get_solution_walks() == walks
+    model.get_solution()
+    assert model.is_valid_solution()
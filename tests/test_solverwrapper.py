@@ -0,0 +1,129 @@
+import os
+
+from flowpaths.utils.solverwrapper import SolverWrapper
+
+
+def test_add_range_constraint_is_single_row():
+    solver = SolverWrapper()
+    x = solver.add_variables([0, 1], name_prefix="x", lb=0, ub=10, var_type="continuous")
+
+    solver.add_range_constraint(solver.quicksum([x[0], x[1]]) + 1, lb=4, ub=6, name="range")
+    solver.add_range_constraint(solver.quicksum([x[0]]), lb=3, ub=3)
+    assert solver.solver.getNumRow() == 2
+
+    solver.set_objective(solver.quicksum([x[0], x[1]]), sense="maximize")
+    solver.optimize()
+
+    values = solver.get_values(x)
+    assert values[0] == 3
+    assert values[1] == 2
+
+
+def _product_model(batched: bool):
+    solver = SolverWrapper()
+    b = solver.add_variables(range(3), name_prefix="b", lb=0, ub=1, var_type="integer")
+    c = solver.add_variables(range(3), name_prefix="c", lb=1, ub=5, var_type="continuous")
+    p = solver.add_variables(range(3), name_prefix="p", lb=0, ub=5, var_type="continuous")
+    if batched:
+        solver.add_binary_continuous_product_constraints(
+            binary_vars=[b[j] for j in range(3)],
+            continuous_vars=[c[j] for j in range(3)],
+            product_vars=[p[j] for j in range(3)],
+            lb=1,
+            ub=5,
+            name="prod",
+        )
+    else:
+        for j in range(3):
+            solver.add_binary_continuous_product_constraint(
+                binary_var=b[j], continuous_var=c[j], product_var=p[j], lb=1, ub=5, name=f"prod_{j}"
+            )
+    return solver
+
+
+def test_batched_product_constraints_match_single_ones():
+    assert _product_model(batched=True).solver.getNumRow() == _product_model(batched=False).solver.getNumRow() == 12
+
+    for sense in ["minimize", "maximize"]:
+        for batched in [False, True]:
+            solver = _product_model(batched=batched)
+            b = {j: solver.solver.getVariables()[j] for j in range(3)}
+            c = {j: solver.solver.getVariables()[3 + j] for j in range(3)}
+            p = {j: solver.solver.getVariables()[6 + j] for j in range(3)}
+            for j, value in enumerate([1, 0, 1]):
+                solver.add_constraint(b[j] == value)
+                solver.add_constraint(c[j] == 3)
+            solver.set_objective(solver.quicksum(p[j] for j in range(3)), sense=sense)
+            solver.optimize()
+
+            assert solver.get_values(p) == {0: 3, 1: 0, 2: 3}
+
+
+def test_threads_and_presolve_are_forwarded_to_highs():
+    import networkx as nx
+    import flowpaths as fp
+
+    graph = nx.DiGraph()
+    graph.add_edge("s", "a", flow=2)
+    graph.add_edge("a", "b", flow=3)
+    graph.add_edge("b", "a", flow=1)
+    graph.add_edge("b", "t", flow=2)
+
+    kfd_model = fp.kFlowDecompCycles(
+        G=graph,
+        k=2,
+        flow_attr="flow",
+        solver_options={"external_solver": "highs", "threads": 2, "presolve": "on"},
+    )
+    assert kfd_model.solver.solver.getOptionValue("threads")[1] == 2
+    assert kfd_model.solver.solver.getOptionValue("presolve")[1] == "on"
+
+    kfd_model.solve()
+    assert kfd_model.is_solved()
+
+
+def test_add_variables_scalar_and_per_index_bounds():
+    import numpy as np
+
+    solver = SolverWrapper()
+    # numpy scalars are scalar bounds too
+    solver.add_variables(range(3), name_prefix="x", lb=0, ub=np.int64(5), var_type="continuous")
+    solver.add_variables([(0, 1), (1, 2)], name_prefix="y", lb={(0, 1): 1, (1, 2): 2}, ub=[3, 4], var_type="integer")
+
+    lp = solver.solver.getLp()
+    assert list(lp.col_lower_) == [0, 0, 0, 1, 2]
+    assert list(lp.col_upper_) == [5, 5, 5, 3, 4]
+
+
+def test_highs_start_values_are_accepted():
+    solver = SolverWrapper()
+    x = solver.add_variables(range(2), name_prefix="x", lb=0, ub=1, var_type="integer")
+    solver.add_constraint(x[0] + x[1] >= 1, name="cover")
+    solver.set_objective(x[0] + 2 * x[1], sense="minimize")
+    # a partial start, which HiGHS completes
+    solver.set_start_values({x[1]: 1})
+    solver.optimize()
+
+    assert solver.get_model_status() == "kOptimal"
+    assert solver.get_objective_value() == 1
+
+
+def test_add_sum_range_constraints_posts_one_row_per_group():
+    solver = SolverWrapper()
+    x = solver.add_variables(range(4), name_prefix="x", lb=0, ub=10, var_type="continuous")
+    solver.add_sum_range_constraints([[x[0], x[1]], [x[2]], [x[1], x[2], x[3]]], lb=[1, 2, 3], ub=[4, 5, 6], name="sum")
+
+    lp = solver.solver.getLp()
+    assert lp.num_row_ == 3
+    assert list(lp.row_lower_) == [1, 2, 3]
+    assert list(lp.row_upper_) == [4, 5, 6]
+
+    solver.set_objective(solver.quicksum(x[i] for i in range(4)), sense="minimize")
+    solver.optimize()
+    assert solver.get_objective_value() == 3
+
+
+def test_zero_threads_uses_all_cpus():
+    solver = SolverWrapper(threads=0)
+    assert solver.threads == (os.cpu_count() or 1)
+    assert solver.solver.getOptionValue("threads")[1] == solver.threads
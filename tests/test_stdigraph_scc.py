@@ -0,0 +1,85 @@
+import networkx as nx
+
+import flowpaths as fp
+import flowpaths.utils.graphutils as graphutils
+
+
+def _make_graph():
+    graph = nx.DiGraph()
+    # SCC {a, b, c} with 3 edges, SCC {d} with a self-loop, trivial SCCs {e}, {f}
+    graph.add_edges_from([
+        ("a", "b"), ("b", "c"), ("c", "a"),
+        ("c", "d"), ("d", "d"),
+        ("d", "e"), ("e", "f"),
+    ])
+    for u, v in graph.edges():
+        graph[u][v]["flow"] = 1
+    return graph
+
+
+def test_scc_labels_match_networkx():
+    graph = _make_graph()
+    nodes, indptr, indices, labels = graphutils._scc_labels(graph)
+
+    assert len(indices) == graph.number_of_edges()
+    assert int(indptr[-1]) == graph.number_of_edges()
+
+    components = {}
+    for node, label in zip(nodes, labels.tolist()):
+        components.setdefault(label, set()).add(node)
+
+    expected = {frozenset(c) for c in nx.strongly_connected_components(graph)}
+    assert {frozenset(c) for c in components.values()} == expected
+
+
+def test_stdigraph_scc_statistics():
+    stG = fp.stDiGraph(_make_graph())
+
+    assert stG.get_number_of_nontrivial_SCCs() == 2
+    assert stG.get_size_of_largest_SCC() == 3
+    assert stG.get_avg_size_of_non_trivial_SCC() == 2
+    # cached edge count of the frozen graph
+    assert stG.number_of_edges() == nx.DiGraph.number_of_edges(stG) == len(stG.edges())
+
+
+def test_tarjan_scc_labels_match_networkx():
+    for seed in range(20):
+        graph = nx.gnp_random_graph(60, 0.04, seed=seed, directed=True)
+        nodes, indptr, indices = graphutils._csr_adjacency(graph)
+        labels = graphutils._tarjan_scc_labels(indptr, indices)
+
+        components = {}
+        for node, label in zip(nodes, labels.tolist()):
+            components.setdefault(label, set()).add(node)
+
+        expected = {frozenset(c) for c in nx.strongly_connected_components(graph)}
+        assert {frozenset(c) for c in components.values()} == expected
+
+
+def test_cached_edge_attribute_helpers():
+    graph = _make_graph()
+    graph["c"]["d"]["flow"] = 5
+    graph["e"]["f"]["flow"] = 0
+    stG = fp.stDiGraph(graph)
+
+    assert stG.get_edge_attr_max("flow") == 5
+    assert stG.get_edge_attr_max("missing", default=-1) == -1
+
+    non_zero = stG.get_non_zero_flow_edges("flow", edges_to_ignore={("a", "b")})
+    assert non_zero == {e for e in graph.edges() if e not in {("a", "b"), ("e", "f")}}
+    # the returned set is a copy, so modifying it does not affect later calls
+    non_zero.clear()
+    assert stG.get_non_zero_flow_edges("flow", edges_to_ignore={("a", "b")}) == {
+        e for e in graph.edges() if e not in {("a", "b"), ("e", "f")}
+    }
+
+def test_edge_index_matches_edge_attr_array():
+    graph = _make_graph()
+    graph["c"]["d"]["flow"] = 5
+    stG = fp.stDiGraph(graph)
+
+    edge_index = stG.get_edge_index()
+    flows = stG.get_edge_attr_array("flow")
+    assert list(edge_index) == list(stG.edges())
+    assert flows[edge_index[("c", "d")]] == 5
+    assert stG.get_edge_index() is edge_index
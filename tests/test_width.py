@@ -0,0 +1,37 @@
+import random
+
+import networkx as nx
+
+import flowpaths as fp
+
+
+def _random_dag(seed):
+    graph = nx.gnp_random_graph(30, 0.12, seed=seed, directed=True)
+    return nx.DiGraph([(str(u), str(v)) for u, v in graph.edges() if u < v])
+
+
+def test_min_flow_width_matches_antichain():
+    for seed in range(20):
+        graph = _random_dag(seed)
+        if graph.number_of_edges() == 0:
+            continue
+        stG = fp.stDAG(graph)
+
+        width, antichain = stG.compute_max_edge_antichain(get_antichain=True)
+        assert stG.compute_max_edge_antichain() == width == len(antichain)
+
+        rng = random.Random(seed)
+        weight_function = {e: rng.randint(0, 3) for e in stG.edges()}
+        weight, _ = stG.compute_max_edge_antichain(get_antichain=True, weight_function=weight_function)
+        assert stG.compute_max_edge_antichain(weight_function=weight_function) == weight
+
+
+def test_width_with_edges_to_ignore():
+    graph = nx.DiGraph([("a", "b"), ("a", "c"), ("b", "d"), ("c", "d"), ("d", "e"), ("d", "f")])
+    stG = fp.stDAG(graph)
+
+    assert stG.get_width() == 2
+    assert stG.get_width(edges_to_ignore=[("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")]) == 2
+    assert stG.get_width(edges_to_ignore=[e for e in stG.edges() if e not in [("a", "b"), ("b", "d")]]) == 1
+    # The width without edges to ignore is still cached
+    assert stG.get_width() == 2